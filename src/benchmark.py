@@ -0,0 +1,232 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from src.collation import POLISH_ALPHABET
+from src.metrics import peak_rss_mb
+
+
+# Words per length: 2-10 from slowniki/osps, 11-15 extrapolated from the full OSPS list
+LENGTH_WEIGHTS = {
+    2: 129, 3: 1515, 4: 7590, 5: 26449, 6: 60030, 7: 119536, 8: 198348, 9: 284348,
+    10: 356552, 11: 378000, 12: 357000, 13: 310000, 14: 252000, 15: 193000,
+}
+
+# Letter frequencies of Polish text in percent, in POLISH_ALPHABET order
+LETTER_WEIGHTS = [
+    8.91, 0.99, 1.47, 3.96, 0.40, 3.25, 7.66, 1.11, 0.30, 1.42, 1.08, 8.21, 2.28, 3.51, 2.10, 1.82,
+    2.80, 5.52, 0.20, 7.75, 0.85, 3.13, 4.69, 4.32, 0.66, 3.98, 2.50, 4.65, 3.76, 5.64, 0.06, 0.83,
+]
+
+# Share of words made by adding one letter to a shorter word, so hooks exist
+DERIVED_SHARE = 0.4
+
+STAGES = ["split", "extensions", "extensions_numpy", "pdf"]
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+class BenchmarkResult(NamedTuple):
+    size: int
+    stage: str
+    items: int             # words for split/extensions, rows for pdf
+    seconds: float
+    peak_rss_mb: float
+    skipped: Optional[str] = None
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+def generate_words(size: int, seed: int = 0) -> List[str]:
+    """Generate a deterministic dictionary of about `size` distinct Polish-alphabet words.
+
+    Lengths follow LENGTH_WEIGHTS and letters follow Polish letter frequencies.
+    A share of each length is derived from the previous length by adding a
+    letter at either end, so the lists have hooks like a real dictionary.
+    """
+    rng = random.Random(seed)
+    total_weight = sum(LENGTH_WEIGHTS.values())
+    words: List[str] = []
+    previous: List[str] = []
+    for length, weight in sorted(LENGTH_WEIGHTS.items()):
+        target = min(max(1, round(size * weight / total_weight)), len(POLISH_ALPHABET) ** length // 2)
+        group = set()
+        derived = int(target * DERIVED_SHARE) if previous else 0
+        while len(group) < derived:
+            base = rng.choice(previous)
+            letter = rng.choices(POLISH_ALPHABET, LETTER_WEIGHTS)[0]
+            group.add(letter + base if rng.random() < 0.5 else base + letter)
+        while len(group) < target:
+            group.add("".join(rng.choices(POLISH_ALPHABET, LETTER_WEIGHTS, k=length)))
+        previous = sorted(group)
+        words.extend(previous)
+    return words
+
+
+def write_source_file(words: List[str], source_file: Path, seed: int = 0):
+    """Write words lowercase and shuffled, like the downloaded dictionary files."""
+    shuffled = [word.lower() for word in words]
+    random.Random(seed).shuffle(shuffled)
+    source_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(source_file, "w", encoding="utf-8") as f:
+        f.writelines(f"{word}\n" for word in shuffled)
+
+
+def count_lines(file_path: Path) -> int:
+    """Count the non-empty lines of a file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def _largest_extensions_file(dict_dir: Path) -> Optional[Path]:
+    files = sorted((dict_dir / "extensions").glob("*_letter_extensions.txt"),
+                   key=lambda path: path.stat().st_size)
+    return files[-1] if files else None
+
+
+def _run_stage(stage: str, source_file: Path, dict_dir: Path, pdf_rows: int, renderer: str) -> Dict:
+    """Run one stage in the current (fresh) process and measure it."""
+    if stage == "split":
+        from src.word_splitter import split_words_by_length
+        items = count_lines(source_file)
+        start = time.perf_counter()
+        split_words_by_length(source_file, dict_dir)
+
+    elif stage in ("extensions", "extensions_numpy"):
+        from src.generate_extensions import generate_all_extensions
+        items = sum(count_lines(path) for path in dict_dir.glob("*_letter_words.txt"))
+        start = time.perf_counter()
+        generate_all_extensions(dict_dir, workers=1, engine="numpy" if stage == "extensions_numpy" else "dict")
+
+    else:
+        from src.fonts import register_font
+        from src.generate_pdfs import RENDERERS
+        try:
+            register_font()
+        except FileNotFoundError as error:
+            return {"items": 0, "seconds": 0.0, "peak_rss_mb": peak_rss_mb(), "skipped": f"font unavailable: {error}"}
+        extensions_file = _largest_extensions_file(dict_dir)
+        if extensions_file is None:
+            return {"items": 0, "seconds": 0.0, "peak_rss_mb": peak_rss_mb(), "skipped": "no extensions files"}
+        word_length = int(extensions_file.name.split("_")[0])
+        sample_file = dict_dir / "pdf_sample.txt"
+        with open(extensions_file, encoding="utf-8") as source, open(sample_file, "w", encoding="utf-8") as sample:
+            lines = [line for _, line in zip(range(pdf_rows), source)]
+            sample.writelines(lines)
+        items = len(lines)
+        start = time.perf_counter()
+        RENDERERS[renderer](sample_file, dict_dir / "sample.pdf", word_length, "bench")
+
+    return {"items": items, "seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}
+
+
+def run_benchmark(sizes: List[int], stages: List[str] = STAGES, seed: int = 0, pdf_rows: int = 5000,
+                  renderer: str = "table", work_dir: Optional[Path] = None) -> List[BenchmarkResult]:
+    """Benchmark the pipeline stages on synthetic dictionaries of each size.
+
+    Every stage runs in a freshly spawned process, so its peak RSS is its
+    own and not inherited from the generator or earlier stages. Stages run
+    in pipeline order on the same directory; the pdf stage renders the first
+    `pdf_rows` rows of the largest extensions file.
+    """
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        base_dir = Path(work_dir or temp_dir)
+        for size in sizes:
+            dict_dir = base_dir / f"synthetic_{size}"
+            source_file = dict_dir / "source.txt"
+            start = time.perf_counter()
+            write_source_file(generate_words(size, seed), source_file, seed)
+            print(f"Generated {size}-word dictionary in {time.perf_counter() - start:.1f}s")
+
+            for stage in [stage for stage in STAGES if stage in stages]:
+                with context.Pool(1) as pool:
+                    measured = pool.apply(_run_stage, (stage, source_file, dict_dir, pdf_rows, renderer))
+                result = BenchmarkResult(size, stage, **measured)
+                results.append(result)
+                if result.skipped:
+                    print(f"[{size}] {stage}: skipped ({result.skipped})")
+                else:
+                    print(f"[{size}] {stage}: {result.items} items in {result.seconds:.2f}s "
+                          f"({result.items_per_second:,.0f}/s, peak RSS {result.peak_rss_mb:.1f} MB)")
+    return results
+
+
+def save_results(results: List[BenchmarkResult], output_file: Path, **settings) -> Dict:
+    """Write results and the machine they ran on to a JSON file."""
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "settings": settings,
+        "results": [dict(result._asdict(), items_per_second=result.items_per_second) for result in results],
+    }
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def find_regressions(baseline: Dict, current: Dict, tolerance: float = 0.25) -> List[str]:
+    """Compare two saved reports; list stages whose throughput dropped or memory grew beyond tolerance."""
+    previous = {(entry["size"], entry["stage"]): entry for entry in baseline["results"] if not entry.get("skipped")}
+    regressions = []
+    for entry in current["results"]:
+        old = previous.get((entry["size"], entry["stage"]))
+        if old is None or entry.get("skipped"):
+            continue
+        name = f"{entry['stage']} @ {entry['size']}"
+        if entry["items_per_second"] < old["items_per_second"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {old['items_per_second']:,.0f}/s -> "
+                               f"{entry['items_per_second']:,.0f}/s")
+        if entry["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {old['peak_rss_mb']:.1f} MB -> {entry['peak_rss_mb']:.1f} MB")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline on synthetic Polish dictionaries.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="dictionary sizes in words (e.g. 10000 100000 1000000 5000000)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pdf-rows", type=int, default=5000, help="rows rendered by the pdf stage")
+    parser.add_argument("--renderer", choices=["table", "canvas", "stream", "compact"], default="table")
+    parser.add_argument("--work-dir", type=Path, default=None,
+                        help="keep generated files here instead of a temporary directory")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None,
+                        help="earlier results file; exit with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative throughput drop or memory growth against the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    results = run_benchmark(args.sizes, args.stages, args.seed, args.pdf_rows, args.renderer, args.work_dir)
+    report = save_results(results, args.output, seed=args.seed, pdf_rows=args.pdf_rows, renderer=args.renderer)
+    print(f"Saved results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = find_regressions(json.load(f), report, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
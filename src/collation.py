@@ -0,0 +1,151 @@
+from typing import Callable, Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional, sorting falls back to sorted()
+    np = None
+
+
+POLISH_ALPHABET_ORDER = {
+    'A': 1, 'Ą': 2, 'B': 3, 'C': 4, 'Ć': 5, 'D': 6, 'E': 7, 'Ę': 8, 'F': 9, 'G': 10,
+    'H': 11, 'I': 12, 'J': 13, 'K': 14, 'L': 15, 'Ł': 16, 'M': 17, 'N': 18, 'Ń': 19,
+    'O': 20, 'Ó': 21, 'P': 22, 'R': 23, 'S': 24, 'Ś': 25, 'T': 26, 'U': 27, 'W': 28,
+    'Y': 29, 'Z': 30, 'Ź': 31, 'Ż': 32
+}
+
+POLISH_ALPHABET = "".join(sorted(POLISH_ALPHABET_ORDER, key=POLISH_ALPHABET_ORDER.get))
+
+# How characters outside the alphabet are ordered:
+#   "first" - before every letter (rank 0, the historical behaviour)
+#   "last"  - after Ż
+#   "error" - raise ValueError
+UNKNOWN_POLICIES = ("first", "last", "error")
+UNKNOWN_RANKS = {"first": 0, "last": len(POLISH_ALPHABET_ORDER) + 1}
+
+
+class _TranslationTable(dict):
+    """str.translate table mapping letters to one-character ranks."""
+
+    def __init__(self, unknown: str):
+        super().__init__({ord(letter): chr(rank) for letter, rank in POLISH_ALPHABET_ORDER.items()})
+        self.unknown = unknown
+
+    def __missing__(self, codepoint: int) -> str:
+        if self.unknown == "error":
+            # ValueError (unlike LookupError) is not swallowed by str.translate
+            raise ValueError(f"Character {chr(codepoint)!r} is not in the Polish alphabet")
+        rank = chr(UNKNOWN_RANKS[self.unknown])
+        self[codepoint] = rank
+        return rank
+
+
+_TRANSLATION_TABLES: Dict[str, _TranslationTable] = {policy: _TranslationTable(policy) for policy in UNKNOWN_POLICIES}
+
+
+def _check_policy(unknown: str):
+    if unknown not in UNKNOWN_POLICIES:
+        raise ValueError(f"Unknown character policy must be one of {UNKNOWN_POLICIES}, got {unknown!r}")
+
+
+def make_sort_key(unknown: str = "first") -> Callable[[str], bytes]:
+    """Return a sort key function using the given policy for non-alphabet characters."""
+    _check_policy(unknown)
+    table = _TRANSLATION_TABLES[unknown]
+
+    def sort_key(word: str) -> bytes:
+        return word.upper().translate(table).encode("latin-1")
+
+    return sort_key
+
+
+polish_sort_key = make_sort_key("first")
+polish_sort_key.__doc__ = """Create a compact bytes sort key for a word based on Polish alphabet order."""
+
+
+def _rank_array():
+    """Rank per code point, shifted by one so that 0 can pad shorter words."""
+    size = max(ord(letter) for letter in POLISH_ALPHABET_ORDER) + 1
+    ranks = np.zeros(size, dtype=np.uint8)
+    for letter, rank in POLISH_ALPHABET_ORDER.items():
+        ranks[ord(letter)] = rank + 1
+    return ranks
+
+
+def _encode_flat(words: List[str]):
+    """Encode all letters of all words at once as shifted ranks (0 = not in the alphabet).
+
+    Returns (codes, codepoints, lengths), or None when upper-casing changes the
+    number of characters (e.g. ß -> SS) and a fixed layout is not possible.
+    """
+    upper = "".join(words).upper()
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    if len(upper) != int(lengths.sum()):
+        return None
+
+    codepoints = np.frombuffer(upper.encode("utf-32-le"), dtype=np.uint32)
+    ranks = _rank_array()
+    in_table = codepoints < ranks.size
+    codes = ranks[np.where(in_table, codepoints, 0)]
+    codes[~in_table] = 0
+    return codes, codepoints, lengths
+
+
+def _to_matrix(codes, lengths):
+    """Lay flat per-letter codes out as a zero-padded (words, max length) matrix."""
+    width = int(lengths.max()) if lengths.size else 0
+    if codes.size == lengths.size * width:
+        # Words of one length (as the splitter sorts them) need no padding or per-letter indexes
+        return codes.reshape(lengths.size, width)
+    matrix = np.zeros((lengths.size, width), dtype=np.uint8)
+    if width:
+        starts = np.cumsum(lengths) - lengths
+        rows = np.repeat(np.arange(lengths.size), lengths)
+        columns = np.arange(codes.size) - np.repeat(starts, lengths)
+        matrix[rows, columns] = codes
+    return matrix
+
+
+def rank_matrix(words: List[str]):
+    """Encode words as a zero-padded uint8 matrix of alphabet ranks (1-32), in bulk.
+
+    Returns (matrix, lengths, valid) where valid is False for words containing
+    characters outside the alphabet. Requires NumPy.
+    """
+    encoded = _encode_flat(words)
+    if encoded is None:
+        raise ValueError("Words change length when upper-cased and cannot be encoded")
+    codes, _, lengths = encoded
+    unknown = codes == 0
+    ranks = np.where(unknown, 0, codes - 1).astype(np.uint8)
+    valid = np.ones(lengths.size, dtype=bool)
+    valid[np.repeat(np.arange(lengths.size), lengths)[unknown]] = False
+    return _to_matrix(ranks, lengths), lengths, valid
+
+
+def sort_polish(words: List[str], unknown: str = "first") -> List[str]:
+    """Stably sort words in Polish alphabet order in bulk.
+
+    All words are encoded at once into a fixed-width NumPy array of ranks
+    and sorted with a single stable argsort, so no per-word key is built in
+    Python. The result is the same as sorted(words, key=make_sort_key(unknown)).
+    """
+    _check_policy(unknown)
+    encoded = _encode_flat(words) if np is not None and words else None
+    if encoded is None:
+        return sorted(words, key=make_sort_key(unknown))
+
+    codes, codepoints, lengths = encoded
+    unknown_positions = np.flatnonzero(codes == 0)
+    if unknown_positions.size:
+        if unknown == "error":
+            character = chr(int(codepoints[unknown_positions[0]]))
+            raise ValueError(f"Character {character!r} is not in the Polish alphabet")
+        codes[unknown_positions] = UNKNOWN_RANKS[unknown] + 1
+
+    matrix = _to_matrix(codes, lengths)
+    if matrix.shape[1]:
+        order = np.argsort(matrix.view(f"S{matrix.shape[1]}").ravel(), kind="stable")
+    else:
+        order = np.arange(len(words))
+
+    return list(map(words.__getitem__, order.tolist()))
@@ -0,0 +1,257 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.collation import POLISH_ALPHABET, make_sort_key
+from src.hook_index import INDEX_NAME, HookIndex, build_hook_index_from_extensions, is_current_index, mask_letters
+from src.metrics import METRICS
+
+
+DEFAULT_DICTS = ("sjp", "osps")
+
+# Packed index words hold one rank byte (1-32) per letter; this maps them back
+_DECODE = {rank: letter for rank, letter in enumerate(POLISH_ALPHABET, 1)}
+# Rows of foreign words (Q, V, X) are merged in after every alphabet word they precede
+_row_key = make_sort_key("last")
+
+
+class HookDiff(NamedTuple):
+    """Words of one length whose presence or hooks differ between dictionaries A and B."""
+    length: int
+    words: List[str]
+    in_a: np.ndarray          # bool per word
+    in_b: np.ndarray
+    left_a_only: np.ndarray   # uint32 hook masks: hooks valid only in A, only in B
+    left_b_only: np.ndarray
+    right_a_only: np.ndarray
+    right_b_only: np.ndarray
+
+
+def decode_packed_words(packed: np.ndarray, length: int) -> List[str]:
+    """Turn packed S{length} index keys back into words, all at once."""
+    text = packed.tobytes().decode("latin-1").translate(_DECODE)
+    return [text[start:start + length] for start in range(0, len(text), length)]
+
+
+def open_hook_index(dict_dir: Path) -> HookIndex:
+    """Open a dictionary's hook index, building it from its extensions files if it is missing or outdated."""
+    index_file = dict_dir / "extensions" / INDEX_NAME
+    if not is_current_index(index_file):
+        build_hook_index_from_extensions(dict_dir / "extensions", index_file)
+        print(f"Created {index_file}")
+    return HookIndex(index_file)
+
+
+def _spread(slot: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    spread = np.zeros(size, dtype=values.dtype)
+    spread[slot] = values
+    return spread
+
+
+def diff_hook_section(length: int, a: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                      b: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> HookDiff:
+    """Diff one length of two indexes: (packed words, left masks, right masks) each, sorted by word.
+
+    Both word arrays are in Polish order, so a stable sort of their
+    concatenation is a single linear merge of two runs. Equal neighbours are
+    the words in both dictionaries. The masks of each side are then spread
+    onto the merged list, and the symmetric differences are plain AND-NOT
+    operations on whole arrays.
+    """
+    a_words, a_left, a_right = a
+    b_words, b_left, b_right = b
+    merged = np.concatenate([a_words, b_words])
+    order = np.argsort(merged, kind="stable")
+    merged = merged[order]
+    first = np.ones(len(merged), dtype=bool)
+    first[1:] = merged[1:] != merged[:-1]
+    words = merged[first]
+    slot = np.cumsum(first) - 1            # merged position -> unique word
+
+    from_a = order < len(a_words)
+    a_slot, a_rows = slot[from_a], order[from_a]
+    b_slot, b_rows = slot[~from_a], order[~from_a] - len(a_words)
+    size = len(words)
+    in_a = _spread(a_slot, np.ones(len(a_slot), dtype=bool), size)
+    in_b = _spread(b_slot, np.ones(len(b_slot), dtype=bool), size)
+    left_a, right_a = _spread(a_slot, a_left[a_rows], size), _spread(a_slot, a_right[a_rows], size)
+    left_b, right_b = _spread(b_slot, b_left[b_rows], size), _spread(b_slot, b_right[b_rows], size)
+
+    differs = (in_a != in_b) | (left_a != left_b) | (right_a != right_b)
+    left_a, left_b, right_a, right_b = left_a[differs], left_b[differs], right_a[differs], right_b[differs]
+    return HookDiff(
+        length,
+        decode_packed_words(words[differs], length),
+        in_a[differs],
+        in_b[differs],
+        left_a & ~left_b,
+        left_b & ~left_a,
+        right_a & ~right_b,
+        right_b & ~right_a,
+    )
+
+
+def common_lengths(a_index: HookIndex, b_index: HookIndex, lengths: Optional[List[int]] = None
+                   ) -> Tuple[List[int], Dict[int, int]]:
+    """Split the wanted lengths into those both indexes have and the rest, each mapped to the side (0 or 1) lacking it.
+
+    An index has no section for a length whose N+1 word list is missing (SJP
+    has no 10-letter list, so no 9-letter section), which says nothing about
+    the words of that length. Such lengths cannot be compared.
+    """
+    wanted = sorted(set(a_index.sections) | set(b_index.sections))
+    if lengths:
+        wanted = [length for length in wanted if length in lengths]
+    common = [length for length in wanted if length in a_index.sections and length in b_index.sections]
+    missing = {length: 0 if length not in a_index.sections else 1 for length in wanted if length not in common}
+    return common, missing
+
+
+def diff_hook_indexes(a_index: HookIndex, b_index: HookIndex, lengths: Optional[List[int]] = None) -> List[HookDiff]:
+    """Diff every word length present in both indexes."""
+    diffs = []
+    for length in common_lengths(a_index, b_index, lengths)[0]:
+        a, b = a_index.sections[length], b_index.sections[length]
+        with METRICS.phase("diff", length=length, words=len(a[0]) + len(b[0])) as counts:
+            diff = diff_hook_section(length, a, b)
+            counts["lines"] = len(diff.words)
+        diffs.append(diff)
+    return diffs
+
+
+def diff_rows(diff: HookDiff, names: Tuple[str, str]) -> List[List[str]]:
+    """Rows of (A-only left, B-only left, word, A-only right, B-only right, dictionary holding the word).
+
+    The last column is empty when both dictionaries have the word.
+    """
+    presence = {(True, False): names[0], (False, True): names[1], (True, True): ""}
+    return [
+        [mask_letters(left_a), mask_letters(left_b), word, mask_letters(right_a), mask_letters(right_b),
+         presence[(in_a, in_b)]]
+        for word, in_a, in_b, left_a, left_b, right_a, right_b in zip(
+            diff.words, diff.in_a.tolist(), diff.in_b.tolist(), diff.left_a_only.tolist(),
+            diff.left_b_only.tolist(), diff.right_a_only.tolist(), diff.right_b_only.tolist())
+    ]
+
+
+def foreign_diff_rows(length: int, a_index: HookIndex, b_index: HookIndex,
+                      names: Tuple[str, str]) -> Dict[str, Optional[List[str]]]:
+    """Diff rows of the foreign words of one length (see HookIndex.foreign), compared by their full hooks.
+
+    Maps every foreign word of either index to its row, or to None when both
+    dictionaries give it the same hooks.
+    """
+    rows = {}
+    words = {word for index in (a_index, b_index) for word in index.foreign if len(word) == length}
+    for word in words:
+        a, b = a_index.hooks(word), b_index.hooks(word)
+        a_left, a_right = a or ("", "")
+        b_left, b_right = b or ("", "")
+        row = ["".join(letter for letter in a_left if letter not in b_left),
+               "".join(letter for letter in b_left if letter not in a_left), word,
+               "".join(letter for letter in a_right if letter not in b_right),
+               "".join(letter for letter in b_right if letter not in a_right),
+               names[0] if b is None else names[1] if a is None else ""]
+        rows[word] = row if any(row[:2] + row[3:]) else None
+    return rows
+
+
+def merge_foreign_rows(rows: List[List[str]], foreign_rows: Dict[str, Optional[List[str]]]) -> List[List[str]]:
+    """Replace the mask-based rows of foreign words with their full-hook rows, keeping Polish order."""
+    if not foreign_rows:
+        return rows
+    rows = [row for row in rows if row[2] not in foreign_rows]
+    rows += [row for row in foreign_rows.values() if row is not None]
+    return sorted(rows, key=lambda row: _row_key(row[2]))
+
+
+def summarize(rows: List[List[str]], names: Tuple[str, str]) -> str:
+    a, b = (name.upper() for name in names)
+    a_hooks = sum(len(row[0]) + len(row[3]) for row in rows)
+    b_hooks = sum(len(row[1]) + len(row[4]) for row in rows)
+    return (f"{len(rows)} words differ ({sum(row[5] == names[0] for row in rows)} only in {a}, "
+            f"{sum(row[5] == names[1] for row in rows)} only in {b}); {a_hooks} hooks only in {a}, "
+            f"{b_hooks} only in {b}")
+
+
+def write_hook_diff(rows: List[List[str]], output_file: Path):
+    """Write diff rows as tab-separated records, hook letters back to back like the .tsv extensions."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.writelines("\t".join(row) + "\n" for row in rows)
+
+
+def render_hook_diff(rows: List[List[str]], output_file: Path, names: Tuple[str, str]) -> Tuple[int, int]:
+    """Render diff rows with the compact renderer; the word cell names the dictionary holding it alone."""
+    from src.generate_pdfs import CompactLayout, render_rows
+
+    a, b = (name.upper() for name in names)
+    layout = CompactLayout(columns=1, header=[f"Left {a} only", f"Left {b} only", "Word",
+                                              f"Right {a} only", f"Right {b} only"],
+                           widths=(0.2, 0.2, 0.2, 0.2, 0.2))
+    table = ([left_a, left_b, f"{word} ({only.upper()})" if only else word, right_a, right_b]
+             for left_a, left_b, word, right_a, right_b, only in rows)
+    return render_rows(table, output_file, layout.rows_per_page, layout.draw_page)
+
+
+def compare_dictionaries(base_dir: Path, names: Tuple[str, str] = DEFAULT_DICTS, output_dir: Optional[Path] = None,
+                         lengths: Optional[List[int]] = None, pdfs: bool = False) -> List[Path]:
+    """Write a hook diff file (and PDF) per word length of two dictionaries' hook indexes.
+
+    Only lengths both indexes have are diffed; the others are reported as not
+    compared. Words with letters outside the 32-letter alphabet (Q, V, X in
+    SJP) in the word or its hooks are compared by their full hooks from the
+    indexes' foreign tables.
+    """
+    output_dir = output_dir or base_dir / "compare"
+    prefix = "_".join(names)
+    created = []
+    with open_hook_index(base_dir / names[0]) as a_index, open_hook_index(base_dir / names[1]) as b_index:
+        for length, side in common_lengths(a_index, b_index, lengths)[1].items():
+            print(f"Not compared: {length}-letter words, {names[side].upper()} has no hook index section "
+                  f"for them (no {length + 1}-letter list)")
+        for diff in diff_hook_indexes(a_index, b_index, lengths):
+            rows = merge_foreign_rows(diff_rows(diff, names), foreign_diff_rows(diff.length, a_index, b_index, names))
+            output_file = output_dir / f"{prefix}_{diff.length}_letter_hook_diff.tsv"
+            with METRICS.phase("write", length=diff.length, lines=len(rows)):
+                write_hook_diff(rows, output_file)
+            print(f"Created {output_file}: {summarize(rows, names)}")
+            created.append(output_file)
+
+            if pdfs and rows:
+                pdf_file = output_dir / f"{prefix.upper()}{diff.length}_HOOK_DIFF.pdf"
+                with METRICS.phase("render", length=diff.length) as counts:
+                    counts["lines"], counts["pages"] = render_hook_diff(rows, pdf_file, names)
+                print(f"Created {pdf_file} with {len(rows)} words on {counts['pages']} pages")
+                created.append(pdf_file)
+    return created
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="List hooks valid in one dictionary but not the other.")
+    parser.add_argument("--dicts", nargs=2, default=list(DEFAULT_DICTS), metavar=("A", "B"),
+                        help="dictionaries to compare (default: sjp osps)")
+    parser.add_argument("--base-dir", type=Path, default=Path("slowniki"))
+    parser.add_argument("--output-dir", type=Path, default=None,
+                        help="where to write the diff files (default: BASE_DIR/compare)")
+    parser.add_argument("--lengths", type=int, nargs="+", default=None, help="word lengths to compare (default: all)")
+    parser.add_argument("--pdf", action="store_true", help="also render each diff as a PDF")
+    parser.add_argument("--metrics", type=Path, default=None, metavar="FILE",
+                        help="write per-phase timings, counts and peak RSS to FILE (.json or .csv)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    created = compare_dictionaries(args.base_dir, tuple(args.dicts), args.output_dir, args.lengths, args.pdf)
+    print(f"\nWrote {len(created)} files in {time.perf_counter() - start:.1f}s")
+    if args.metrics:
+        METRICS.write_report(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
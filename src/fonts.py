@@ -0,0 +1,143 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from src.collation import POLISH_ALPHABET
+
+
+FONT_NAME = "CustomFont"
+FONT_ENV = "PRZEDLUZKI_FONT"               # path of the TTF to use
+FONT_CACHE_ENV = "PRZEDLUZKI_FONT_CACHE"   # directory of cached subset fonts
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "przedluzki" / "fonts"
+# DejaVu Sans cut down to SUBSET_CHARACTERS, shipped so rendering works without a system font
+BUNDLED_FONT = Path(__file__).resolve().parent.parent / "fonts" / "DejaVuSans-Polish.ttf"
+
+# Tried in order when no font is configured; all have Polish glyphs
+FONT_CANDIDATES = [
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    "/usr/share/fonts/liberation-sans/LiberationSans-Regular.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    str(BUNDLED_FONT),
+]
+
+# Everything the PDFs draw: the alphabet in both cases, headers and punctuation
+REQUIRED_CHARACTERS = POLISH_ALPHABET + POLISH_ALPHABET.lower()
+SUBSET_CHARACTERS = "".join(sorted(set(REQUIRED_CHARACTERS) | {chr(code) for code in range(32, 127)}))
+
+_registered: Optional[Path] = None
+
+
+def resolve_font_path(font_path: Optional[Path] = None) -> Path:
+    """Return the font to use: the argument, then $PRZEDLUZKI_FONT, then the first usable candidate.
+
+    The last candidate is the bundled font, so a checkout always finds one.
+    """
+    configured = font_path or os.environ.get(FONT_ENV)
+    if configured:
+        configured = Path(configured)
+        if not configured.exists():
+            raise FileNotFoundError(f"Font {configured} does not exist")
+        return configured
+
+    for candidate in map(Path, FONT_CANDIDATES):
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(
+        f"No font with Polish glyphs found; set {FONT_ENV} or pass --font. Tried: {', '.join(FONT_CANDIDATES)}"
+    )
+
+
+def font_cache_dir() -> Path:
+    return Path(os.environ.get(FONT_CACHE_ENV, DEFAULT_CACHE_DIR))
+
+
+def subset_font_path(font_path: Path, cache_dir: Optional[Path] = None) -> Path:
+    """Return the cached subset of a font, creating it on first use.
+
+    The cache key covers the font's path, size, modification time and the
+    subset characters, so an updated font gets a new subset. Without
+    fontTools the full font is returned and register_font checks its
+    glyphs. Raises ValueError if the font lacks Polish letters.
+    """
+    stat = font_path.stat()
+    key = f"{font_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{SUBSET_CHARACTERS}"
+    cache_dir = cache_dir or font_cache_dir()
+    cached = cache_dir / f"{font_path.stem.replace(' ', '_')}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}.ttf"
+    if cached.exists():
+        return cached
+
+    try:
+        from fontTools import subset
+    except ImportError:
+        return font_path
+
+    options = subset.Options()
+    options.drop_tables += ["FFTM"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    options.hinting = False
+    font = subset.load_font(str(font_path), options)
+    missing = [letter for letter in REQUIRED_CHARACTERS if ord(letter) not in font.getBestCmap()]
+    if missing:
+        raise ValueError(f"Font {font_path} has no glyphs for {''.join(missing)}")
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=SUBSET_CHARACTERS)
+    subsetter.subset(font)
+
+    # Write under a temporary name so concurrent workers never read a partial file
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    partial = cached.with_suffix(f".{os.getpid()}.tmp")
+    subset.save_font(font, str(partial), options)
+    partial.replace(cached)
+    return cached
+
+
+def missing_glyphs(font: TTFont) -> str:
+    """Return the letters of the Polish alphabet the font cannot draw."""
+    return "".join(letter for letter in REQUIRED_CHARACTERS if ord(letter) not in font.face.charToGlyph)
+
+
+def register_font(font_path: Optional[Path] = None, use_subset: bool = True) -> str:
+    """Register the PDF font on first use and return its name.
+
+    Later calls are free. With use_subset a small cached subset of the font
+    is parsed instead of the full file, which matters for large fonts such as
+    Arial Unicode (about 23 MB) in every render process. The font is always
+    checked for Polish glyphs (with or without fontTools); a font lacking
+    them raises ValueError instead of rendering empty boxes.
+    """
+    global _registered
+    if _registered is not None:
+        return FONT_NAME
+
+    source = resolve_font_path(font_path)
+    path = subset_font_path(source) if use_subset else source
+    font = TTFont(FONT_NAME, str(path))
+    missing = missing_glyphs(font)
+    if missing:
+        raise ValueError(f"Font {source} has no glyphs for {missing}")
+    pdfmetrics.registerFont(font)
+    _registered = path
+    return FONT_NAME
+
+
+def configure_font(font_path: Path):
+    """Use font_path for this process and the worker processes it starts."""
+    global _registered
+    os.environ[FONT_ENV] = str(font_path)
+    _registered = None
+
+
+def registered_font() -> Optional[Path]:
+    """Return the file the PDF font was registered from, or None if it is not registered yet."""
+    return _registered
+
@@ -1,6 +1,20 @@
+import argparse
+import multiprocessing
 from pathlib import Path
-from multiprocessing import Pool, cpu_count
-from typing import List, Tuple, Dict
+from multiprocessing import cpu_count
+from typing import Iterator, List, Tuple, Dict, Optional
+
+from src.hook_index import INDEX_NAME, write_hook_index_from_lookups
+from src.metrics import METRICS, PhaseRecord, profile_calls, profiling
+
+
+BATCH_SIZE = 1000
+ENGINES = ("dict", "numpy")
+# Output formats of the extensions files and their suffixes
+EXTENSIONS_FORMATS = {"text": ".txt", "tsv": ".tsv"}
+
+# Read-only state inherited by pool workers (set once per worker by _init_worker)
+_shared_state: Dict[str, object] = {}
 
 
 def read_words(file_path: Path) -> List[str]:
@@ -39,6 +53,15 @@ def format_extensions_line(word: str, left_ext: List[str], right_ext: List[str])
     return f"{left_str} {word} {right_str}\n"
 
 
+def format_extensions_record(word: str, left_ext: List[str], right_ext: List[str]) -> str:
+    """Format a 'LEFT<TAB>WORD<TAB>RIGHT' record with hook letters written back to back.
+
+    Columns are fixed, so readers split each line once instead of searching
+    for the word, and the columns are already in PDF table order.
+    """
+    return f"{''.join(left_ext)}\t{word}\t{''.join(right_ext)}\n"
+
+
 def process_word_batch(args: Tuple[List[str], Dict[str, List[str]], Dict[str, List[str]]]) -> List[str]:
     """Process a batch of words using extension lookups."""
     words, left_lookup, right_lookup = args
@@ -52,9 +75,54 @@ def process_word_batch(args: Tuple[List[str], Dict[str, List[str]], Dict[str, Li
     return result
 
 
-def generate_extensions_file(words_file: Path, extended_words_file: Path, extensions_file: Path, word_length: int):
+def resolve_workers(workers: Optional[int]) -> int:
+    """Return the worker count to use; None means one worker per CPU."""
+    return cpu_count() if workers is None else max(1, workers)
+
+
+def _pool_context():
+    """Prefer fork so workers inherit the lookups instead of unpickling them."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _init_worker(state: Dict[str, object]):
+    """Install read-only shared state in a pool worker."""
+    _shared_state.update(state)
+    METRICS.detach()
+
+
+def _process_shared_batch(words: List[str]) -> List[str]:
+    """Process a batch against the lookups shared at pool start-up."""
+    return process_word_batch((words, _shared_state["left"], _shared_state["right"]))
+
+
+def map_word_batches(words: List[str], left_lookup: Dict[str, List[str]], right_lookup: Dict[str, List[str]],
+                     workers: Optional[int] = None) -> List[str]:
+    """Format extension lines for words, in parallel when it pays off.
+
+    The lookups are handed to each worker once at start-up rather than
+    pickled into every batch; one worker (or a single batch) runs serially.
+    """
+    workers = resolve_workers(workers)
+    if workers == 1 or len(words) <= BATCH_SIZE:
+        return process_word_batch((words, left_lookup, right_lookup))
+
+    batches = [words[i:i + BATCH_SIZE] for i in range(0, len(words), BATCH_SIZE)]
+    state = {"left": left_lookup, "right": right_lookup}
+    with _pool_context().Pool(workers, initializer=_init_worker, initargs=(state,)) as pool:
+        results = pool.map(_process_shared_batch, batches)
+
+    return [line for batch_result in results for line in batch_result]
+
+
+def generate_extensions_file(words_file: Path, extended_words_file: Path, extensions_file: Path, word_length: int,
+                             workers: Optional[int] = None):
     """Generate extensions file from words file and extended words file."""
-    words = read_words(words_file)
+    with METRICS.phase("read", length=word_length) as counts:
+        words = read_words(words_file)
+        counts["words"] = len(words)
     
     # For 15-letter words, just write them with empty extensions
     if word_length == 15:
@@ -66,59 +134,232 @@ def generate_extensions_file(words_file: Path, extended_words_file: Path, extens
         return
     
     # For other lengths, find extensions from the next length
-    extended_words = read_words(extended_words_file)
+    with METRICS.phase("read", length=word_length + 1) as counts:
+        extended_words = read_words(extended_words_file)
+        counts["words"] = len(extended_words)
     
     # Build lookup dictionaries
-    left_lookup, right_lookup = build_extensions_lookup(extended_words, len(words[0]))
+    with METRICS.phase("lookup", length=word_length, words=len(extended_words)):
+        left_lookup, right_lookup = build_extensions_lookup(extended_words, len(words[0]))
     
     # Ensure parent directory exists
     extensions_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Process words in parallel
-    batch_size = 1000
-    batches = [words[i:i + batch_size] for i in range(0, len(words), batch_size)]
-    
-    with Pool(cpu_count()) as pool:
-        results = pool.map(process_word_batch, 
-                         [(batch, left_lookup, right_lookup) for batch in batches])
+    # Process words, sharing the lookups with workers instead of pickling them per batch
+    with METRICS.phase("format", length=word_length, lines=len(words)):
+        lines = map_word_batches(words, left_lookup, right_lookup, workers)
     
     # Write results
-    with open(extensions_file, "w", encoding="utf-8") as f:
-        for batch_result in results:
-            f.writelines(batch_result)
+    with METRICS.phase("write", length=word_length, lines=len(lines)), open(extensions_file, "w", encoding="utf-8") as f:
+        f.writelines(lines)
     
     print(f"Processed {len(words)} words")
 
 
-def main():
-    # Process both dictionaries for all word lengths
-    for dict_name in ["sjp", "osps"]:
-        print(f"\nProcessing {dict_name.upper()} dictionary...")
-        
-        for length in range(2, 16):
-            words_file = Path(f"slowniki/{dict_name}/{length}_letter_words.txt")
-            if not words_file.exists():
-                print(f"Skipping {length}-letter words (file not found)")
-                continue
-                
-            extensions_file = Path(f"slowniki/{dict_name}/extensions/{length}_letter_extensions.txt")
-            
-            if length < 15:
-                extended_words_file = Path(f"slowniki/{dict_name}/{length + 1}_letter_words.txt")
-                if not extended_words_file.exists():
-                    print(f"Skipping {length}-letter words (no extended words file)")
-                    continue
-                    
-                print(f"Processing {length}-letter words...")
-                print(f"Reading words from {words_file}")
-                print(f"Finding extensions using {extended_words_file}")
-                generate_extensions_file(words_file, extended_words_file, extensions_file, length)
-            else:
-                print(f"Processing {length}-letter words (no extensions)...")
-                generate_extensions_file(words_file, None, extensions_file, length)
-                
-            print(f"Created {extensions_file}")
+def load_dictionary(dict_dir: Path, min_length: int = 2, max_length: int = 15) -> Dict[int, List[str]]:
+    """Read every N_letter_words.txt of a dictionary exactly once, keyed by length."""
+    words_by_length = {}
+    for length in range(min_length, max_length + 1):
+        words_file = dict_dir / f"{length}_letter_words.txt"
+        if words_file.exists():
+            words_by_length[length] = read_words(words_file)
+    return words_by_length
+
+
+def build_all_extensions_lookup(words_by_length: Dict[int, List[str]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Build a single pair of left/right lookups covering every word length.
+
+    Keys of different lengths never collide, so one hash index serves all
+    lengths and each extended word is sliced only once.
+    """
+    left_extensions = {}
+    right_extensions = {}
+
+    for length in sorted(words_by_length):
+        for extended_word in words_by_length[length]:
+            word_without_first = extended_word[1:]
+            if word_without_first not in left_extensions:
+                left_extensions[word_without_first] = []
+            left_extensions[word_without_first].append(extended_word[0])
+
+            word_without_last = extended_word[:-1]
+            if word_without_last not in right_extensions:
+                right_extensions[word_without_last] = []
+            right_extensions[word_without_last].append(extended_word[-1])
+
+    return left_extensions, right_extensions
+
+
+def extension_lengths(words_by_length: Dict[int, List[str]]) -> List[int]:
+    """Return lengths that get an extensions file (N+1 words must exist, except for 15)."""
+    return [
+        length for length in sorted(words_by_length)
+        if length == 15 or length + 1 in words_by_length
+    ]
+
+
+def extensions_paths(extensions_dir: Path, length: int, formats: Tuple[str, ...] = ("text",)) -> List[Path]:
+    """Return the extensions files of one length in the requested formats."""
+    return [extensions_dir / f"{length}_letter_extensions{EXTENSIONS_FORMATS[name]}" for name in formats]
+
+
+def _write_length_extensions(length: int, words: List[str], left_lookup: Dict[str, List[str]],
+                             right_lookup: Dict[str, List[str]], extensions_file: Path,
+                             formats: Tuple[str, ...] = ("text",)) -> int:
+    """Write the extensions files of a single length and return its word count.
+
+    extensions_file is the text file; a TSV file is written next to it when requested.
+    """
+    with METRICS.phase("write", length=length, lines=len(words)):
+        if length == 15:
+            left_lookup, right_lookup = {}, {}
+        if "text" in formats:
+            lines = process_word_batch((words, left_lookup, right_lookup))
+            with open(extensions_file, "w", encoding="utf-8") as f:
+                f.writelines(lines)
+        if "tsv" in formats:
+            with open(extensions_file.with_suffix(EXTENSIONS_FORMATS["tsv"]), "w", encoding="utf-8") as f:
+                f.writelines(format_extensions_record(word, left_lookup.get(word, []), right_lookup.get(word, []))
+                             for word in words)
+    return len(words)
+
+
+def _write_shared_length(job: Tuple[int, Path]) -> Tuple[int, List[PhaseRecord]]:
+    """Write one length's extensions file from the state shared at pool start-up.
+
+    Returns the word count and the phases recorded meanwhile, for the parent to adopt.
+    """
+    length, extensions_file = job
+    METRICS.reset()
+    words = _write_length_extensions(length, _shared_state["words"][length], _shared_state["left"],
+                                     _shared_state["right"], extensions_file, _shared_state["formats"])
+    return words, list(METRICS.records)
+
+
+def iter_extension_records(words_by_length: Dict[int, List[str]]) -> Iterator[Tuple[int, List[Tuple[str, str, str]]]]:
+    """Yield (length, records) for every length that gets an extensions file, without writing files.
+
+    Records are (left hook letters, word, right hook letters) tuples, the
+    same columns as the TSV format, ready to be rendered as table rows.
+    """
+    left_lookup, right_lookup = build_all_extensions_lookup(words_by_length)
+    for length in extension_lengths(words_by_length):
+        if length == 15:
+            yield length, [("", word, "") for word in words_by_length[length]]
+            continue
+        yield length, [
+            ("".join(left_lookup.get(word, ())), word, "".join(right_lookup.get(word, ())))
+            for word in words_by_length[length]
+        ]
+
+
+def remove_stale_records(extensions_dir: Path, length: int, formats: Tuple[str, ...]):
+    """Delete a TSV file that was not rewritten, so it cannot shadow newer text output."""
+    if "tsv" not in formats:
+        stale = extensions_paths(extensions_dir, length, ("tsv",))[0]
+        if stale.exists():
+            stale.unlink()
+
+
+def generate_all_extensions(dict_dir: Path, workers: Optional[int] = None, engine: str = "dict",
+                            formats: Tuple[str, ...] = ("text",)) -> List[Path]:
+    """Generate every extensions file of a dictionary in a single pass.
+
+    The binary hook index (hooks.idx) is written alongside the text files.
+    With more than one worker, lengths are written in parallel by processes
+    that inherit the word lists and the hook index read-only. The "numpy"
+    engine computes hooks on encoded word arrays instead and runs serially.
+    formats selects "text" (LEFT WORD RIGHT lines) and/or "tsv" records;
+    a TSV file left over from an earlier run is removed when not requested,
+    since the PDF stage prefers it.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Engine must be one of {ENGINES}, got {engine!r}")
+    unknown = set(formats) - set(EXTENSIONS_FORMATS)
+    if unknown or not formats:
+        raise ValueError(f"Formats must be among {sorted(EXTENSIONS_FORMATS)}, got {list(formats)}")
+    with METRICS.phase("load") as counts:
+        words_by_length = load_dictionary(dict_dir)
+        counts["words"] = sum(len(words) for words in words_by_length.values())
+    if engine == "numpy":
+        from src.vectorized_extensions import generate_all_extensions_vectorized
+        return generate_all_extensions_vectorized(dict_dir, words_by_length, formats)
+
+    with METRICS.phase("lookup", words=counts["words"]):
+        left_lookup, right_lookup = build_all_extensions_lookup(words_by_length)
+    extensions_dir = dict_dir / "extensions"
+    extensions_dir.mkdir(parents=True, exist_ok=True)
+
+    # Largest lengths first so the longest job does not start last
+    lengths = extension_lengths(words_by_length)
+    jobs = sorted(
+        ((length, extensions_dir / f"{length}_letter_extensions.txt") for length in lengths),
+        key=lambda job: len(words_by_length[job[0]]),
+        reverse=True,
+    )
+
+    workers = min(resolve_workers(workers), max(1, len(jobs)))
+    if workers == 1:
+        for length, extensions_file in jobs:
+            _write_length_extensions(length, words_by_length[length], left_lookup, right_lookup, extensions_file,
+                                     formats)
+    else:
+        # Workers send their write phases back; they are recorded under the pool phase
+        state = {"words": words_by_length, "left": left_lookup, "right": right_lookup, "formats": formats}
+        with METRICS.phase("pool", workers=workers) as counts:
+            with _pool_context().Pool(workers, initializer=_init_worker, initargs=(state,)) as pool:
+                results = pool.map(_write_shared_length, jobs, chunksize=1)
+            counts["lines"] = sum(words for words, _ in results)
+            for _, records in results:
+                METRICS.adopt(records)
+
+    created = []
+    for length in lengths:
+        for extensions_file in extensions_paths(extensions_dir, length, formats):
+            print(f"Created {extensions_file} with {len(words_by_length[length])} words")
+            created.append(extensions_file)
+        remove_stale_records(extensions_dir, length, formats)
+
+    index_file = extensions_dir / INDEX_NAME
+    with METRICS.phase("index", words=sum(len(words_by_length[length]) for length in lengths)):
+        write_hook_index_from_lookups(index_file, {length: words_by_length[length] for length in lengths},
+                                      left_lookup, right_lookup)
+    print(f"Created {index_file}")
+
+    return created
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate extensions files for both dictionaries.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: one per CPU, 1 runs serially)")
+    parser.add_argument("--engine", choices=ENGINES, default="dict",
+                        help="dict: hash lookups per word; numpy: vectorized joins on encoded word arrays")
+    parser.add_argument("--format", dest="formats", choices=["text", "tsv", "both"], default="text",
+                        help="text: 'LEFT WORD RIGHT' lines (.txt); tsv: tab-separated records (.tsv) "
+                             "read directly by generate_pdfs; both: write both")
+    parser.add_argument("--metrics", type=Path, default=None, metavar="FILE",
+                        help="write per-phase timings, counts and peak RSS to FILE (.json or .csv)")
+    parser.add_argument("--profile", type=Path, default=None, metavar="FILE",
+                        help="profile generate_all_extensions with cProfile and dump the stats to FILE")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    # Process both dictionaries, loading each word list only once
+    with profiling(args.profile) as profiler:
+        generate = profile_calls(generate_all_extensions, profiler)
+        for dict_name in ["sjp", "osps"]:
+            print(f"\nProcessing {dict_name.upper()} dictionary...")
+            with METRICS.labels(dict_name=dict_name), METRICS.phase("extensions"):
+                generate(Path(f"slowniki/{dict_name}"), workers=args.workers, engine=args.engine,
+                         formats=("text", "tsv") if args.formats == "both" else (args.formats,))
+
+    if args.metrics:
+        METRICS.write_report(args.metrics)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
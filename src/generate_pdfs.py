@@ -1,14 +1,26 @@
+import argparse
+import functools
+import gc
+import hashlib
+import io
+import itertools
+import os
+import tempfile
+import time
+import zlib
 from pathlib import Path
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from typing import List, Tuple
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
 
+from src.fonts import FONT_NAME, SUBSET_CHARACTERS, configure_font, register_font, registered_font
+from src.generate_extensions import (EXTENSIONS_FORMATS, _pool_context, iter_extension_records, load_dictionary,
+                                     resolve_workers)
+from src.metrics import METRICS, peak_rss_mb, profile_calls, profiling
 
-# Register fonts only once at module level
-pdfmetrics.registerFont(TTFont('CustomFont', '/Library/Fonts/Arial Unicode.ttf'))
 
 # Define table style once
 TABLE_STYLE = TableStyle([
@@ -16,14 +28,14 @@ TABLE_STYLE = TableStyle([
     ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
     ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
     ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-    ('FONTNAME', (0, 0), (-1, 0), 'CustomFont'),
+    ('FONTNAME', (0, 0), (-1, 0), FONT_NAME),
     ('FONTSIZE', (0, 0), (-1, 0), 14),
     ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
     # Data rows
     ('BACKGROUND', (0, 1), (-1, -1), colors.white),
     ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
     ('ALIGN', (0, 1), (-1, -1), 'CENTER'),
-    ('FONTNAME', (0, 1), (-1, -1), 'CustomFont'),
+    ('FONTNAME', (0, 1), (-1, -1), FONT_NAME),
     ('FONTSIZE', (0, 1), (-1, -1), 10),
     ('GRID', (0, 0), (-1, -1), 1, colors.black),
     ('TOPPADDING', (0, 1), (-1, -1), 3),
@@ -34,6 +46,39 @@ TABLE_STYLE = TableStyle([
 BATCH_SIZE = 1000
 HEADER = ['Left Extensions', 'Word', 'Right Extensions']
 
+# Fixed page geometry of the canvas renderer, mirroring what SimpleDocTemplate
+# and TABLE_STYLE produce: 30pt margins, 6pt frame padding, 12pt cell leading
+PAGE_WIDTH, PAGE_HEIGHT = A4
+PAGE_MARGIN = 30
+FRAME_PADDING = 6
+TABLE_WIDTH = PAGE_WIDTH - 2 * PAGE_MARGIN
+COL_WIDTHS = [TABLE_WIDTH * 0.35, TABLE_WIDTH * 0.3, TABLE_WIDTH * 0.35]
+CELL_LEADING = 12
+HEADER_FONT_SIZE = 14
+ROW_FONT_SIZE = 10
+HEADER_HEIGHT = CELL_LEADING + 3 + 12  # leading + top padding + header bottom padding
+ROW_HEIGHT = CELL_LEADING + 3 + 3      # leading + top and bottom padding
+TABLE_TOP = PAGE_HEIGHT - PAGE_MARGIN - FRAME_PADDING
+ROWS_PER_PAGE = int((TABLE_TOP - PAGE_MARGIN - FRAME_PADDING - HEADER_HEIGHT) // ROW_HEIGHT)
+
+# Pages the streaming renderers keep in one reportlab document before
+# appending it to the output (see render_rows)
+CHUNK_PAGES = 200
+
+# Geometry of the compact renderer: smaller type, hairline grid and several
+# side-by-side tables ("bands") per page
+COMPACT_COLUMNS = 2
+COMPACT_GUTTER = 12
+COMPACT_FONT_SIZE = 8
+COMPACT_HEADER_FONT_SIZE = 9
+COMPACT_MIN_FONT_SIZE = 4
+COMPACT_ROW_HEIGHT = 11
+COMPACT_HEADER_HEIGHT = 14
+COMPACT_LINE_WIDTH = 0.5
+COMPACT_CELL_PADDING = 2
+COMPACT_TOP = PAGE_HEIGHT - PAGE_MARGIN
+COMPACT_ROWS_PER_BAND = int((COMPACT_TOP - PAGE_MARGIN - COMPACT_HEADER_HEIGHT) // COMPACT_ROW_HEIGHT)
+
 
 def parse_extensions_line(line: str, word_length: int) -> Tuple[str, str, str]:
     """Parse a line from extensions file into left extensions, word, and right extensions.
@@ -72,6 +117,11 @@ def format_extensions(ext_str: str) -> str:
     return ext_str.replace(",", "") if ext_str else ""
 
 
+def parse_extensions_record(line: str) -> List[str]:
+    """Split a 'LEFT<TAB>WORD<TAB>RIGHT' record into a table row; no search for the word needed."""
+    return line.rstrip("\n").split("\t")
+
+
 def process_batch(lines: List[str], word_length: int) -> List[List[str]]:
     """Process a batch of lines into table data."""
     table_data = []
@@ -86,11 +136,21 @@ def process_batch(lines: List[str], word_length: int) -> List[List[str]]:
     return table_data
 
 
+def read_extension_rows(extensions_file: Path, word_length: int) -> List[List[str]]:
+    """Read every table row of an extensions file, text (.txt) or TSV records (.tsv)."""
+    with open(extensions_file, 'r', encoding='utf-8') as f:
+        if extensions_file.suffix == EXTENSIONS_FORMATS["tsv"]:
+            return [parse_extensions_record(line) for line in f if line.strip()]
+        return process_batch([line.strip() for line in f if line.strip()], word_length)
+
+
 def create_pdf(extensions_file: Path, output_file: Path, word_length: int, dict_name: str):
     """Create PDF from extensions file using batch processing."""
-    # Read all lines first
-    with open(extensions_file, 'r', encoding='utf-8') as f:
-        all_lines = [line.strip() for line in f if line.strip()]
+    register_font()
+    # Read all rows first
+    with METRICS.phase("read") as counts:
+        all_rows = read_extension_rows(extensions_file, word_length)
+        counts["lines"] = len(all_rows)
     
     # Create PDF document
     doc = SimpleDocTemplate(
@@ -113,42 +173,757 @@ def create_pdf(extensions_file: Path, output_file: Path, word_length: int, dict_
     elements = []
     table_data = [HEADER]  # Start with header
     
-    for i in range(0, len(all_lines), BATCH_SIZE):
-        batch = all_lines[i:i + BATCH_SIZE]
-        table_data.extend(process_batch(batch, word_length))
-        
-        # If batch is full or this is the last batch, create table and reset
-        if len(table_data) >= BATCH_SIZE or i + BATCH_SIZE >= len(all_lines):
-            if len(table_data) > 1:  # Only create table if we have data beyond header
-                table = Table(table_data, colWidths=col_widths)
-                table.setStyle(TABLE_STYLE)
-                elements.append(table)
-            table_data = [HEADER]  # Reset with header for next batch
+    with METRICS.phase("tables", lines=len(all_rows)):
+        for i in range(0, len(all_rows), BATCH_SIZE):
+            table_data.extend(all_rows[i:i + BATCH_SIZE])
+            
+            # If batch is full or this is the last batch, create table and reset
+            if len(table_data) >= BATCH_SIZE or i + BATCH_SIZE >= len(all_rows):
+                if len(table_data) > 1:  # Only create table if we have data beyond header
+                    table = Table(table_data, colWidths=col_widths)
+                    table.setStyle(TABLE_STYLE)
+                    elements.append(table)
+                table_data = [HEADER]  # Reset with header for next batch
     
     # Build PDF
     if elements:  # Only build if we have tables to add
-        doc.build(elements)
+        with METRICS.phase("layout") as counts:
+            doc.build(elements)
+            counts["pages"] = doc.page
         print(f"Created {output_file} with {sum(len(batch) - 1 for batch in elements)} words")
     else:
         print(f"No valid {word_length}-letter words found in {extensions_file}")
 
 
-def main():
-    # Process both dictionaries
+def _column_edges() -> List[float]:
+    edges = [PAGE_MARGIN]
+    for width in COL_WIDTHS:
+        edges.append(edges[-1] + width)
+    return edges
+
+
+COLUMN_EDGES = _column_edges()
+COLUMN_CENTERS = [(left + right) / 2 for left, right in zip(COLUMN_EDGES, COLUMN_EDGES[1:])]
+
+
+def draw_table_page(pdf: canvas.Canvas, rows: Sequence[Sequence[str]]):
+    """Draw the header, rows and grid of one page directly onto the canvas."""
+    header_bottom = TABLE_TOP - HEADER_HEIGHT
+    table_bottom = header_bottom - len(rows) * ROW_HEIGHT
+
+    # Header row
+    pdf.setFillColor(colors.grey)
+    pdf.rect(PAGE_MARGIN, header_bottom, TABLE_WIDTH, HEADER_HEIGHT, stroke=0, fill=1)
+    pdf.setFillColor(colors.whitesmoke)
+    pdf.setFont(FONT_NAME, HEADER_FONT_SIZE)
+    baseline = header_bottom + 12 + CELL_LEADING - HEADER_FONT_SIZE
+    for center, text in zip(COLUMN_CENTERS, HEADER):
+        pdf.drawCentredString(center, baseline, text)
+
+    # Data rows
+    pdf.setFillColor(colors.black)
+    pdf.setFont(FONT_NAME, ROW_FONT_SIZE)
+    baseline = header_bottom - ROW_HEIGHT + 3 + CELL_LEADING - ROW_FONT_SIZE
+    for row in rows:
+        for center, text in zip(COLUMN_CENTERS, row):
+            if text:
+                pdf.drawCentredString(center, baseline, text)
+        baseline -= ROW_HEIGHT
+
+    # Grid
+    pdf.setStrokeColor(colors.black)
+    pdf.setLineWidth(1)
+    row_edges = [TABLE_TOP] + [header_bottom - i * ROW_HEIGHT for i in range(len(rows) + 1)]
+    pdf.grid(COLUMN_EDGES, [y for y in row_edges if y >= table_bottom])
+
+
+def create_pdf_canvas(extensions_file: Path, output_file: Path, word_length: int, dict_name: str):
+    """Create PDF from extensions file by drawing fixed-height rows straight onto a canvas.
+
+    Visually equivalent to create_pdf, but skips the platypus layout pass:
+    every row has the same height, so rows per page are known up front and
+    the header is repeated at the top of each page.
+    """
+    register_font()
+    with METRICS.phase("read") as counts:
+        rows = read_extension_rows(extensions_file, word_length)
+        counts["lines"] = len(rows)
+
+    if not rows:
+        print(f"No valid {word_length}-letter words found in {extensions_file}")
+        return
+
+    with METRICS.phase("draw", lines=len(rows)) as counts:
+        pdf = canvas.Canvas(str(output_file), pagesize=A4)
+        for start in range(0, len(rows), ROWS_PER_PAGE):
+            draw_table_page(pdf, rows[start:start + ROWS_PER_PAGE])
+            pdf.showPage()
+        pdf.save()
+        counts["pages"] = -(-len(rows) // ROWS_PER_PAGE)
+    print(f"Created {output_file} with {len(rows)} words")
+
+
+class RenderStats(NamedTuple):
+    rows: int
+    pages: int
+    seconds: float
+    peak_rss_mb: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def iter_extension_rows(extensions_file: Path, word_length: int, offset: int = 0,
+                        lines: Optional[int] = None) -> Iterator[List[str]]:
+    """Lazily yield table rows from an extensions file, one line at a time.
+
+    Reading starts at byte offset, which must be a line start, and stops
+    after lines non-empty lines when given.
+    """
+    with open(extensions_file, 'rb') as raw:
+        raw.seek(offset)
+        with io.TextIOWrapper(raw, encoding='utf-8') as f:
+            records = itertools.islice((line for line in f if line.strip()), lines)
+            if extensions_file.suffix == EXTENSIONS_FORMATS["tsv"]:
+                yield from (parse_extensions_record(line) for line in records)
+                return
+            for line in records:
+                yield from process_batch([line], word_length)
+
+
+def _compress_finished_page(pdf: canvas.Canvas):
+    """Flate-compress the page just closed, so only compact bytes are kept until save().
+
+    reportlab has no API for writing pages out before save(): it keeps every
+    page's text stream uncompressed until the whole document is written. A
+    stream that already carries a Filter entry is written out as-is. This
+    reaches into reportlab's page list (checked against the version pinned in
+    requirements.txt); if that is not there, the page is left for save() to
+    compress, which costs memory but not correctness.
+    """
+    try:
+        page = pdf._doc.Pages.pages[-1]
+    except (AttributeError, IndexError):
+        return
+    if not isinstance(getattr(page, "stream", None), str):
+        return
+    dictionary = pdfdoc.PDFDictionary({"Filter": pdfdoc.PDFName("FlateDecode")})
+    page.Contents = pdfdoc.PDFStream(dictionary, zlib.compress(page.stream.encode("utf8")))
+    page.stream = None
+
+
+def _reserve_font_codes(pdf: canvas.Canvas):
+    """Give the font's characters their subset codes in a fixed order.
+
+    reportlab numbers the characters of the embedded font subset in order of
+    first use, so chunks and shards of one PDF would each embed a differently
+    encoded copy. With the same order up front their font objects are
+    identical and the joined PDF keeps only one. Nothing is drawn, so the
+    reserved characters do not show up in the page text.
+    """
+    pdfmetrics.getFont(FONT_NAME).splitString(SUBSET_CHARACTERS, pdf._doc)
+
+
+def _open_streaming_canvas(output_file: Path) -> canvas.Canvas:
+    register_font()
+    pdf = canvas.Canvas(str(output_file), pagesize=A4, pageCompression=1)
+    pdf.setPageCallBack(lambda page_number: _compress_finished_page(pdf))
+    _reserve_font_codes(pdf)
+    return pdf
+
+
+class PdfJoiner:
+    """Append the pages of PDFs to one output file, writing each object as soon as it is read.
+
+    Only object offsets, page numbers and digests of the shared objects are
+    kept, so memory does not grow with the pages appended. Objects other than
+    pages and page contents that are byte for byte identical once their
+    references are renumbered (the embedded font, compact frame forms) are
+    written once. Page trees are rebuilt: pages are re-parented to a single
+    one, so a reference cycle anywhere else is rejected.
+    """
+
+    def __init__(self, output_file: Path):
+        self.output_file = output_file
+        self._file = open(output_file, "wb")
+        self._offsets: List[Optional[int]] = [None, None]   # catalog and page tree, written last
+        self._kids: List[int] = []
+        self._shared: Dict[bytes, int] = {}
+        self._info: Optional[int] = None
+        self._file.write(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+
+    def _write(self, data: bytes, number: Optional[int] = None) -> int:
+        if number is None:
+            self._offsets.append(None)
+            number = len(self._offsets)
+        self._offsets[number - 1] = self._file.tell()
+        self._file.write(b"%d 0 obj\n%s\nendobj\n" % (number, data))
+        return number
+
+    @staticmethod
+    def _serialize(obj) -> bytes:
+        buffer = io.BytesIO()
+        obj.write_to_stream(buffer)
+        return buffer.getvalue()
+
+    def _renumber(self, obj, numbers: Dict[int, int], pending: Set[int]):
+        """Point every reference inside obj at its object in the output, copying those objects first."""
+        from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject
+
+        if isinstance(obj, IndirectObject):
+            return IndirectObject(self._copy(obj, numbers, pending), 0, None)
+        if isinstance(obj, DictionaryObject):
+            for key, value in list(obj.items()):
+                obj[key] = self._renumber(value, numbers, pending)
+        elif isinstance(obj, ArrayObject):
+            for i, value in enumerate(obj):
+                obj[i] = self._renumber(value, numbers, pending)
+        return obj
+
+    def _copy(self, reference, numbers: Dict[int, int], pending: Set[int], shared: bool = True) -> int:
+        if reference.idnum in numbers:
+            return numbers[reference.idnum]
+        if reference.idnum in pending:
+            raise ValueError(f"Cannot join a PDF with a reference cycle outside its page tree (object "
+                             f"{reference.idnum})")
+        pending.add(reference.idnum)
+        data = self._serialize(self._renumber(reference.get_object(), numbers, pending))
+        pending.discard(reference.idnum)
+        if not shared:
+            number = self._write(data)
+        else:
+            digest = hashlib.sha1(data).digest()
+            number = self._shared.get(digest) or self._write(data)
+            self._shared[digest] = number
+        numbers[reference.idnum] = number
+        return number
+
+    def append(self, pdf_file: Path):
+        """Copy every page of pdf_file, with what it uses, to the end of the output."""
+        from pypdf import PdfReader
+        from pypdf.generic import IndirectObject, NameObject
+
+        reader = PdfReader(str(pdf_file))
+        numbers: Dict[int, int] = {}
+        pending: Set[int] = set()
+        if self._info is None and "/Info" in reader.trailer:
+            self._info = self._copy(reader.trailer.raw_get("/Info"), numbers, pending)
+        for page in reader.pages:
+            for key in list(page):
+                value = page.raw_get(key)
+                if key == "/Contents" and isinstance(value, IndirectObject):
+                    # Every page has its own contents, no point looking for a copy
+                    page[key] = IndirectObject(self._copy(value, numbers, pending, shared=False), 0, None)
+                elif key != "/Parent":
+                    page[key] = self._renumber(value, numbers, pending)
+            page[NameObject("/Parent")] = IndirectObject(2, 0, None)
+            self._kids.append(self._write(self._serialize(page)))
+
+    def close(self) -> int:
+        """Write the page tree, catalog and cross-reference table; returns the number of pages."""
+        kids = " ".join(f"{kid} 0 R" for kid in self._kids)
+        self._write(f"<< /Type /Pages /Count {len(self._kids)} /Kids [ {kids} ] >>".encode(), 2)
+        self._write(b"<< /Type /Catalog /Pages 2 0 R >>", 1)
+        xref = self._file.tell()
+        self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(self._offsets) + 1))
+        self._file.writelines(b"%010d 00000 n \n" % offset for offset in self._offsets)
+        info = f" /Info {self._info} 0 R" if self._info else ""
+        self._file.write(f"trailer\n<< /Size {len(self._offsets) + 1} /Root 1 0 R{info} >>\n"
+                         f"startxref\n{xref}\n%%EOF\n".encode())
+        self._file.close()
+        return len(self._kids)
+
+    def __enter__(self) -> "PdfJoiner":
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self._file.closed:
+            self._file.close()
+
+
+def render_rows(rows: Iterable[List[str]], output_file: Path, rows_per_page: int = ROWS_PER_PAGE,
+                draw_page: Callable[[canvas.Canvas, List[List[str]]], None] = draw_table_page,
+                chunk_pages: int = CHUNK_PAGES) -> Tuple[int, int]:
+    """Draw rows page by page into a new PDF with memory that does not grow with the list.
+
+    Only one page of rows is held at a time. reportlab keeps every finished
+    page (and the whole file, while saving) until save(), so pages are drawn
+    into chunk PDFs of chunk_pages pages each. Each chunk is appended to the
+    output by a PdfJoiner and deleted as soon as it is saved. A list that fits
+    in one chunk is written directly. Returns the number of rows and pages
+    written; nothing is written for no rows.
+    """
+    row_count = 0
+    pages = 0
+    with tempfile.TemporaryDirectory(dir=output_file.parent, prefix=f".{output_file.stem}.") as scratch:
+        scratch = Path(scratch)
+        pdf = joiner = None
+        chunk_file = scratch / "chunk.pdf"
+
+        def draw(page_rows: List[List[str]]):
+            nonlocal pdf, joiner, pages
+            if pdf is not None and pages % chunk_pages == 0:
+                pdf.save()
+                joiner = joiner or PdfJoiner(scratch / "joined.pdf")
+                joiner.append(chunk_file)
+                # A reportlab document is full of reference cycles; free it before the next one grows
+                pdf = None
+                gc.collect()
+            pdf = pdf or _open_streaming_canvas(chunk_file)
+            draw_page(pdf, page_rows)
+            pdf.showPage()
+            pages += 1
+
+        page_rows = []
+        for row in rows:
+            page_rows.append(row)
+            row_count += 1
+            if len(page_rows) == rows_per_page:
+                draw(page_rows)
+                page_rows = []
+        if page_rows:
+            draw(page_rows)
+
+        if pdf is not None:
+            pdf.save()
+            if joiner is None:
+                os.replace(chunk_file, output_file)
+            else:
+                with joiner:
+                    joiner.append(chunk_file)
+                    joiner.close()
+                os.replace(scratch / "joined.pdf", output_file)
+    return row_count, pages
+
+
+def stream_pdf(extensions_file: Path, output_file: Path, word_length: int, dict_name: str) -> Optional[RenderStats]:
+    """Create PDF from extensions file without holding the word list in memory.
+
+    Lines are read lazily and each page is drawn, closed and compressed as
+    soon as it fills; pages are written out in chunks (see render_rows), so
+    memory stays flat: OSPS5 (646 pages) and OSPS9 (6936 pages) both peak at
+    about 56 MB.
+    """
+    start = time.perf_counter()
+    with METRICS.phase("render") as counts:
+        rows, pages = render_rows(iter_extension_rows(extensions_file, word_length), output_file)
+        counts.update(lines=rows, pages=pages)
+    if not rows:
+        print(f"No valid {word_length}-letter words found in {extensions_file}")
+        return None
+
+    stats = RenderStats(rows, pages, time.perf_counter() - start, peak_rss_mb())
+    print(f"Created {output_file} with {rows} words on {pages} pages "
+          f"({stats.rows_per_second:,.0f} rows/s, peak RSS {stats.peak_rss_mb:.1f} MB)")
+    return stats
+
+
+def _text_width(text: str) -> float:
+    """Width of text at 1pt in the PDF font registered now."""
+    return _font_text_width(text, FONT_NAME, registered_font())
+
+
+@functools.lru_cache(maxsize=None)
+def _font_text_width(text: str, font_name: str, font_file: Optional[Path]) -> float:
+    """Width of text at 1pt; hook strings repeat a lot, so each is measured once per font.
+
+    configure_font() registers another file under the same name, so the file is part of the key.
+    """
+    return pdfmetrics.stringWidth(text, font_name, 1)
+
+
+def _fit_font_size(text: str, cell_width: float, size: float) -> float:
+    """Shrink size until text fits the cell, down to COMPACT_MIN_FONT_SIZE."""
+    width = _text_width(text) * size
+    available = cell_width - 2 * COMPACT_CELL_PADDING
+    return size if width <= available else max(COMPACT_MIN_FONT_SIZE, size * available / width)
+
+
+class CompactLayout:
+    """Multi-band page layout whose header and grid are form XObjects.
+
+    Rows fill the first band top to bottom, then the next. The header and
+    grid of a page only depend on how many rows each band holds, so they are
+    drawn once into a form per distinct shape (in practice: full pages and
+    the last page) and every page just references it. The rows of a page are
+    written as a single text object.
+    """
+
+    def __init__(self, columns: int = COMPACT_COLUMNS, header: Sequence[str] = HEADER,
+                 widths: Sequence[float] = (0.35, 0.3, 0.35)):
+        """widths are the shares of a band taken by each of the header's columns."""
+        self.columns = columns
+        self.header = header
+        self.rows_per_page = COMPACT_ROWS_PER_BAND * columns
+        band_width = (TABLE_WIDTH - (columns - 1) * COMPACT_GUTTER) / columns
+        self.band_edges = []
+        for band in range(columns):
+            edges = [PAGE_MARGIN + band * (band_width + COMPACT_GUTTER)]
+            for width in widths:
+                edges.append(edges[-1] + band_width * width)
+            self.band_edges.append(edges)
+        self.forms = set()
+        self._forms_canvas = None
+
+    def _frame_form(self, pdf: canvas.Canvas, band_rows: Tuple[int, ...]) -> str:
+        if pdf is not self._forms_canvas:
+            # A new chunk or shard: forms are drawn again into its own document
+            self.forms = set()
+            self._forms_canvas = pdf
+        name = "frame" + "_".join(map(str, band_rows))
+        if name in self.forms:
+            return name
+
+        pdf.beginForm(name)
+        header_bottom = COMPACT_TOP - COMPACT_HEADER_HEIGHT
+        pdf.setLineWidth(COMPACT_LINE_WIDTH)
+        pdf.setStrokeColor(colors.black)
+        for edges, rows in zip(self.band_edges, band_rows):
+            if not rows:
+                continue
+            pdf.setFillColor(colors.grey)
+            pdf.rect(edges[0], header_bottom, edges[-1] - edges[0], COMPACT_HEADER_HEIGHT, stroke=0, fill=1)
+            pdf.setFillColor(colors.whitesmoke)
+            for left, right, text in zip(edges, edges[1:], self.header):
+                pdf.setFont(FONT_NAME, _fit_font_size(text, right - left, COMPACT_HEADER_FONT_SIZE))
+                pdf.drawCentredString((left + right) / 2, header_bottom + 4, text)
+            pdf.grid(edges, [COMPACT_TOP] + [header_bottom - i * COMPACT_ROW_HEIGHT for i in range(rows + 1)])
+        pdf.endForm()
+        self.forms.add(name)
+        return name
+
+    def draw_page(self, pdf: canvas.Canvas, rows: Sequence[Sequence[str]]):
+        """Draw up to rows_per_page rows: the shared frame form, then all text in one object."""
+        bands = [rows[start:start + COMPACT_ROWS_PER_BAND] for start in range(0, self.rows_per_page, COMPACT_ROWS_PER_BAND)]
+        pdf.doForm(self._frame_form(pdf, tuple(len(band) for band in bands)))
+
+        text = pdf.beginText()
+        text.setFillColor(colors.black)
+        current_size = None
+        for edges, band in zip(self.band_edges, bands):
+            baseline = round(COMPACT_TOP - COMPACT_HEADER_HEIGHT - COMPACT_ROW_HEIGHT + 3, 1)
+            for row in band:
+                for left, right, cell in zip(edges, edges[1:], row):
+                    if not cell:
+                        continue
+                    size = _fit_font_size(cell, right - left, COMPACT_FONT_SIZE)
+                    if size != current_size:
+                        text.setFont(FONT_NAME, size)
+                        current_size = size
+                    text.setTextOrigin(round((left + right - _text_width(cell) * size) / 2, 1), baseline)
+                    text.textOut(cell)
+                baseline -= COMPACT_ROW_HEIGHT
+        pdf.drawText(text)
+
+
+class CompactStats(NamedTuple):
+    rows: int
+    pages: int
+    size: int                      # bytes
+    previous_pages: Optional[int]  # the PDF replaced at the same path, if there was one
+    previous_size: Optional[int]
+
+
+def count_pdf_pages(pdf_file: Path) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(str(pdf_file)).pages)
+
+
+def _describe_pdf(size: int, pages: int) -> str:
+    return f"{size / 1024:,.0f} KB, {pages} pages"
+
+
+def compact_pdf(extensions_file: Path, output_file: Path, word_length: int, dict_name: str,
+                columns: int = COMPACT_COLUMNS) -> Optional[CompactStats]:
+    """Create a small PDF for distribution: compressed, multi-column, header and grid as shared forms.
+
+    Reports the size and page count of the PDF it replaces (or, if there is
+    none, the page count of the standard one-table layout) next to its own.
+    """
+    previous_pages = previous_size = None
+    if output_file.exists():
+        previous_pages, previous_size = count_pdf_pages(output_file), output_file.stat().st_size
+
+    layout = CompactLayout(columns)
+    with METRICS.phase("render") as counts:
+        rows, pages = render_rows(iter_extension_rows(extensions_file, word_length), output_file,
+                                  layout.rows_per_page, layout.draw_page)
+        counts.update(lines=rows, pages=pages)
+    if not rows:
+        print(f"No valid {word_length}-letter words found in {extensions_file}")
+        return None
+
+    stats = CompactStats(rows, pages, output_file.stat().st_size, previous_pages, previous_size)
+    if previous_pages is not None:
+        before = _describe_pdf(previous_size, previous_pages)
+    else:
+        before = f"{-(-rows // ROWS_PER_PAGE)} pages in the standard layout"
+    print(f"Created {output_file} with {rows} words: {before} -> {_describe_pdf(stats.size, pages)}")
+    return stats
+
+
+def render_in_process(dict_dir: Path, dict_name: str, renderer: str = "stream",
+                      columns: int = COMPACT_COLUMNS) -> List[Path]:
+    """Compute extension records in memory and render every PDF from them, skipping the files.
+
+    The word lists are read once; each length's records go straight to the
+    page writer of renderer (one of SHARD_RENDERERS) without a text round-trip.
+    """
+    if renderer not in SHARD_RENDERERS:
+        raise ValueError(f"Renderer {renderer!r} cannot render in process, use one of {SHARD_RENDERERS}")
+    rows_per_page, draw_page = page_layout(renderer, columns)
+    created = []
+    with METRICS.phase("load") as counts:
+        words_by_length = load_dictionary(dict_dir)
+        counts["words"] = sum(len(words) for words in words_by_length.values())
+    for length, records in iter_extension_records(words_by_length):
+        output_file = dict_dir / f"{dict_name.upper()}{length}.pdf"
+        with METRICS.phase("render", length=length) as counts:
+            rows, pages = render_rows(records, output_file, rows_per_page, draw_page)
+            counts.update(lines=rows, pages=pages)
+        if not rows:
+            print(f"No valid words found for {output_file}")
+            continue
+        print(f"Created {output_file} with {rows} words on {pages} pages")
+        created.append(output_file)
+    return created
+
+
+# Renderers --parallel can shard and --in-process can feed: every page holds a fixed number of rows
+SHARD_RENDERERS = ("canvas", "stream", "compact")
+
+
+class ShardJob(NamedTuple):
+    extensions_file: Path
+    output_file: Path
+    word_length: int
+    offset: int              # byte offset of the shard's first line
+    lines: Optional[int]     # non-empty lines to render; None renders to the end of the file
+    weight: int              # approximate number of rows, used for scheduling
+    renderer: str = "stream"
+    columns: int = COMPACT_COLUMNS
+
+
+def page_layout(renderer: str, columns: int = COMPACT_COLUMNS
+                ) -> Tuple[int, Callable[[canvas.Canvas, List[List[str]]], None]]:
+    """Return rows per page and the page drawing function of a shardable renderer.
+
+    canvas and stream draw the same pages; compact gets a fresh layout of
+    its own.
+    """
+    if renderer == "compact":
+        layout = CompactLayout(columns)
+        return layout.rows_per_page, layout.draw_page
+    if renderer in SHARD_RENDERERS:
+        return ROWS_PER_PAGE, draw_table_page
+    raise ValueError(f"Renderer {renderer!r} cannot be sharded, use one of {SHARD_RENDERERS}")
+
+
+def plan_shards(extensions_file: Path, output_file: Path, word_length: int, shard_pages: int,
+                renderer: str = "stream", columns: int = COMPACT_COLUMNS) -> List[ShardJob]:
+    """Split one PDF into page-aligned ranges of at most shard_pages pages.
+
+    One pass over the file records the byte offset at which each shard
+    starts, so every shard seeks straight to its own lines.
+    """
+    shard_rows = max(1, shard_pages) * page_layout(renderer, columns)[0]
+    offsets = []
+    total_rows = 0
+    position = 0
+    with open(extensions_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                if total_rows % shard_rows == 0:
+                    offsets.append(position)
+                total_rows += 1
+            position += len(line)
+
+    if len(offsets) <= 1:
+        return [ShardJob(extensions_file, output_file, word_length, 0, None, total_rows, renderer, columns)]
+
+    shards = []
+    for index, offset in enumerate(offsets):
+        last = index == len(offsets) - 1
+        part_file = output_file.with_name(f"{output_file.stem}.part{index:04d}.pdf")
+        weight = total_rows - index * shard_rows if last else shard_rows
+        shards.append(ShardJob(extensions_file, part_file, word_length, offset, None if last else shard_rows, weight,
+                               renderer, columns))
+    return shards
+
+
+def render_shard(job: ShardJob) -> Tuple[ShardJob, int, int]:
+    """Render one page-aligned range of an extensions file, read from its byte offset, into its own PDF."""
+    rows_per_page, draw_page = page_layout(job.renderer, job.columns)
+    rows = iter_extension_rows(job.extensions_file, job.word_length, job.offset, job.lines)
+    row_count, pages = render_rows(rows, job.output_file, rows_per_page, draw_page)
+    return job, row_count, pages
+
+
+def concatenate_pdfs(part_files: List[Path], output_file: Path):
+    """Join rendered shards into one PDF, keeping their page order.
+
+    Objects the shards share byte for byte (the embedded font, compact frame
+    forms) are written once (see PdfJoiner).
+    """
+    with PdfJoiner(output_file) as joiner:
+        for part_file in part_files:
+            joiner.append(part_file)
+        joiner.close()
+    for part_file in part_files:
+        part_file.unlink()
+
+
+def build_pdfs(targets: List[Tuple[Path, Path, int]], workers: Optional[int] = None,
+               shard_pages: int = 500, renderer: str = "stream", columns: int = COMPACT_COLUMNS) -> List[Path]:
+    """Render many PDFs in a process pool, splitting large lists into page-range shards.
+
+    targets holds (extensions_file, output_file, word_length) triples.
+    renderer is one of SHARD_RENDERERS. All shards of all PDFs are scheduled
+    largest first so a long list does not start last; shards of one PDF are
+    concatenated once they are all done.
+    """
+    shards_by_output: Dict[Path, List[ShardJob]] = {}
+    for extensions_file, output_file, word_length in targets:
+        shards_by_output[output_file] = plan_shards(extensions_file, output_file, word_length, shard_pages,
+                                                    renderer, columns)
+    jobs = sorted((job for shards in shards_by_output.values() for job in shards),
+                  key=lambda job: job.weight, reverse=True)
+
+    workers = min(resolve_workers(workers), max(1, len(jobs)))
+    with METRICS.phase("render", workers=workers, shards=len(jobs)) as counts:
+        if workers == 1:
+            results = [render_shard(job) for job in jobs]
+        else:
+            with _pool_context().Pool(workers) as pool:
+                results = list(pool.imap_unordered(render_shard, jobs))
+        counts.update(lines=sum(rows for _, rows, _ in results), pages=sum(pages for _, _, pages in results))
+    rendered = {job.output_file: (row_count, pages) for job, row_count, pages in results}
+
+    created = []
+    for output_file, shards in shards_by_output.items():
+        parts = [job.output_file for job in shards if rendered[job.output_file][0]]
+        row_count = sum(rendered[job.output_file][0] for job in shards)
+        pages = sum(rendered[job.output_file][1] for job in shards)
+        if not row_count:
+            print(f"No valid words found for {output_file}")
+            continue
+        if len(shards) > 1:
+            with METRICS.phase("concatenate", pages=pages):
+                concatenate_pdfs(parts, output_file)
+        print(f"Created {output_file} with {row_count} words on {pages} pages ({len(shards)} shards)")
+        created.append(output_file)
+    return created
+
+
+RENDERERS = {
+    "table": create_pdf,
+    "canvas": create_pdf_canvas,
+    "stream": stream_pdf,
+    "compact": compact_pdf,
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate PDFs from extensions files.")
+    parser.add_argument("--renderer", choices=sorted(RENDERERS), default=None,
+                        help="table (default): platypus Table layout; canvas: direct fixed-row drawing (much faster); "
+                             "stream: canvas drawing with lazy input and pages compressed as they close; "
+                             "compact: small multi-column PDFs for distribution")
+    parser.add_argument("--columns", type=int, default=COMPACT_COLUMNS,
+                        help="side-by-side tables per page with --renderer compact")
+    parser.add_argument("--parallel", action="store_true",
+                        help="render all PDFs in a process pool with page-range shards "
+                             f"(renderers: {', '.join(SHARD_RENDERERS)}; default stream)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --parallel (default: one per CPU)")
+    parser.add_argument("--shard-pages", type=int, default=500,
+                        help="split lists longer than this many pages into shards rendered in parallel")
+    parser.add_argument("--metrics", type=Path, default=None, metavar="FILE",
+                        help="write per-phase timings, counts and peak RSS to FILE (.json or .csv)")
+    parser.add_argument("--profile", type=Path, default=None, metavar="FILE",
+                        help="profile the renderer with cProfile and dump the stats to FILE "
+                             "(with --parallel only the parent process is profiled)")
+    parser.add_argument("--in-process", action="store_true",
+                        help="compute extensions from the word lists in memory and render them directly, "
+                             f"no extensions files needed (renderers: {', '.join(SHARD_RENDERERS)}; default stream)")
+    parser.add_argument("--font", type=Path, default=None,
+                        help="TrueType font with Polish glyphs (default: $PRZEDLUZKI_FONT or a system font)")
+    args = parser.parse_args(argv)
+    if args.parallel and args.in_process:
+        parser.error("--parallel and --in-process cannot be combined")
+    for option, enabled in (("--parallel", args.parallel), ("--in-process", args.in_process)):
+        if enabled and args.renderer not in (None,) + SHARD_RENDERERS:
+            parser.error(f"{option} renders with one of {', '.join(SHARD_RENDERERS)}, not {args.renderer}")
+    args.renderer = args.renderer or ("stream" if args.parallel or args.in_process else "table")
+    return args
+
+
+def find_extensions_file(dict_name: str, length: int) -> Optional[Path]:
+    """Return the extensions file of a length, preferring TSV records over the text export."""
+    for suffix in (EXTENSIONS_FORMATS["tsv"], EXTENSIONS_FORMATS["text"]):
+        extensions_file = Path(f"slowniki/{dict_name}/extensions/{length}_letter_extensions{suffix}")
+        if extensions_file.exists():
+            return extensions_file
+    return None
+
+
+def find_targets() -> List[Tuple[Path, Path, int]]:
+    """List (extensions_file, output_file, word_length) for every existing extensions file."""
+    targets = []
     for dict_name in ["sjp", "osps"]:
-        print(f"\nProcessing {dict_name.upper()} dictionary...")
-        
         for length in range(2, 16):
-            extensions_file = Path(f"slowniki/{dict_name}/extensions/{length}_letter_extensions.txt")
-            if not extensions_file.exists():
+            extensions_file = find_extensions_file(dict_name, length)
+            if extensions_file is None:
                 print(f"Skipping {dict_name.upper()}{length} (extensions file not found)")
                 continue
+            targets.append((extensions_file, Path(f"slowniki/{dict_name}/{dict_name.upper()}{length}.pdf"), length))
+    return targets
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    if args.font:
+        configure_font(args.font)
+
+    with profiling(args.profile) as profiler:
+        if args.in_process:
+            for dict_name in ["sjp", "osps"]:
+                print(f"\nProcessing {dict_name.upper()} dictionary...")
+                with METRICS.labels(dict_name=dict_name), METRICS.phase("pdf"):
+                    profile_calls(render_in_process, profiler)(Path(f"slowniki/{dict_name}"), dict_name,
+                                                               args.renderer, args.columns)
+        elif args.parallel:
+            with METRICS.phase("pdf"):
+                profile_calls(build_pdfs, profiler)(find_targets(), workers=args.workers,
+                                                    shard_pages=args.shard_pages, renderer=args.renderer,
+                                                    columns=args.columns)
+        else:
+            render = RENDERERS[args.renderer]
+            if args.renderer == "compact":
+                render = functools.partial(compact_pdf, columns=args.columns)
+            render = profile_calls(render, profiler)
+
+            # Process both dictionaries
+            for dict_name in ["sjp", "osps"]:
+                print(f"\nProcessing {dict_name.upper()} dictionary...")
                 
-            output_file = Path(f"slowniki/{dict_name}/{dict_name.upper()}{length}.pdf")
-            print(f"Processing {dict_name.upper()}{length}...")
-            
-            create_pdf(extensions_file, output_file, length, dict_name)
+                for length in range(2, 16):
+                    extensions_file = find_extensions_file(dict_name, length)
+                    if extensions_file is None:
+                        print(f"Skipping {dict_name.upper()}{length} (extensions file not found)")
+                        continue
+                        
+                    output_file = Path(f"slowniki/{dict_name}/{dict_name.upper()}{length}.pdf")
+                    print(f"Processing {dict_name.upper()}{length}...")
+                    
+                    with METRICS.labels(dict_name=dict_name, length=length), METRICS.phase("pdf"):
+                        render(extensions_file, output_file, length, dict_name)
+
+    if args.metrics:
+        METRICS.write_report(args.metrics)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
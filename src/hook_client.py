@@ -0,0 +1,72 @@
+import argparse
+import http.client
+import json
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from src.hook_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+class HookClient:
+    """Client for hook_server keeping one HTTP connection open across requests."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 10.0):
+        self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _request(self, method: str, path: str, body: Optional[bytes] = None) -> Dict:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        payload = json.loads(response.read().decode("utf-8"))
+        if response.status != 200:
+            raise ValueError(f"{response.status} {response.reason}: {payload.get('error')}")
+        return payload
+
+    def hooks(self, word: str, dict_name: str = "osps") -> Dict:
+        """Look up one word; returns {"word", "found", "left", "right", "dict"}."""
+        return self._request("GET", "/hooks?" + urlencode({"word": word, "dict": dict_name}))
+
+    def batch_hooks(self, words: List[str], dict_name: str = "osps") -> List[Dict]:
+        """Look up many words in one request."""
+        body = json.dumps({"words": words}, ensure_ascii=False).encode("utf-8")
+        return self._request("POST", "/hooks?" + urlencode({"dict": dict_name}), body)["results"]
+
+    def stats(self) -> Dict:
+        """Return the server's request counters and p50/p99 latency in milliseconds."""
+        return self._request("GET", "/stats")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "HookClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Query a running hook_server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--dict", dest="dict_name", choices=["sjp", "osps"], default="osps")
+    parser.add_argument("--stats", action="store_true", help="print server statistics")
+    parser.add_argument("words", nargs="*")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    with HookClient(args.host, args.port) as client:
+        if args.words:
+            for result in client.batch_hooks(args.words, args.dict_name):
+                if result["found"]:
+                    print(f"{result['left']} {result['word']} {result['right']}")
+                else:
+                    print(f"{result['word']} not found")
+        if args.stats:
+            print(json.dumps(client.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+import argparse
+import mmap
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.collation import POLISH_ALPHABET, POLISH_ALPHABET_ORDER, make_sort_key, rank_matrix
+
+
+INDEX_NAME = "hooks.idx"
+MAGIC = b"PRZHOOK2"
+HEADER = struct.Struct("<8sIQQ")         # magic, number of sections, foreign table offset and size
+SECTION = struct.Struct("<IIQQQ")        # word length, word count, words/left/right offsets
+
+# Packed words use one byte per letter: its rank in POLISH_ALPHABET_ORDER (1-32),
+# so bytewise order of the packed words is Polish alphabetical order.
+_encode_key = make_sort_key("error")
+# Words or hooks with letters outside the alphabet (Q, V, X in SJP) cannot be
+# packed or masked; they are kept in a small foreign table of hook strings.
+_foreign_key = make_sort_key("last")
+
+
+class Hooks(NamedTuple):
+    left: str   # hook letters in Polish order, e.g. "BLŻ"
+    right: str
+
+
+def encode_word(word: str) -> Optional[bytes]:
+    """Pack a word into one rank byte per letter, or None if it has non-alphabet letters."""
+    try:
+        return _encode_key(word)
+    except ValueError:
+        return None
+
+
+def hooks_mask(letters: Iterable[str]) -> int:
+    """Pack hook letters into a 32-bit mask, bit (rank - 1) per letter.
+
+    Letters outside the alphabet have no bit; see foreign_entry.
+    """
+    mask = 0
+    for letter in letters:
+        rank = POLISH_ALPHABET_ORDER.get(letter)
+        if rank is not None:
+            mask |= 1 << (rank - 1)
+    return mask
+
+
+def foreign_entry(word: str, left: Iterable[str], right: Iterable[str]) -> Optional[Hooks]:
+    """Return a word's hooks as strings if the word or a hook has letters outside the alphabet, else None."""
+    left, right = "".join(left), "".join(right)
+    if encode_word(word) is None or any(letter not in POLISH_ALPHABET_ORDER for letter in left + right):
+        return Hooks(left, right)
+    return None
+
+
+@lru_cache(maxsize=None)
+def mask_letters(mask: int) -> str:
+    """Unpack a 32-bit hook mask into its letters in Polish order."""
+    return "".join(letter for bit, letter in enumerate(POLISH_ALPHABET) if mask >> bit & 1)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def write_hook_index(index_file: Path, sections: Dict[int, Tuple[Sequence[str], Sequence[int], Sequence[int]]],
+                     foreign: Optional[Dict[str, Hooks]] = None):
+    """Write a hook index from (words, left masks, right masks) per word length.
+
+    Words that cannot be packed are skipped; duplicates are merged by OR-ing
+    their masks. Each section is stored sorted by packed word. foreign holds
+    the full hooks of words that have letters outside the alphabet in the word
+    or its hooks (see foreign_entry); they are stored as a table after the
+    sections and take precedence over the masks.
+    """
+    packed = {}
+    for length, (words, left_masks, right_masks) in sorted(sections.items()):
+        entries = {}
+        for word, left, right in zip(words, left_masks, right_masks):
+            key = encode_word(word)
+            if key is None or len(key) != length:
+                continue
+            old_left, old_right = entries.get(key, (0, 0))
+            entries[key] = (old_left | left, old_right | right)
+        if entries:
+            keys = sorted(entries)
+            packed[length] = (
+                b"".join(keys),
+                np.array([entries[key][0] for key in keys], dtype="<u4"),
+                np.array([entries[key][1] for key in keys], dtype="<u4"),
+            )
+
+    offset = HEADER.size + SECTION.size * len(packed)
+    layout = []
+    for length, (words_blob, left, right) in packed.items():
+        words_offset = _align(offset)
+        left_offset = _align(words_offset + len(words_blob))
+        right_offset = left_offset + left.nbytes
+        offset = right_offset + right.nbytes
+        layout.append((length, len(left), words_offset, left_offset, right_offset))
+    foreign_blob = "".join(
+        f"{hooks.left}\t{word}\t{hooks.right}\n"
+        for word, hooks in sorted((foreign or {}).items(), key=lambda item: (len(item[0]), _foreign_key(item[0])))
+    ).encode("utf-8")
+
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(index_file, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(layout), _align(offset), len(foreign_blob)))
+        for entry in layout:
+            f.write(SECTION.pack(*entry))
+        for (length, count, words_offset, left_offset, right_offset), (words_blob, left, right) in \
+                zip(layout, packed.values()):
+            f.write(b"\0" * (words_offset - f.tell()))
+            f.write(words_blob)
+            f.write(b"\0" * (left_offset - f.tell()))
+            f.write(left.tobytes())
+            f.write(right.tobytes())
+        f.write(b"\0" * (_align(offset) - f.tell()))
+        f.write(foreign_blob)
+
+
+def write_hook_index_from_lookups(index_file: Path, words_by_length: Dict[int, List[str]],
+                                  left_lookup: Dict[str, List[str]], right_lookup: Dict[str, List[str]]):
+    """Write a hook index straight from the extensions stage's lookups."""
+    sections = {}
+    foreign = {}
+    for length, words in words_by_length.items():
+        left_masks = [hooks_mask(left_lookup.get(word, ())) for word in words]
+        right_masks = [hooks_mask(right_lookup.get(word, ())) for word in words]
+        sections[length] = (words, left_masks, right_masks)
+        for word in words:
+            hooks = foreign_entry(word, left_lookup.get(word, ()), right_lookup.get(word, ()))
+            if hooks is not None:
+                foreign[word] = hooks
+    write_hook_index(index_file, sections, foreign)
+
+
+def build_hook_index_from_extensions(extensions_dir: Path, index_file: Optional[Path] = None) -> Path:
+    """Build a hook index from existing N_letter_extensions.txt files."""
+    sections = {}
+    foreign = {}
+    for extensions_file in sorted(extensions_dir.glob("*_letter_extensions.txt")):
+        words, left_masks, right_masks = [], [], []
+        with open(extensions_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                left, word, right = line.rstrip("\n").split(" ")
+                left, right = left.split(","), right.split(",")
+                words.append(word)
+                left_masks.append(hooks_mask(left))
+                right_masks.append(hooks_mask(right))
+                hooks = foreign_entry(word, left, right)
+                if hooks is not None:
+                    foreign[word] = hooks
+        if words:
+            sections[len(words[0])] = (words, left_masks, right_masks)
+
+    index_file = index_file or extensions_dir / INDEX_NAME
+    write_hook_index(index_file, sections, foreign)
+    return index_file
+
+
+def is_current_index(index_file: Path) -> bool:
+    """Tell whether index_file exists and was written in the current format."""
+    try:
+        with open(index_file, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except FileNotFoundError:
+        return False
+
+
+class HookIndex:
+    """Memory-mapped hook index answering hooks(word) without parsing text.
+
+    Opening only maps the file and reads the section table and the small
+    foreign table; lookups binary search the packed words of the word's
+    length, except for foreign words, whose hooks come from the table.
+    """
+
+    def __init__(self, index_file: Path):
+        self.index_file = Path(index_file)
+        self._file = open(self.index_file, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, section_count, foreign_offset, foreign_size = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.index_file} is not a hook index in the current format, rebuild it")
+
+        self.sections = {}
+        for i in range(section_count):
+            length, count, words_offset, left_offset, right_offset = \
+                SECTION.unpack_from(self._mmap, HEADER.size + i * SECTION.size)
+            self.sections[length] = (
+                np.frombuffer(self._mmap, dtype=f"S{length}", count=count, offset=words_offset),
+                np.frombuffer(self._mmap, dtype="<u4", count=count, offset=left_offset),
+                np.frombuffer(self._mmap, dtype="<u4", count=count, offset=right_offset),
+            )
+        self.foreign: Dict[str, Hooks] = {}
+        for line in self._mmap[foreign_offset:foreign_offset + foreign_size].decode("utf-8").splitlines():
+            left, word, right = line.split("\t")
+            self.foreign[word] = Hooks(left, right)
+
+    def __len__(self) -> int:
+        unpacked = sum(1 for word in self.foreign if encode_word(word) is None)
+        return sum(len(words) for words, _, _ in self.sections.values()) + unpacked
+
+    def __contains__(self, word: str) -> bool:
+        return word.upper() in self.foreign or self.masks(word) is not None
+
+    def masks(self, word: str) -> Optional[Tuple[int, int]]:
+        """Return the (left, right) hook masks of a word, or None if it is not in a section.
+
+        Masks only hold alphabet letters; hooks() also covers foreign words.
+        """
+        key = encode_word(word)
+        section = self.sections.get(len(key)) if key else None
+        if section is None:
+            return None
+        words, left, right = section
+        i = int(words.searchsorted(key))
+        if i < len(words) and words[i] == key:
+            return int(left[i]), int(right[i])
+        return None
+
+    def hooks(self, word: str) -> Optional[Hooks]:
+        """Return the left and right hook letters of a word, or None if it is not indexed."""
+        foreign = self.foreign.get(word.upper())
+        if foreign is not None:
+            return foreign
+        masks = self.masks(word)
+        if masks is None:
+            return None
+        return Hooks(mask_letters(masks[0]), mask_letters(masks[1]))
+
+    def batch_masks(self, words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized lookup: return found flags and left/right masks for many words.
+
+        Like masks(), this covers alphabet letters only; batch_hooks() also
+        covers foreign words.
+        """
+        found = np.zeros(len(words), dtype=bool)
+        left_masks = np.zeros(len(words), dtype=np.uint32)
+        right_masks = np.zeros(len(words), dtype=np.uint32)
+
+        if not len(words):
+            return found, left_masks, right_masks
+
+        try:
+            matrix, lengths, valid = rank_matrix(list(words))
+        except ValueError:
+            # Some word changes length when upper-cased; look words up one by one
+            for position, word in enumerate(words):
+                masks = self.masks(word)
+                if masks is not None:
+                    found[position] = True
+                    left_masks[position], right_masks[position] = masks
+            return found, left_masks, right_masks
+
+        for length, (section_words, left, right) in self.sections.items():
+            positions = np.flatnonzero(valid & (lengths == length))
+            if not positions.size:
+                continue
+            wanted = np.ascontiguousarray(matrix[positions, :length]).view(f"S{length}").ravel()
+            idx = np.minimum(section_words.searchsorted(wanted), len(section_words) - 1)
+            hit = section_words[idx] == wanted
+            found[positions[hit]] = True
+            left_masks[positions[hit]] = left[idx[hit]]
+            right_masks[positions[hit]] = right[idx[hit]]
+
+        return found, left_masks, right_masks
+
+    def batch_hooks(self, words: Sequence[str]) -> List[Optional[Hooks]]:
+        """Look up many words at once; missing words map to None."""
+        found, left_masks, right_masks = self.batch_masks(words)
+        results = [
+            Hooks(mask_letters(left), mask_letters(right)) if hit else None
+            for hit, left, right in zip(found.tolist(), left_masks.tolist(), right_masks.tolist())
+        ]
+        if self.foreign:
+            for position, word in enumerate(words):
+                foreign = self.foreign.get(word.upper())
+                if foreign is not None:
+                    results[position] = foreign
+        return results
+
+    def close(self):
+        self.sections = {}
+        self.foreign = {}
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> "HookIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build or query the binary hook index.")
+    parser.add_argument("--dict", dest="dict_name", choices=["sjp", "osps"], default=None,
+                        help="dictionary to use (default: build both)")
+    parser.add_argument("words", nargs="*", help="words to look up instead of building the index")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    dict_names = [args.dict_name] if args.dict_name else ["sjp", "osps"]
+
+    if not args.words:
+        for dict_name in dict_names:
+            index_file = build_hook_index_from_extensions(Path(f"slowniki/{dict_name}/extensions"))
+            print(f"Created {index_file}")
+        return
+
+    for dict_name in dict_names:
+        with HookIndex(Path(f"slowniki/{dict_name}/extensions/{INDEX_NAME}")) as index:
+            for word, hooks in zip(args.words, index.batch_hooks(args.words)):
+                if hooks is None:
+                    print(f"{dict_name.upper()}: {word.upper()} not found")
+                else:
+                    print(f"{dict_name.upper()}: {hooks.left} {word.upper()} {hooks.right}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from src.hook_index import INDEX_NAME, HookIndex, build_hook_index_from_extensions, is_current_index
+
+
+DICT_NAMES = ["sjp", "osps"]
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+LATENCY_WINDOW = 10000
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def load_indexes(base_dir: Path = Path("slowniki")) -> Dict[str, HookIndex]:
+    """Open the hook index of every dictionary, building it from the extensions files if missing or outdated.
+
+    An index written before the foreign table existed would answer words
+    with Q, V or X as missing, or without those hooks, so it is rebuilt.
+    """
+    indexes = {}
+    for dict_name in DICT_NAMES:
+        extensions_dir = base_dir / dict_name / "extensions"
+        index_file = extensions_dir / INDEX_NAME
+        if not is_current_index(index_file):
+            if not extensions_dir.exists():
+                print(f"Skipping {dict_name.upper()} (no extensions directory)")
+                continue
+            build_hook_index_from_extensions(extensions_dir, index_file)
+        indexes[dict_name] = HookIndex(index_file)
+        print(f"Loaded {dict_name.upper()} hook index with {len(indexes[dict_name])} words")
+    return indexes
+
+
+class RequestStats:
+    """Request counters and a sliding window of latencies."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.counters: Counter = Counter()
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def record(self, route: str, status: int, words: int, seconds: float):
+        self.counters["requests"] += 1
+        self.counters[f"route:{route}"] += 1
+        self.counters[f"status:{status}"] += 1
+        self.counters["words"] += words
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> Dict:
+        latency = {"p50": 0.0, "p99": 0.0}
+        if self.latencies:
+            p50, p99 = np.percentile(np.fromiter(self.latencies, dtype=float), [50, 99])
+            latency = {"p50": round(p50 * 1000, 3), "p99": round(p99 * 1000, 3)}
+        return {"counters": dict(self.counters), "latency_ms": latency, "window": len(self.latencies)}
+
+
+class HookServer:
+    """Minimal HTTP/1.1 hook lookup server on asyncio streams.
+
+    GET  /hooks?word=ABY&dict=osps   single lookup
+    POST /hooks?dict=osps            batch lookup; body {"words": [...]} or one word per line
+    GET  /stats                      counters and p50/p99 latency
+    """
+
+    def __init__(self, indexes: Dict[str, HookIndex]):
+        self.indexes = indexes
+        self.stats = RequestStats()
+
+    def lookup(self, dict_name: str, words: List[str]) -> List[Dict]:
+        results = []
+        for word, hooks in zip(words, self.indexes[dict_name].batch_hooks(words)):
+            if hooks is None:
+                results.append({"word": word.upper(), "found": False, "left": "", "right": ""})
+            else:
+                results.append({"word": word.upper(), "found": True, "left": hooks.left, "right": hooks.right})
+        return results
+
+    def route(self, method: str, target: str, body: bytes) -> Tuple[int, Dict, str, int]:
+        """Answer one request; returns (status, payload, route name, number of words looked up)."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == "/stats":
+            return 200, self.stats.snapshot(), "stats", 0
+        if url.path != "/hooks":
+            return 404, {"error": f"unknown path {url.path}"}, "unknown", 0
+
+        dict_name = query.get("dict", ["osps"])[0].lower()
+        if dict_name not in self.indexes:
+            return 400, {"error": f"dict must be one of {sorted(self.indexes)}"}, "hooks", 0
+
+        if method == "GET":
+            word = query.get("word", [""])[0]
+            if not word:
+                return 400, {"error": "missing word parameter"}, "hooks", 0
+            return 200, {"dict": dict_name, **self.lookup(dict_name, [word])[0]}, "hooks", 1
+
+        if method == "POST":
+            text = body.decode("utf-8")
+            if text.lstrip().startswith("{"):
+                words = json.loads(text).get("words", [])
+                if not isinstance(words, list) or not all(isinstance(word, str) for word in words):
+                    return 400, {"error": "words must be a list of strings"}, "batch", 0
+            else:
+                words = [line.strip() for line in text.splitlines() if line.strip()]
+            return 200, {"dict": dict_name, "results": self.lookup(dict_name, words)}, "batch", len(words)
+
+        return 405, {"error": f"method {method} not allowed"}, "hooks", 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start = time.perf_counter()
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, payload, route, words = self.route(method, target, body)
+                except (ValueError, AttributeError) as error:
+                    status, payload, route, words = 400, {"error": str(error)}, "hooks", 0
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                self.stats.record(route, status, words, time.perf_counter() - start)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def serve(host: str, port: int, base_dir: Path):
+    server = await HookServer(load_indexes(base_dir)).start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving hook lookups on http://{address[0]}:{address[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve hook lookups for both dictionaries over local HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--base-dir", type=Path, default=Path("slowniki"))
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.base_dir))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.collation import POLISH_ALPHABET
+from src.compare import decode_packed_words, open_hook_index
+from src.hook_index import HookIndex, encode_word, mask_letters
+from src.metrics import METRICS
+
+
+DICT_NAMES = ["sjp", "osps"]
+DEFAULT_TOP = 1000
+NOT_COMPARED = "-"   # own-hook cells of a length the other dictionary has no section for
+
+Section = Tuple[np.ndarray, np.ndarray, np.ndarray]  # packed words, left masks, right masks
+
+
+def mask_bits(masks: np.ndarray) -> np.ndarray:
+    """Unpack uint32 hook masks into a (words, 32) 0/1 matrix; column i is the letter of rank i + 1."""
+    as_bytes = np.ascontiguousarray(masks, dtype="<u4").view(np.uint8).reshape(-1, 4)
+    return np.unpackbits(as_bytes, axis=1, bitorder="little")
+
+
+def hook_weights(letter_counts: np.ndarray, words: int) -> np.ndarray:
+    """Weight each hook letter by its rarity: log2 of words per word having that hook (smoothed)."""
+    return np.log2((words + 1) / (letter_counts + 1))
+
+
+class LengthStatistics(NamedTuple):
+    length: int
+    words: np.ndarray          # packed words in Polish order
+    left: np.ndarray           # hook masks
+    right: np.ndarray
+    hooks: np.ndarray          # hooks per word
+    scores: np.ndarray         # rarity-weighted hook count
+    left_only: np.ndarray      # masks of hooks the other dictionary does not allow
+    right_only: np.ndarray
+    compared: bool             # False when there is no other section to take own hooks from
+    word_letters: np.ndarray   # per letter: occurrences in the words
+    left_letters: np.ndarray   # per letter: words having it as a left hook
+    right_letters: np.ndarray
+
+
+def _masks_in(words: np.ndarray, other: Optional[Section]) -> Tuple[np.ndarray, np.ndarray]:
+    """Look words up in another dictionary's section; words it lacks get empty masks."""
+    left = np.zeros(len(words), dtype=np.uint32)
+    right = np.zeros(len(words), dtype=np.uint32)
+    if other is None or not len(other[0]) or not len(words):
+        return left, right
+    other_words, other_left, other_right = other
+    idx = np.minimum(other_words.searchsorted(words), len(other_words) - 1)
+    hit = other_words[idx] == words
+    left[hit], right[hit] = other_left[idx[hit]], other_right[idx[hit]]
+    return left, right
+
+
+def length_statistics(length: int, section: Section, other: Optional[Section] = None) -> LengthStatistics:
+    """Compute hook counts, rarity scores, letter tables and one-dictionary hooks for one length.
+
+    Everything is array arithmetic over the masks: popcounts for hook counts,
+    unpacked bit matrices summed per column for letter tables, and a matrix
+    product with per-letter rarity weights for scores. Hooks only in this
+    dictionary are the masks AND-NOT the other dictionary's masks of the same
+    word. Without another section they are not compared and stay empty.
+    """
+    words, left, right = section
+    left_bits, right_bits = mask_bits(left), mask_bits(right)
+    left_letters, right_letters = left_bits.sum(axis=0), right_bits.sum(axis=0)
+    scores = (left_bits @ hook_weights(left_letters, len(words))
+              + right_bits @ hook_weights(right_letters, len(words)))
+    ranks = np.frombuffer(words.tobytes(), dtype=np.uint8)
+    other_left, other_right = _masks_in(words, other)
+    return LengthStatistics(
+        length,
+        words,
+        left,
+        right,
+        (np.bitwise_count(left) + np.bitwise_count(right)).astype(np.int64),
+        scores,
+        left & ~other_left if other is not None else np.zeros_like(left),
+        right & ~other_right if other is not None else np.zeros_like(right),
+        other is not None,
+        np.bincount(ranks, minlength=len(POLISH_ALPHABET) + 1)[1:],
+        left_letters,
+        right_letters,
+    )
+
+
+def study_order(stats: LengthStatistics) -> np.ndarray:
+    """Positions of words with hooks, best first: score, then hook count, then Polish order."""
+    with_hooks = np.flatnonzero(stats.hooks)
+    order = np.lexsort((with_hooks, -stats.hooks[with_hooks], -stats.scores[with_hooks]))
+    return with_hooks[order]
+
+
+def _own_letters(mask: int, compared: bool) -> str:
+    return mask_letters(mask) if compared else NOT_COMPARED
+
+
+def write_study_list(stats: LengthStatistics, output_file: Path, top: Optional[int] = DEFAULT_TOP) -> int:
+    """Write the ranked study list as TSV; only the top words when top is given. Returns rows written.
+
+    The own-hook columns hold NOT_COMPARED when the other dictionary has no section for the length.
+    """
+    positions = study_order(stats)[:top]
+    words = decode_packed_words(stats.words[positions], stats.length)
+    columns = zip(words, stats.hooks[positions].tolist(), np.round(stats.scores[positions], 2).tolist(),
+                  stats.left[positions].tolist(), stats.right[positions].tolist(),
+                  stats.left_only[positions].tolist(), stats.right_only[positions].tolist())
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("rank\tword\thooks\tscore\tleft\tright\tleft_only\tright_only\n")
+        f.writelines(
+            f"{rank}\t{word}\t{hooks}\t{score}\t{mask_letters(left)}\t{mask_letters(right)}\t"
+            f"{_own_letters(left_only, stats.compared)}\t{_own_letters(right_only, stats.compared)}\n"
+            for rank, (word, hooks, score, left, right, left_only, right_only) in enumerate(columns, 1)
+        )
+    return len(positions)
+
+
+def write_letter_table(stats: LengthStatistics, output_file: Path):
+    """Write per-letter counts: in the words, as left hooks and as right hooks."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("letter\tin_words\tleft_hooks\tright_hooks\n")
+        f.writelines(f"{letter}\t{in_words}\t{left}\t{right}\n" for letter, in_words, left, right in zip(
+            POLISH_ALPHABET, stats.word_letters.tolist(), stats.left_letters.tolist(), stats.right_letters.tolist()))
+
+
+SUMMARY_FIELDS = ["length", "words", "words_with_hooks", "mean_hooks", "max_hooks", "left_hooks", "right_hooks",
+                  "words_with_own_hooks", "own_hooks"]
+
+
+def summary_row(stats: LengthStatistics) -> Dict[str, object]:
+    own = np.bitwise_count(stats.left_only) + np.bitwise_count(stats.right_only)
+    return {
+        "length": stats.length,
+        "words": len(stats.words),
+        "words_with_hooks": int(np.count_nonzero(stats.hooks)),
+        "mean_hooks": round(float(stats.hooks.mean()), 3) if len(stats.words) else 0.0,
+        "max_hooks": int(stats.hooks.max()) if len(stats.words) else 0,
+        "left_hooks": int(stats.left_letters.sum()),
+        "right_hooks": int(stats.right_letters.sum()),
+        "words_with_own_hooks": int(np.count_nonzero(own)) if stats.compared else NOT_COMPARED,
+        "own_hooks": int(own.sum()) if stats.compared else NOT_COMPARED,
+    }
+
+
+def _write_dictionary_statistics(dict_name: str, index: HookIndex, other: Optional[HookIndex], output_dir: Path,
+                                 top: Optional[int]) -> List[Path]:
+    created = []
+    rows = []
+    with METRICS.labels(dict_name=dict_name):
+        for length, section in sorted(index.sections.items()):
+            other_section = other.sections.get(length) if other else None
+            if other and other_section is None:
+                print(f"{dict_name.upper()}{length}: own hooks not compared, the other dictionary has no "
+                      f"{length}-letter hook index section")
+            foreign = [word for word in index.foreign if len(word) == length]
+            if foreign:
+                left_out = sum(1 for word in foreign if encode_word(word) is None)
+                print(f"{dict_name.upper()}{length}: {left_out} words with Q, V or X left out, "
+                      f"{len(foreign) - left_out} ranked without their Q, V or X hooks")
+            with METRICS.phase("statistics", length=length, words=len(section[0])):
+                stats = length_statistics(length, section, other_section)
+            with METRICS.phase("write", length=length) as counts:
+                study_file = output_dir / f"{length}_letter_study.tsv"
+                counts["lines"] = write_study_list(stats, study_file, top)
+                letters_file = output_dir / f"{length}_letter_letters.tsv"
+                write_letter_table(stats, letters_file)
+            rows.append(summary_row(stats))
+            created += [study_file, letters_file]
+
+    summary_file = output_dir / "summary.tsv"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(summary_file, "w", encoding="utf-8") as f:
+        f.write("\t".join(SUMMARY_FIELDS) + "\n")
+        f.writelines("\t".join(str(row[field]) for field in SUMMARY_FIELDS) + "\n" for row in rows)
+    print(f"Wrote statistics for {dict_name.upper()} ({len(rows)} lengths) to {output_dir}")
+    return created + [summary_file]
+
+
+def write_statistics(base_dir: Path, dict_names: List[str] = DICT_NAMES, top: Optional[int] = DEFAULT_TOP
+                     ) -> List[Path]:
+    """Write study lists, letter tables and a summary for every dictionary and length.
+
+    Outputs go to slowniki/{dict}/statistics/. With exactly two dictionaries,
+    "own" hooks are those the other dictionary does not allow for the same word;
+    they are NOT_COMPARED for lengths the other index has no section for, and
+    for a single dictionary. Statistics cover the 32-letter alphabet: words
+    spelled with Q, V or X are left out and those letters are not counted as
+    hooks; how many words this affects is printed per length.
+    """
+    indexes = {name: open_hook_index(base_dir / name) for name in dict_names}
+    created = []
+    try:
+        for dict_name, index in indexes.items():
+            others = [other for other in indexes.values() if other is not index]
+            other = others[0] if len(others) == 1 else None
+            created += _write_dictionary_statistics(dict_name, index, other, base_dir / dict_name / "statistics", top)
+    finally:
+        for index in indexes.values():
+            index.close()
+    return created
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Write hook statistics and ranked study lists.")
+    parser.add_argument("--dict", dest="dict_name", choices=DICT_NAMES, default=None,
+                        help="dictionary to analyse (default: both, each compared with the other)")
+    parser.add_argument("--base-dir", type=Path, default=Path("slowniki"))
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help="words per study list (0 writes every word with a hook)")
+    parser.add_argument("--metrics", type=Path, default=None, metavar="FILE",
+                        help="write per-phase timings, counts and peak RSS to FILE (.json or .csv)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    dict_names = [args.dict_name] if args.dict_name else DICT_NAMES
+    created = write_statistics(args.base_dir, dict_names, args.top or None)
+    print(f"\nWrote {len(created)} files in {time.perf_counter() - start:.1f}s")
+    if args.metrics:
+        METRICS.write_report(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.generate_extensions import EXTENSIONS_FORMATS, format_extensions_line, format_extensions_record
+from src.collation import sort_polish
+from src.hook_index import INDEX_NAME, build_hook_index_from_extensions
+from src.word_splitter import find_source_file, iter_words
+
+
+MANIFEST_NAME = "manifest.json"
+MIN_LENGTH = 2
+MAX_LENGTH = 15
+
+
+def file_digest(file_path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(dict_dir: Path) -> Dict:
+    """Load the manifest of the previous build, or an empty one."""
+    manifest_file = dict_dir / MANIFEST_NAME
+    if not manifest_file.exists():
+        return {"source": None, "words": {}, "extensions": {}, "pdfs": {}}
+    with open(manifest_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(dict_dir: Path, manifest: Dict):
+    with open(dict_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def read_lines(file_path: Path) -> List[str]:
+    """Read non-empty stripped lines, or nothing if the file does not exist."""
+    if not file_path.exists():
+        return []
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def group_source_words(input_file: Path) -> Dict[int, List[str]]:
+    """Group the words of a plain or compressed source list by length, like word_splitter does."""
+    words_by_length = {}
+    for word in iter_words(input_file):
+        words_by_length.setdefault(len(word), []).append(word)
+    return words_by_length
+
+
+def collect_hooks(extended_words: List[str], targets: Set[str]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Collect left/right hooks only for the target base words.
+
+    Extended words are visited in file order, so hooks come out in the same
+    order as in a full rebuild.
+    """
+    left_hooks = {}
+    right_hooks = {}
+    for extended_word in extended_words:
+        if extended_word[1:] in targets:
+            left_hooks.setdefault(extended_word[1:], []).append(extended_word[0])
+        if extended_word[:-1] in targets:
+            right_hooks.setdefault(extended_word[:-1], []).append(extended_word[-1])
+    return left_hooks, right_hooks
+
+
+def parse_line_word(line: str) -> str:
+    """Return the word of a 'LEFT WORD RIGHT' line; hook lists never contain spaces."""
+    return line.split(" ")[1]
+
+
+def text_line_to_record(line: str) -> str:
+    """Convert a 'LEFT WORD RIGHT' text line into the equivalent TSV record."""
+    left, word, right = line.rstrip("\n").split(" ")
+    return format_extensions_record(word, left.split(","), right.split(","))
+
+
+def update_extensions_file(extensions_file: Path, words: List[str], extended_words: Optional[List[str]],
+                           targets: Optional[Set[str]], records: bool = False) -> int:
+    """Rewrite an extensions file, recomputing only the lines of target words.
+
+    A None target set (or a missing file) recomputes every line. With
+    records the TSV file next to it is rewritten in the same pass. Returns
+    the number of recomputed lines.
+    """
+    word_set = set(words)
+    old_lines = {}
+    if targets is not None and extensions_file.exists():
+        with open(extensions_file, "r", encoding="utf-8") as f:
+            old_lines = {parse_line_word(line): line for line in f if line.strip()}
+
+    # Words without a previous line (new words, or no previous file) are always recomputed
+    targets = {word for word in (targets or ()) if word in word_set} | \
+              {word for word in words if word not in old_lines}
+    left_hooks, right_hooks = collect_hooks(extended_words or [], targets)
+
+    lines = [
+        format_extensions_line(word, left_hooks.get(word, []), right_hooks.get(word, [])) if word in targets
+        else old_lines[word]
+        for word in words
+    ]
+    extensions_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(extensions_file, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    if records:
+        with open(extensions_file.with_suffix(EXTENSIONS_FORMATS["tsv"]), "w", encoding="utf-8") as f:
+            f.writelines(text_line_to_record(line) for line in lines)
+
+    return len(targets)
+
+
+def update_dictionary(dict_dir: Path, source_file: Path, render_pdfs: bool = True,
+                      renderer: str = "table") -> Dict[str, List[str]]:
+    """Bring a dictionary's word, extension and PDF files up to date with its source list.
+
+    Word lists are diffed against the previous build; only extension lines
+    touched by added or removed words are recomputed (a change to an
+    N-letter word affects the N-1 and N files), and only PDFs whose
+    extensions file content changed are re-rendered, with the given renderer
+    (see generate_pdfs.RENDERERS). A PDF that was never rendered stays
+    missing until its extensions change. TSV records of a
+    touched length are rewritten along with the text file when they exist,
+    and the hook index is rebuilt when any extensions file changed.
+    """
+    manifest = load_manifest(dict_dir)
+    source_hash = file_digest(source_file)
+    report = {"words": [], "extensions": [], "pdfs": []}
+    if manifest["source"] == source_hash:
+        print(f"{source_file} unchanged since last build")
+        return report
+
+    # Diff word lists against the previous build
+    new_groups = group_source_words(source_file)
+    words_by_length = {}
+    changes = {}
+    for length in range(MIN_LENGTH, MAX_LENGTH + 1):
+        words_file = dict_dir / f"{length}_letter_words.txt"
+        old_words = read_lines(words_file)
+        new_words = new_groups.get(length, [])
+        old_set, new_set = set(old_words), set(new_words)
+        if old_set == new_set:
+            words = old_words
+        else:
+            words = sort_polish(new_words)
+            changes[length] = {word.upper() for word in (old_set ^ new_set)}
+            if words:
+                with open(words_file, "w", encoding="utf-8") as f:
+                    f.writelines(f"{word}\n" for word in words)
+            elif words_file.exists():
+                words_file.unlink()
+            report["words"].append(words_file.name)
+            print(f"{words_file}: +{len(new_set - old_set)} -{len(old_set - new_set)} words")
+        if words:
+            words_by_length[length] = [word.upper() for word in words]
+
+    # Recompute the affected extension lines
+    extensions_dir = dict_dir / "extensions"
+    previous_hashes = dict(manifest["extensions"])
+    for path in extensions_dir.glob("*_letter_extensions.txt"):
+        if path.name not in previous_hashes:
+            previous_hashes[path.name] = file_digest(path)
+    for length in sorted({length for changed in changes for length in (changed - 1, changed)}):
+        extensions_file = extensions_dir / f"{length}_letter_extensions.txt"
+        records_file = extensions_file.with_suffix(EXTENSIONS_FORMATS["tsv"])
+        has_extensions = length in words_by_length and (length == MAX_LENGTH or length + 1 in words_by_length)
+        if not has_extensions:
+            if extensions_file.exists():
+                extensions_file.unlink()
+                report["extensions"].append(extensions_file.name)
+            if records_file.exists():
+                records_file.unlink()
+            continue
+
+        targets = set(changes.get(length, set()))
+        for word in changes.get(length + 1, set()):
+            targets.update((word[1:], word[:-1]))
+        extended_words = words_by_length.get(length + 1) if length < MAX_LENGTH else None
+        recomputed = update_extensions_file(extensions_file, words_by_length[length], extended_words, targets,
+                                            records=records_file.exists())
+        print(f"{extensions_file}: recomputed {recomputed} lines")
+
+    # Record hashes and re-render PDFs whose extensions content changed
+    manifest["words"] = {
+        f"{length}_letter_words.txt": file_digest(dict_dir / f"{length}_letter_words.txt")
+        for length in sorted(words_by_length)
+    }
+    manifest["extensions"] = {
+        path.name: file_digest(path) for path in sorted(extensions_dir.glob("*_letter_extensions.txt"))
+    }
+    for name, digest in manifest["extensions"].items():
+        if previous_hashes.get(name) != digest:
+            report["extensions"].append(name)
+    if report["extensions"]:
+        index_file = build_hook_index_from_extensions(extensions_dir, extensions_dir / INDEX_NAME)
+        print(f"Rebuilt {index_file}")
+
+    if render_pdfs:
+        from src.generate_pdfs import RENDERERS
+
+        dict_name = dict_dir.name
+        for name, digest in manifest["extensions"].items():
+            length = int(name.split("_")[0])
+            output_file = dict_dir / f"{dict_name.upper()}{length}.pdf"
+            built_from = manifest["pdfs"].get(output_file.name, previous_hashes.get(name))
+            if built_from == digest:
+                continue
+            print(f"Re-rendering {output_file}...")
+            RENDERERS[renderer](extensions_dir / name, output_file, length, dict_name)
+            manifest["pdfs"][output_file.name] = digest
+            report["pdfs"].append(output_file.name)
+
+    manifest["source"] = source_hash
+    save_manifest(dict_dir, manifest)
+    return report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Incrementally rebuild dictionaries after a source list update.")
+    parser.add_argument("--no-pdfs", action="store_true", help="update word and extensions files only")
+    parser.add_argument("--renderer", choices=["table", "canvas", "stream", "compact"], default="table",
+                        help="renderer for the PDFs whose extensions changed (see generate_pdfs)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+
+    for dict_name in ["sjp", "osps"]:
+        print(f"\nUpdating {dict_name.upper()} dictionary...")
+        dict_dir = Path(f"slowniki/{dict_name}")
+        update_dictionary(dict_dir, find_source_file(dict_dir, dict_name), render_pdfs=not args.no_pdfs,
+                          renderer=args.renderer)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import cProfile
+import csv
+import functools
+import io
+import json
+import pstats
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+
+# Resetting the kernel's high-water mark lowers ru_maxrss too, so the peak before it is kept here
+_peak_before_reset_mb = 0.0
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in megabytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    peak = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return max(peak, _peak_before_reset_mb)
+
+
+def reset_peak_rss() -> Optional[float]:
+    """Restart the kernel's RSS high-water mark (Linux) and return the peak, in megabytes, it had reached.
+
+    Returns None where the mark cannot be reset.
+    """
+    global _peak_before_reset_mb
+    try:
+        with open("/proc/self/status") as f:
+            peak = next(int(line.split()[1]) / 1024 for line in f if line.startswith("VmHWM:"))
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except (OSError, StopIteration):
+        return None
+    _peak_before_reset_mb = max(_peak_before_reset_mb, peak)
+    return peak
+
+
+COUNT_FIELDS = ["words", "lines", "pages"]
+
+
+class PhaseRecord(NamedTuple):
+    phase: str                # nested phases are joined with "/", e.g. "extensions/lookup"
+    dict_name: Optional[str]
+    length: Optional[int]
+    seconds: float
+    peak_rss_mb: float        # highest RSS of the process while the phase ran
+    counts: Dict[str, int]
+
+
+class MetricsRecorder:
+    """Collect timings, counts and memory high-water marks of pipeline phases.
+
+    Phases nest; labels such as the dictionary name set with `labels()` apply
+    to every phase opened inside them. On Linux the kernel's high-water mark
+    is reset whenever a phase opens or closes, so each phase gets the peak
+    of its own run rather than of the process so far; elsewhere the process
+    peak (getrusage) is the best available. Recording costs a clock read
+    and a couple of /proc reads per phase, so it is always on.
+    """
+
+    def __init__(self):
+        self.records: List[PhaseRecord] = []
+        self._stack: List[str] = []
+        self._peaks: List[float] = []
+        self._labels: Dict[str, object] = {}
+        self._resettable = sys.platform.startswith("linux")
+
+    def reset(self):
+        self.records.clear()
+
+    def detach(self):
+        """Forget records, open phases and labels inherited from the parent; call in a worker."""
+        self.records = []
+        self._stack = []
+        self._peaks = []
+        self._labels = {}
+
+    def adopt(self, records: Iterable[PhaseRecord]):
+        """Add phases recorded in a worker process as children of the open phase."""
+        prefix = "".join(f"{name}/" for name in self._stack)
+        for record in records:
+            dict_name = record.dict_name if record.dict_name is not None else self._labels.get("dict_name")
+            self.records.append(record._replace(phase=prefix + record.phase, dict_name=dict_name))
+
+    def _checkpoint(self):
+        """Fold the peak since the last checkpoint into every open phase and start a new window."""
+        peak = reset_peak_rss() if self._resettable else None
+        if peak is None:
+            self._resettable = False
+            peak = peak_rss_mb()
+        self._peaks = [max(open_peak, peak) for open_peak in self._peaks]
+
+    @contextmanager
+    def labels(self, **labels) -> Iterator[None]:
+        previous = dict(self._labels)
+        self._labels.update(labels)
+        try:
+            yield
+        finally:
+            self._labels = previous
+
+    @contextmanager
+    def phase(self, name: str, length: Optional[int] = None, **counts: int) -> Iterator[Dict[str, int]]:
+        """Time a phase; the yielded dict collects its counts (words, lines, pages)."""
+        self._checkpoint()
+        self._stack.append(name)
+        self._peaks.append(0.0)
+        counts = dict(counts)
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            seconds = time.perf_counter() - start
+            self._checkpoint()
+            path = "/".join(self._stack)
+            self._stack.pop()
+            peak = self._peaks.pop()
+            self.records.append(PhaseRecord(
+                path,
+                self._labels.get("dict_name"),
+                length if length is not None else self._labels.get("length"),
+                seconds,
+                peak,
+                counts,
+            ))
+
+    def rows(self) -> List[Dict[str, object]]:
+        """Flatten records into one dict per phase, counts as columns."""
+        rows = []
+        for record in self.records:
+            row = {"dict": record.dict_name, "length": record.length, "phase": record.phase,
+                   "seconds": round(record.seconds, 6), "peak_rss_mb": round(record.peak_rss_mb, 1)}
+            row.update({field: record.counts.get(field) for field in COUNT_FIELDS})
+            row.update({key: value for key, value in record.counts.items() if key not in COUNT_FIELDS})
+            rows.append(row)
+        return rows
+
+    def write_report(self, report_file: Path):
+        """Write the recorded phases as CSV (.csv suffix) or JSON (anything else)."""
+        rows = self.rows()
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        if report_file.suffix == ".csv":
+            fields = list(dict.fromkeys(key for row in rows for key in row)) or ["phase"]
+            with open(report_file, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(report_file, "w", encoding="utf-8") as f:
+                json.dump({"phases": rows, "peak_rss_mb": round(peak_rss_mb(), 1)}, f, indent=2)
+        print(f"Wrote metrics report to {report_file}")
+
+
+# Process-wide recorder used by the pipeline modules
+METRICS = MetricsRecorder()
+
+
+@contextmanager
+def profiling(profile_file: Optional[Path]) -> Iterator[Optional[cProfile.Profile]]:
+    """Yield a profiler to attach with profile_calls(), or None when profile_file is None.
+
+    On exit the collected statistics are dumped to profile_file (pstats format,
+    open with `python -m pstats`) and the top functions by cumulative time are
+    written next to it as text.
+    """
+    if profile_file is None:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        yield profiler
+    finally:
+        profile_file.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(profile_file))
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(30)
+        profile_file.with_suffix(".txt").write_text(summary.getvalue(), encoding="utf-8")
+        print(f"Wrote profile to {profile_file} (summary in {profile_file.with_suffix('.txt')})")
+
+
+def profile_calls(function: Callable, profiler: Optional[cProfile.Profile]) -> Callable:
+    """Wrap function so that only its calls are profiled; returns it unchanged without a profiler."""
+    if profiler is None:
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        profiler.enable()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    return wrapper
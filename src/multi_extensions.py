@@ -0,0 +1,261 @@
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.collation import polish_sort_key
+from src.generate_extensions import format_extensions_line, load_dictionary
+from src.metrics import peak_rss_mb
+
+
+MULTI_DIR_NAME = "extensions_multi"
+
+
+class Dawg:
+    """Minimal acyclic word automaton (DAWG) built incrementally from sorted words.
+
+    Shared suffixes are merged while words are added (Daciuk et al.), so the
+    automaton stays far smaller than a plain trie. Nodes are integer ids into
+    per-node edge dicts.
+    """
+
+    def __init__(self):
+        self.edges: List[Dict[str, int]] = [{}]
+        self.final: List[bool] = [False]
+        self._free: List[int] = []
+
+    @classmethod
+    def build(cls, words: Iterable[str]) -> "Dawg":
+        dawg = cls()
+        register: Dict[Tuple, int] = {}
+        unchecked: List[Tuple[int, str, int]] = []  # (parent, letter, child) along the last word
+        previous = ""
+
+        def minimize(down_to: int):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                signature = (dawg.final[child], tuple(sorted(dawg.edges[child].items())))
+                existing = register.get(signature)
+                if existing is None:
+                    register[signature] = child
+                else:
+                    dawg.edges[parent][letter] = existing
+                    dawg._release(child)
+
+        for word in sorted(set(words)):
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            minimize(common)
+
+            node = unchecked[-1][2] if unchecked else 0
+            for letter in word[common:]:
+                child = dawg._new_node()
+                dawg.edges[node][letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            dawg.final[node] = True
+            previous = word
+
+        minimize(0)
+        dawg._compact()
+        return dawg
+
+    def _new_node(self) -> int:
+        if self._free:
+            node = self._free.pop()
+            self.edges[node] = {}
+            self.final[node] = False
+            return node
+        self.edges.append({})
+        self.final.append(False)
+        return len(self.edges) - 1
+
+    def _release(self, node: int):
+        self.edges[node] = {}
+        self._free.append(node)
+
+    def _compact(self):
+        """Renumber reachable nodes densely and drop released ones."""
+        order = {0: 0}
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            for child in self.edges[node].values():
+                if child not in order:
+                    order[child] = len(order)
+                    stack.append(child)
+        edges: List[Dict[str, int]] = [{} for _ in order]
+        final = [False] * len(order)
+        for node, new_id in order.items():
+            edges[new_id] = {letter: order[child] for letter, child in self.edges[node].items()}
+            final[new_id] = self.final[node]
+        self.edges, self.final, self._free = edges, final, []
+
+    @property
+    def node_count(self) -> int:
+        return len(self.edges)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self.edges)
+
+    def walk(self, text: str, node: int = 0) -> Optional[int]:
+        """Follow text from node; return the node reached or None."""
+        edges = self.edges
+        for letter in text:
+            node = edges[node].get(letter)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word: str) -> bool:
+        node = self.walk(word)
+        return node is not None and self.final[node]
+
+    def completions(self, node: Optional[int], length: int) -> Iterator[str]:
+        """Yield every string of exactly `length` letters leading from node to a word end."""
+        if node is None:
+            return
+        if length == 0:
+            if self.final[node]:
+                yield ""
+            return
+        for letter, child in self.edges[node].items():
+            for rest in self.completions(child, length - 1):
+                yield letter + rest
+
+
+class WordIndex:
+    """Forward and reversed DAWGs over every length of a dictionary."""
+
+    def __init__(self, words: Iterable[str]):
+        words = list(words)
+        self.forward = Dawg.build(words)
+        self.backward = Dawg.build(word[::-1] for word in words)
+
+    def back_extensions(self, word: str, k: int) -> List[str]:
+        """Strings s of k letters such that word + s is a word."""
+        return sorted(self.forward.completions(self.forward.walk(word), k), key=polish_sort_key)
+
+    def front_extensions(self, word: str, k: int) -> List[str]:
+        """Strings p of k letters such that p + word is a word."""
+        reversed_prefixes = self.backward.completions(self.backward.walk(word[::-1]), k)
+        return sorted((prefix[::-1] for prefix in reversed_prefixes), key=polish_sort_key)
+
+    def wrap_extensions(self, word: str, k: int) -> List[str]:
+        """Words made by adding k letters split between both ends (at least one on each side)."""
+        results = []
+        for front_length in range(1, k):
+            for front in self._prefixes(front_length):
+                node = self.forward.walk(front + word)
+                for back in self.forward.completions(node, k - front_length):
+                    results.append(front + word + back)
+        return sorted(results, key=polish_sort_key)
+
+    def _prefixes(self, length: int) -> Iterator[str]:
+        """Every path of `length` letters from the root of the forward DAWG."""
+        frontier = [("", 0)]
+        for _ in range(length):
+            frontier = [(text + letter, child) for text, node in frontier
+                        for letter, child in self.forward.edges[node].items()]
+        return (text for text, _ in frontier)
+
+    def insertions(self, word: str) -> List[str]:
+        """Words made by inserting a single letter strictly inside the word."""
+        results = []
+        forward = self.forward
+        node = forward.walk(word[0])
+        for i in range(1, len(word)):
+            if node is None:
+                break
+            tail = word[i:]
+            for letter, child in forward.edges[node].items():
+                end = forward.walk(tail, child)
+                if end is not None and forward.final[end]:
+                    candidate = word[:i] + letter + tail
+                    if candidate not in results:
+                        results.append(candidate)
+            node = forward.edges[node].get(word[i])
+        return sorted(results, key=polish_sort_key)
+
+
+def format_words_line(word: str, results: List[str]) -> str:
+    """Format a 'WORD RESULT,RESULT' line listing the words derived from word."""
+    return f"{word} {','.join(results)}\n"
+
+
+def generate_multi_extensions(dict_dir: Path, ks: Iterable[int] = (2,), insertions: bool = True) -> Dict[str, float]:
+    """Write k-letter and interior-insertion extension files for every length of a dictionary.
+
+    Files go to <dict_dir>/extensions_multi/:
+      N_letter_kK_extensions.txt  "FRONT WORD BACK" with K-letter front/back groups
+      N_letter_kK_wraps.txt       "WORD WORDS" made by adding K letters on both sides
+      N_letter_insertions.txt     "WORD WORDS" made by inserting one interior letter
+    Returns build and generation statistics.
+    """
+    words_by_length = load_dictionary(dict_dir)
+
+    start = time.perf_counter()
+    index = WordIndex(word for words in words_by_length.values() for word in words)
+    build_seconds = time.perf_counter() - start
+    stats = {
+        "words": sum(len(words) for words in words_by_length.values()),
+        "build_seconds": build_seconds,
+        "forward_nodes": index.forward.node_count,
+        "forward_edges": index.forward.edge_count,
+        "backward_nodes": index.backward.node_count,
+        "backward_edges": index.backward.edge_count,
+        "build_peak_rss_mb": peak_rss_mb(),
+    }
+    print(f"Built DAWGs over {stats['words']} words in {build_seconds:.1f}s: "
+          f"{index.forward.node_count} + {index.backward.node_count} nodes, "
+          f"peak RSS {stats['build_peak_rss_mb']:.1f} MB")
+
+    output_dir = dict_dir / MULTI_DIR_NAME
+    output_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    for length, words in sorted(words_by_length.items()):
+        for k in ks:
+            with open(output_dir / f"{length}_letter_k{k}_extensions.txt", "w", encoding="utf-8") as f:
+                for word in words:
+                    f.write(format_extensions_line(word, index.front_extensions(word, k),
+                                                   index.back_extensions(word, k)))
+            with open(output_dir / f"{length}_letter_k{k}_wraps.txt", "w", encoding="utf-8") as f:
+                for word in words:
+                    f.write(format_words_line(word, index.wrap_extensions(word, k)))
+        if insertions:
+            with open(output_dir / f"{length}_letter_insertions.txt", "w", encoding="utf-8") as f:
+                for word in words:
+                    f.write(format_words_line(word, index.insertions(word)))
+        print(f"Created {length}-letter multi-letter extensions in {output_dir}")
+
+    stats["generate_seconds"] = time.perf_counter() - start
+    stats["peak_rss_mb"] = peak_rss_mb()
+    print(f"Generated multi-letter extensions in {stats['generate_seconds']:.1f}s, "
+          f"peak RSS {stats['peak_rss_mb']:.1f} MB")
+    return stats
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate multi-letter and interior-insertion extensions.")
+    parser.add_argument("-k", dest="ks", type=int, action="append",
+                        help="number of added letters (repeatable, default: 2)")
+    parser.add_argument("--no-insertions", action="store_true", help="skip interior-insertion files")
+    parser.add_argument("--dict", dest="dict_name", choices=["sjp", "osps"], default=None,
+                        help="dictionary to process (default: both)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    for dict_name in [args.dict_name] if args.dict_name else ["sjp", "osps"]:
+        print(f"\nProcessing {dict_name.upper()} dictionary...")
+        generate_multi_extensions(Path(f"slowniki/{dict_name}"), ks=args.ks or [2],
+                                  insertions=not args.no_insertions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import argparse
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.generate_extensions import EXTENSIONS_FORMATS, _pool_context, extensions_paths, resolve_workers
+from src.hook_index import INDEX_NAME
+from src.incremental import MAX_LENGTH, MIN_LENGTH, file_digest
+from src.word_splitter import find_source_file
+
+
+STATE_NAME = "pipeline_state.json"
+DICT_NAMES = ["sjp", "osps"]
+
+
+class Node(NamedTuple):
+    name: str                 # e.g. "pdf:osps:7"
+    action: str               # key of ACTIONS
+    args: Tuple
+    inputs: List[Path]
+    outputs: List[Path]
+    deps: List[str]
+
+
+def _split(source_file: Path, dict_dir: Path):
+    from src.word_splitter import split_words_by_length
+
+    # Lengths missing from the new list must not leave stale word files behind
+    for words_file in dict_dir.glob("*_letter_words.txt"):
+        words_file.unlink()
+    split_words_by_length(source_file, dict_dir)
+
+
+def _extensions(dict_dir: Path, formats: Tuple[str, ...]):
+    from src.generate_extensions import generate_all_extensions
+
+    # One pass: the word lists are read once into a lookup shared by every length and hooks.idx
+    created = set(generate_all_extensions(dict_dir, workers=1, formats=formats))
+    # Lengths that lost their N or N+1 word list must not leave stale files behind
+    for extensions_file in (dict_dir / "extensions").glob("*_letter_extensions.*"):
+        if extensions_file not in created:
+            extensions_file.unlink()
+
+
+def _pdf(extensions_file: Path, output_file: Path, length: int, dict_name: str, renderer: str):
+    from src.generate_pdfs import RENDERERS
+
+    if not extensions_file.exists():
+        if output_file.exists():
+            output_file.unlink()
+        return
+    RENDERERS[renderer](extensions_file, output_file, length, dict_name)
+
+
+ACTIONS = {
+    "split": _split,
+    "extensions": _extensions,
+    "pdf": _pdf,
+}
+
+
+def run_action(action: str, args: Tuple) -> float:
+    """Run one node's action (in a worker process) and return its wall time."""
+    start = time.perf_counter()
+    ACTIONS[action](*args)
+    return time.perf_counter() - start
+
+
+def plan_dictionary(base_dir: Path, dict_name: str, pdfs: bool = True, renderer: str = "table",
+                    formats: Tuple[str, ...] = ("text",)) -> List[Node]:
+    """Build the dependency graph of one dictionary.
+
+    split -> N_letter_words.txt -> extensions files of every length and
+    hooks.idx -> PDFs. The extensions step is one node, like
+    generate_all_extensions: its lookup covers all lengths, so rebuilding it
+    costs one read of the word lists rather than one per changed length.
+    PDFs are rendered from the TSV records when "tsv" is among formats;
+    a PDF node runs only if its own extensions file changed.
+    """
+    dict_dir = base_dir / dict_name
+    extensions_dir = dict_dir / "extensions"
+    source_file = find_source_file(dict_dir, dict_name)
+    lengths = range(MIN_LENGTH, MAX_LENGTH + 1)
+    words_files = [dict_dir / f"{length}_letter_words.txt" for length in lengths]
+
+    nodes = []
+    split_name = f"split:{dict_name}"
+    if source_file.exists():
+        nodes.append(Node(split_name, "split", (source_file, dict_dir), [source_file], words_files, []))
+    deps = [split_name] if source_file.exists() else []
+
+    extensions_name = f"extensions:{dict_name}"
+    all_formats = tuple(EXTENSIONS_FORMATS)
+    outputs = [path for length in lengths for path in extensions_paths(extensions_dir, length, all_formats)]
+    nodes.append(Node(extensions_name, "extensions", (dict_dir, formats), words_files,
+                      outputs + [extensions_dir / INDEX_NAME], deps))
+
+    if pdfs:
+        pdf_format = "tsv" if "tsv" in formats else "text"
+        for length in lengths:
+            extensions_file = extensions_paths(extensions_dir, length, (pdf_format,))[0]
+            output_file = dict_dir / f"{dict_name.upper()}{length}.pdf"
+            nodes.append(Node(f"pdf:{dict_name}:{length}", "pdf",
+                              (extensions_file, output_file, length, dict_name, renderer),
+                              [extensions_file], [output_file], [extensions_name]))
+    return nodes
+
+
+class DigestCache:
+    """Content hashes of files, reused while a file's size and mtime are unchanged."""
+
+    def __init__(self, entries: Optional[Dict[str, List]] = None):
+        self.entries = entries or {}
+
+    def digest(self, path: Path) -> Optional[str]:
+        if not path.exists():
+            return None
+        stat = path.stat()
+        entry = self.entries.get(str(path))
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = file_digest(path)
+        self.entries[str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+
+def node_signature(node: Node, cache: DigestCache) -> Dict:
+    """Describe what a node was (or would be) built from."""
+    return {
+        "args": [str(arg) for arg in node.args],
+        "inputs": {str(path): cache.digest(path) for path in node.inputs},
+    }
+
+
+def is_up_to_date(node: Node, record: Optional[Dict], cache: DigestCache) -> bool:
+    """A node is up to date if its inputs and args match the last run and its outputs are untouched."""
+    if record is None or record["signature"] != node_signature(node, cache):
+        return False
+    return all(cache.digest(path) == record["outputs"].get(str(path)) for path in node.outputs)
+
+
+def load_state(state_file: Path) -> Dict:
+    if not state_file.exists():
+        return {"nodes": {}, "files": {}}
+    with open(state_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state_file: Path, state: Dict):
+    with open(state_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def run_pipeline(nodes: List[Node], state_file: Path, workers: Optional[int] = None,
+                 force: bool = False) -> Dict[str, List[str]]:
+    """Run nodes in dependency order, concurrently where independent, skipping up-to-date ones.
+
+    A node is checked once all its dependencies have finished: if its input
+    content hashes, arguments and output hashes match the last run it is
+    skipped. Rewriting a file with the same content therefore does not
+    trigger downstream work. Returns the names of the nodes run and skipped.
+    """
+    state = load_state(state_file)
+    cache = DigestCache(state["files"])
+    records = state["nodes"]
+    by_name = {node.name: node for node in nodes}
+    pending = {node.name: {dep for dep in node.deps if dep in by_name} for node in nodes}
+    report = {"run": [], "skipped": []}
+
+    workers = resolve_workers(workers)
+    executor = ProcessPoolExecutor(workers, mp_context=_pool_context()) if workers > 1 else None
+    running: Dict[Future, Node] = {}
+
+    def finish(name: str):
+        for deps in pending.values():
+            deps.discard(name)
+
+    def complete(node: Node, seconds: float):
+        records[node.name] = {
+            "signature": node_signature(node, cache),
+            "outputs": {str(path): cache.digest(path) for path in node.outputs},
+        }
+        report["run"].append(node.name)
+        print(f"Finished {node.name} in {seconds:.1f}s")
+        finish(node.name)
+
+    try:
+        while pending or running:
+            ready = [name for name, deps in pending.items() if not deps]
+            for name in ready:
+                del pending[name]
+                node = by_name[name]
+                if not force and is_up_to_date(node, records.get(name), cache):
+                    report["skipped"].append(name)
+                    finish(name)
+                elif executor is None:
+                    complete(node, run_action(node.action, node.args))
+                else:
+                    running[executor.submit(run_action, node.action, node.args)] = node
+            if ready:
+                continue
+            if not running:
+                raise ValueError(f"Dependency cycle among {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                complete(running.pop(future), future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        state["files"] = cache.entries
+        save_state(state_file, state)
+
+    return report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build words, extensions, hook indexes and PDFs, "
+                                                 "skipping steps whose inputs did not change.")
+    parser.add_argument("--dict", dest="dict_name", choices=DICT_NAMES, default=None,
+                        help="dictionary to build (default: both)")
+    parser.add_argument("--base-dir", type=Path, default=Path("slowniki"))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="steps run at once (default: one per CPU, 1 runs serially)")
+    parser.add_argument("--renderer", choices=["table", "canvas", "stream", "compact"], default="table")
+    parser.add_argument("--format", dest="formats", choices=["text", "tsv", "both"], default="text",
+                        help="extensions files to write (see generate_extensions); PDFs are rendered from "
+                             "the TSV records when they are written")
+    parser.add_argument("--no-pdfs", action="store_true", help="stop after the extensions and hook index")
+    parser.add_argument("--force", action="store_true", help="rebuild every step")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    formats = ("text", "tsv") if args.formats == "both" else (args.formats,)
+    nodes = []
+    for dict_name in [args.dict_name] if args.dict_name else DICT_NAMES:
+        nodes.extend(plan_dictionary(args.base_dir, dict_name, pdfs=not args.no_pdfs, renderer=args.renderer,
+                                     formats=formats))
+    report = run_pipeline(nodes, args.base_dir / STATE_NAME, workers=args.workers, force=args.force)
+
+    print(f"\nRan {len(report['run'])} steps, {len(report['skipped'])} up to date "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.collation import rank_matrix
+from src.generate_extensions import (
+    build_extensions_lookup, extension_lengths, extensions_paths, format_extensions_line, format_extensions_record,
+    remove_stale_records,
+)
+from src.hook_index import INDEX_NAME, encode_word, foreign_entry, hooks_mask, mask_letters, write_hook_index
+from src.metrics import METRICS
+
+
+def _encode_sorted(words: List[str], length: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Encode same-length words as packed rank keys.
+
+    Returns (rank matrix, positions of encodable words, their packed keys),
+    or None when the NumPy path could not reproduce the dict engine byte for
+    byte: mixed lengths, duplicates, or encodable words not in strict Polish
+    order.
+    """
+    try:
+        matrix, lengths, valid = rank_matrix(words)
+    except ValueError:
+        return None
+    if (lengths != length).any():
+        return None
+    positions = np.flatnonzero(valid)
+    keys = np.ascontiguousarray(matrix[positions]).view(f"S{length}").ravel()
+    if len(keys) > 1 and not (keys[1:] > keys[:-1]).all():
+        return None
+    return matrix, positions, keys
+
+
+def _find(keys: np.ndarray, wanted: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Binary search wanted keys in sorted keys; return (indices, hit flags)."""
+    idx = np.minimum(keys.searchsorted(wanted), len(keys) - 1)
+    return idx, keys[idx] == wanted
+
+
+def compute_hook_masks(words: List[str], extended_words: List[str]
+                       ) -> Optional[Tuple[np.ndarray, np.ndarray, Dict[int, Tuple[List[str], List[str]]]]]:
+    """Compute left/right hook masks of words from the N+1 list in NumPy.
+
+    The word[1:] and word[:-1] slices of every extended word are packed as
+    fixed-width keys and joined against the sorted base keys with
+    searchsorted; the dropped letter is OR-ed into the matching mask.
+
+    Words involving letters outside the alphabet (Q, V, X in SJP), either in
+    the word itself or in one of its hooks, cannot be expressed as masks; their
+    hooks are found with the dict lookup over just the extended words that
+    touch them and returned as {position: (left, right)}. Returns None if the inputs
+    need the dict engine (see _encode_sorted).
+    """
+    left_masks = np.zeros(len(words), dtype=np.uint32)
+    right_masks = np.zeros(len(words), dtype=np.uint32)
+    if not words:
+        return left_masks, right_masks, {}
+    length = len(words[0])
+    base = _encode_sorted(words, length)
+    extended = _encode_sorted(extended_words, length + 1) if extended_words else None
+    if base is None or (extended_words and extended is None):
+        return None
+    _, base_positions, base_keys = base
+
+    foreign = np.ones(len(words), dtype=bool)
+    foreign[base_positions] = False
+    touching = []  # (extended rows, base positions) pairs of every hook found
+    if extended is not None and len(base_keys):
+        extended_matrix, extended_positions, _ = extended
+        valid_matrix = extended_matrix[extended_positions]
+        letter_bits = np.left_shift(np.uint32(1), valid_matrix.astype(np.uint32) - 1)
+        for masks, slice_keys, bits in (
+            (left_masks, valid_matrix[:, 1:], letter_bits[:, 0]),
+            (right_masks, valid_matrix[:, :-1], letter_bits[:, -1]),
+        ):
+            keys = np.ascontiguousarray(slice_keys).view(f"S{length}").ravel()
+            idx, hit = _find(base_keys, keys)
+            positions = base_positions[idx[hit]]
+            np.bitwise_or.at(masks, positions, bits[hit])
+            touching.append((extended_positions[hit], positions))
+
+    # Extended words with foreign letters: few, so handled one by one
+    foreign_words = {words[i]: i for i in np.flatnonzero(foreign).tolist()}
+    unencoded = np.ones(len(extended_words), dtype=bool)
+    if extended is not None:
+        unencoded[extended[1]] = False
+    for row in np.flatnonzero(unencoded).tolist():
+        extended_word = extended_words[row]
+        for part in (extended_word[1:], extended_word[:-1]):
+            position = foreign_words.get(part)
+            if position is None and len(base_keys):
+                key = encode_word(part)
+                if key is not None:
+                    idx, hit = _find(base_keys, np.array([key], dtype=f"S{length}"))
+                    position = int(base_positions[idx[0]]) if hit[0] else None
+            if position is not None:
+                foreign[position] = True
+                touching.append((np.array([row]), np.array([position])))
+
+    foreign_hooks = {}
+    if foreign.any():
+        rows = np.unique(np.concatenate([r[foreign[p]] for r, p in touching] or [np.array([], dtype=int)]))
+        left_lookup, right_lookup = build_extensions_lookup([extended_words[r] for r in rows.tolist()], length)
+        for position in np.flatnonzero(foreign).tolist():
+            word = words[position]
+            left, right = left_lookup.get(word, []), right_lookup.get(word, [])
+            foreign_hooks[position] = (left, right)
+            left_masks[position], right_masks[position] = hooks_mask(left), hooks_mask(right)
+
+    return left_masks, right_masks, foreign_hooks
+
+
+def format_mask_lines(words: List[str], left_masks: np.ndarray, right_masks: np.ndarray,
+                      foreign_hooks: Optional[Dict[int, Tuple[List[str], List[str]]]] = None,
+                      extensions_format: str = "text") -> List[str]:
+    """Decode masks into text lines or TSV records, decoding each distinct mask once.
+
+    Words in foreign_hooks are formatted from their hook lists instead.
+    """
+    if extensions_format == "text":
+        separator, column, formatter = ",", " ", format_extensions_line
+    else:
+        separator, column, formatter = "", "\t", format_extensions_record
+
+    def decode(masks: np.ndarray) -> List[str]:
+        unique, inverse = np.unique(masks, return_inverse=True)
+        strings = [separator.join(mask_letters(int(mask))) for mask in unique]
+        return [strings[i] for i in inverse.tolist()]
+
+    lines = [f"{left}{column}{word}{column}{right}\n"
+             for left, word, right in zip(decode(left_masks), words, decode(right_masks))]
+    for position, (left, right) in (foreign_hooks or {}).items():
+        lines[position] = formatter(words[position], left, right)
+    return lines
+
+
+def _dict_engine_hooks(words: List[str], extended_words: List[str]
+                       ) -> Tuple[np.ndarray, np.ndarray, Dict[int, Tuple[List[str], List[str]]]]:
+    """Fallback for one length: hooks of every word from the per-length dict lookup."""
+    left_lookup, right_lookup = build_extensions_lookup(extended_words, len(words[0])) if extended_words else ({}, {})
+    left_masks = np.zeros(len(words), dtype=np.uint32)
+    right_masks = np.zeros(len(words), dtype=np.uint32)
+    hooks = {}
+    for position, word in enumerate(words):
+        left, right = left_lookup.get(word, []), right_lookup.get(word, [])
+        hooks[position] = (left, right)
+        left_masks[position], right_masks[position] = hooks_mask(left), hooks_mask(right)
+    return left_masks, right_masks, hooks
+
+
+def generate_all_extensions_vectorized(dict_dir: Path, words_by_length: Dict[int, List[str]],
+                                       formats: Tuple[str, ...] = ("text",)) -> List[Path]:
+    """Write every extensions file and the hook index using the NumPy engine.
+
+    Output is byte-identical to the dict engine; a length whose words cannot
+    be handled exactly in NumPy falls back to the dict lookup.
+    """
+    extensions_dir = dict_dir / "extensions"
+    extensions_dir.mkdir(parents=True, exist_ok=True)
+
+    created = []
+    sections = {}
+    foreign = {}
+    for length in extension_lengths(words_by_length):
+        words = words_by_length[length]
+        extended_words = words_by_length.get(length + 1, []) if length < 15 else []
+        with METRICS.phase("hooks", length=length, words=len(words)):
+            hooks = compute_hook_masks(words, extended_words)
+            if hooks is None:
+                print(f"Falling back to the dict engine for {length}-letter words")
+                hooks = _dict_engine_hooks(words, extended_words)
+        left_masks, right_masks, foreign_hooks = hooks
+
+        for extensions_format, extensions_file in zip(formats, extensions_paths(extensions_dir, length, formats)):
+            with METRICS.phase("write", length=length, lines=len(words)):
+                lines = format_mask_lines(words, left_masks, right_masks, foreign_hooks, extensions_format)
+                with open(extensions_file, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+            print(f"Created {extensions_file} with {len(words)} words")
+            created.append(extensions_file)
+        remove_stale_records(extensions_dir, length, formats)
+        sections[length] = (words, left_masks.tolist(), right_masks.tolist())
+        for position, (left, right) in foreign_hooks.items():
+            hooks = foreign_entry(words[position], left, right)
+            if hooks is not None:
+                foreign[words[position]] = hooks
+
+    index_file = extensions_dir / INDEX_NAME
+    with METRICS.phase("index", words=sum(len(words) for words, _, _ in sections.values())):
+        write_hook_index(index_file, sections, foreign)
+    print(f"Created {index_file}")
+    return created
@@ -0,0 +1,281 @@
+import argparse
+import itertools
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.collation import polish_sort_key, sort_polish
+from src.generate_extensions import EXTENSIONS_FORMATS, _pool_context, resolve_workers
+from src.incremental import MAX_LENGTH, MIN_LENGTH
+from src.metrics import METRICS
+
+
+DICT_NAMES = ["sjp", "osps"]
+CHUNK_LINES = 1 << 16
+
+
+class VerifyJob(NamedTuple):
+    dict_name: str
+    length: int
+    words_file: Path
+    extended_words_file: Optional[Path]  # None for 15-letter words
+    extensions_file: Path
+
+
+class Discrepancy(NamedTuple):
+    extensions_file: Path
+    line: Optional[int]   # 1-based line of the extensions file; None for problems with the whole file
+    kind: str             # e.g. "missing word", "stale hooks"
+    detail: str
+
+    def __str__(self) -> str:
+        where = f"{self.extensions_file}:{self.line}" if self.line else str(self.extensions_file)
+        return f"{where}: {self.kind}: {self.detail}"
+
+
+def plan_jobs(base_dir: Path, dict_names: List[str] = DICT_NAMES) -> Tuple[List[VerifyJob], List[Discrepancy]]:
+    """List the extensions files to check, and the files that should or should not exist.
+
+    Every length with an N_letter_words.txt needs an extensions file if the
+    N+1 list exists (15-letter words always do), in text or TSV format;
+    every existing format is checked. An extensions file without its word
+    lists is reported as stale.
+    """
+    jobs, problems = [], []
+    for dict_name in dict_names:
+        dict_dir = base_dir / dict_name
+        for length in range(MIN_LENGTH, MAX_LENGTH + 1):
+            words_file = dict_dir / f"{length}_letter_words.txt"
+            extended_words_file = dict_dir / f"{length + 1}_letter_words.txt" if length < MAX_LENGTH else None
+            candidates = [dict_dir / "extensions" / f"{length}_letter_extensions{suffix}"
+                          for suffix in EXTENSIONS_FORMATS.values()]
+            existing = [path for path in candidates if path.exists()]
+            needed = words_file.exists() and (extended_words_file is None or extended_words_file.exists())
+
+            if needed and not existing:
+                problems.append(Discrepancy(candidates[0], None, "missing file",
+                                            f"{words_file.name} has no extensions file"))
+            for extensions_file in existing:
+                if needed:
+                    jobs.append(VerifyJob(dict_name, length, words_file, extended_words_file, extensions_file))
+                else:
+                    problems.append(Discrepancy(extensions_file, None, "stale file",
+                                                "its word lists no longer exist"))
+    return jobs, problems
+
+
+def _iter_words(words_file: Path) -> Iterator[str]:
+    """Stream words upper-cased, as the extensions engines read them."""
+    with open(words_file, "r", encoding="utf-8") as f:
+        for line in f:
+            word = line.strip()
+            if word:
+                yield word.upper()
+
+
+def build_hook_index(extended_words_file: Optional[Path]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Hash the N+1 list by word[1:] and word[:-1]; values are the hook letters in list order."""
+    left: Dict[str, str] = {}
+    right: Dict[str, str] = {}
+    if extended_words_file is None:
+        return left, right
+    for extended_word in _iter_words(extended_words_file):
+        suffix, prefix = extended_word[1:], extended_word[:-1]
+        left[suffix] = left.get(suffix, "") + extended_word[0]
+        right[prefix] = right.get(prefix, "") + extended_word[-1]
+    return left, right
+
+
+def _compare_hooks(side: str, claimed: str, expected: str) -> List[Tuple[str, str]]:
+    """Describe how a claimed hook list differs from the expected one (letters back to back)."""
+    missing = [letter for letter in expected if letter not in claimed]
+    stale = [letter for letter in claimed if letter not in expected]
+    problems = []
+    if missing:
+        problems.append(("missing hooks", f"{side} {''.join(missing)}"))
+    if stale:
+        problems.append(("stale hooks", f"{side} {''.join(stale)}"))
+    if not problems:
+        problems.append(("hook order", f"{side} {claimed}, expected {expected}"))
+    return problems
+
+
+def _expected_lines(words: List[str], left_index: Dict[str, str], right_index: Dict[str, str],
+                    tsv: bool) -> List[str]:
+    left, right = left_index.get, right_index.get
+    if tsv:
+        return [f"{left(word, '')}\t{word}\t{right(word, '')}\n" for word in words]
+    join = ",".join
+    return [f"{join(left(word, ''))} {word} {join(right(word, ''))}\n" for word in words]
+
+
+def _matches_exactly(job: VerifyJob, left_index: Dict[str, str], right_index: Dict[str, str]) -> Optional[int]:
+    """Compare the file with the expected lines chunk by chunk; return its line count if identical.
+
+    Each chunk is checked with two list comparisons and one bulk sort (for
+    the Polish order of the N list), so a correct file costs little more
+    than formatting its expected lines.
+    """
+    tsv = job.extensions_file.suffix == EXTENSIONS_FORMATS["tsv"]
+    words_iter = _iter_words(job.words_file)
+    previous = None
+    lines = 0
+    with open(job.extensions_file, "r", encoding="utf-8") as f:
+        while True:
+            words = list(itertools.islice(words_iter, CHUNK_LINES))
+            file_lines = list(itertools.islice(f, CHUNK_LINES))
+            if not words:
+                return None if file_lines else lines
+            if file_lines != _expected_lines(words, left_index, right_index, tsv):
+                return None
+            # Strictly increasing: already sorted and no duplicates, also across the chunk boundary
+            if sort_polish(words) != words or len(set(words)) != len(words):
+                return None
+            if previous is not None and polish_sort_key(previous) >= polish_sort_key(words[0]):
+                return None
+            previous = words[-1]
+            lines += len(words)
+
+
+def _find_discrepancies(job: VerifyJob, left_index: Dict[str, str], right_index: Dict[str, str]
+                        ) -> Tuple[int, List[Discrepancy]]:
+    """Walk the N list and the extensions file side by side and report every difference.
+
+    Missing and unexpected words are reported at the line where they occur,
+    so one dropped line does not make the rest of the file mismatch.
+    """
+    tsv = job.extensions_file.suffix == EXTENSIONS_FORMATS["tsv"]
+    column, separator = ("\t", "") if tsv else (" ", ",")
+    problems: List[Discrepancy] = []
+
+    def report(line: Optional[int], kind: str, detail: str):
+        problems.append(Discrepancy(job.extensions_file, line, kind, detail))
+
+    words = _iter_words(job.words_file)
+    previous_key = b""
+
+    def next_word() -> Optional[str]:
+        nonlocal previous_key
+        word = next(words, None)
+        if word is not None:
+            key = polish_sort_key(word)
+            if key <= previous_key:
+                report(None, "order", f"{word} in {job.words_file.name} is not after the word before it")
+            previous_key = key
+        return word
+
+    word = next_word()
+    number = 0
+    with open(job.extensions_file, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            # Fast path: the line is exactly what the word lists give
+            if word is not None and line == (f"{separator.join(left_index.get(word, ''))}{column}{word}{column}"
+                                             f"{separator.join(right_index.get(word, ''))}\n"):
+                word = next_word()
+                continue
+
+            parts = line.rstrip("\n").split(column)
+            if len(parts) != 3 or len(parts[1]) != job.length:
+                report(number, "malformed", repr(line.rstrip("\n")))
+                continue
+            left, line_word, right = parts
+
+            # Words of the list that sort before this line's word were skipped by the file
+            while word is not None and word != line_word and polish_sort_key(word) < polish_sort_key(line_word):
+                report(number, "missing word", f"{word} should come before {line_word}")
+                word = next_word()
+            if word != line_word:
+                report(number, "unexpected word", f"{line_word} is not in {job.words_file.name}")
+                continue
+
+            for side, claimed, index in (("left", left, left_index), ("right", right, right_index)):
+                expected = separator.join(index.get(word, ""))
+                if claimed != expected:
+                    for kind, detail in _compare_hooks(side, claimed.replace(",", ""), expected.replace(",", "")):
+                        report(number, kind, f"{word}: {detail}")
+            word = next_word()
+
+    while word is not None:
+        report(number + 1, "missing word", f"{word} is missing at the end of the file")
+        word = next_word()
+    return number, problems
+
+
+def verify_extensions_file(job: VerifyJob) -> Tuple[VerifyJob, int, List[Discrepancy]]:
+    """Check one extensions file against its word lists.
+
+    The N+1 list is streamed once into a hash index of hooks. The N list
+    and the extensions file are then streamed side by side in chunks, so
+    neither is held in memory. The checks are:
+    - the N list is in strict Polish order
+    - its words appear in the file in the same order
+    - every line's hooks are exactly the ones the N+1 list gives, in order
+
+    Only a file that differs is walked line by line to report where. Returns
+    the job, the lines read and the discrepancies found.
+    """
+    left_index, right_index = build_hook_index(job.extended_words_file)
+    lines = _matches_exactly(job, left_index, right_index)
+    if lines is not None:
+        return job, lines, []
+    return (job,) + _find_discrepancies(job, left_index, right_index)
+
+
+def verify_all(jobs: List[VerifyJob], workers: Optional[int] = None) -> List[Tuple[VerifyJob, int, List[Discrepancy]]]:
+    """Verify extensions files in a process pool, largest first; results come back in job order."""
+    order = sorted(range(len(jobs)), key=lambda i: jobs[i].extensions_file.stat().st_size, reverse=True)
+    workers = min(resolve_workers(workers), max(1, len(jobs)))
+    if workers == 1:
+        results = [verify_extensions_file(jobs[i]) for i in order]
+    else:
+        with _pool_context().Pool(workers) as pool:
+            results = list(pool.imap_unordered(verify_extensions_file, [jobs[i] for i in order]))
+    position = {job: i for i, job in enumerate(jobs)}
+    return sorted(results, key=lambda result: position[result[0]])
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Check extensions files against the current word lists.")
+    parser.add_argument("--dict", dest="dict_name", choices=DICT_NAMES, default=None,
+                        help="dictionary to check (default: both)")
+    parser.add_argument("--base-dir", type=Path, default=Path("slowniki"))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="files checked at once (default: one per CPU, 1 runs serially)")
+    parser.add_argument("--max-report", type=int, default=20,
+                        help="discrepancies printed per file (all are counted)")
+    parser.add_argument("--metrics", type=Path, default=None, metavar="FILE",
+                        help="write per-phase timings, counts and peak RSS to FILE (.json or .csv)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    jobs, problems = plan_jobs(args.base_dir, [args.dict_name] if args.dict_name else DICT_NAMES)
+    for problem in problems:
+        print(problem)
+    with METRICS.phase("verify", files=len(jobs)) as counts:
+        results = verify_all(jobs, args.workers)
+        counts["lines"] = sum(lines for _, lines, _ in results)
+
+    total = len(problems)
+    for job, lines, discrepancies in results:
+        status = "OK" if not discrepancies else f"{len(discrepancies)} discrepancies"
+        print(f"{job.dict_name.upper()}{job.length} {job.extensions_file.name}: {lines} lines, {status}")
+        for discrepancy in discrepancies[:args.max_report]:
+            print(f"  {discrepancy}")
+        if len(discrepancies) > args.max_report:
+            print(f"  ... and {len(discrepancies) - args.max_report} more")
+        total += len(discrepancies)
+
+    print(f"\nChecked {len(jobs)} files in {time.perf_counter() - start:.1f}s: "
+          f"{'no discrepancies' if not total else f'{total} discrepancies'}")
+    if args.metrics:
+        METRICS.write_report(args.metrics)
+    if total:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,216 @@
+import argparse
+import bz2
+import gzip
+import heapq
+import io
+import lzma
+import sys
+import tempfile
+import zipfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, TextIO
 
+from src.collation import POLISH_ALPHABET_ORDER, polish_sort_key, sort_polish  # noqa: F401 (re-exported)
+from src.metrics import METRICS, profile_calls, profiling
 
-POLISH_ALPHABET_ORDER = {
-    'A': 1, 'Ą': 2, 'B': 3, 'C': 4, 'Ć': 5, 'D': 6, 'E': 7, 'Ę': 8, 'F': 9, 'G': 10,
-    'H': 11, 'I': 12, 'J': 13, 'K': 14, 'L': 15, 'Ł': 16, 'M': 17, 'N': 18, 'Ń': 19,
-    'O': 20, 'Ó': 21, 'P': 22, 'R': 23, 'S': 24, 'Ś': 25, 'T': 26, 'U': 27, 'W': 28,
-    'Y': 29, 'Z': 30, 'Ź': 31, 'Ż': 32
-}
 
+# Memory held per buffered word besides the str itself: its slot in a length group's list
+WORD_OVERHEAD_BYTES = 8
+# Temporary memory sort_polish needs per letter of the group it sorts (rank arrays, order, result)
+SORT_BYTES_PER_LETTER = 16
 
-def polish_sort_key(word: str) -> List[int]:
-    """Create a sort key for a word based on Polish alphabet order."""
-    return [POLISH_ALPHABET_ORDER.get(c, 0) for c in word.upper()]
+# Source lists may be kept compressed; tried in this order next to the plain file
+COMPRESSED_OPENERS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+SOURCE_SUFFIXES = [".txt", ".txt.gz", ".txt.xz", ".txt.bz2", ".zip"]
 
 
-def split_words_by_length(input_file: Path, output_dir: Path):
-    """Split words from input file into separate files by length, maintaining Polish order."""
-    # Read all words and group by length
-    words_by_length = {}
-    with open(input_file, 'r', encoding='utf-8') as f:
+def _zip_member(archive: zipfile.ZipFile) -> str:
+    """Pick the word list in a zip: the largest .txt member (sjp.pl zips also hold a README)."""
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    text_members = [info for info in members if info.filename.lower().endswith(".txt")] or members
+    if not text_members:
+        raise ValueError(f"{archive.filename} is empty")
+    return max(text_members, key=lambda info: info.file_size).filename
+
+
+@contextmanager
+def open_words(input_file: Path) -> Iterator[TextIO]:
+    """Open a word list as UTF-8 text, decompressing .zip, .gz, .xz and .bz2 sources on the fly.
+
+    Archives are read as a stream and decoded incrementally, so nothing is
+    extracted to disk and only a small buffer is held in memory.
+    """
+    suffix = input_file.suffix.lower()
+    if suffix == ".zip":
+        with zipfile.ZipFile(input_file) as archive, archive.open(_zip_member(archive)) as member:
+            yield io.TextIOWrapper(member, encoding="utf-8")
+    elif suffix in COMPRESSED_OPENERS:
+        with COMPRESSED_OPENERS[suffix](input_file, "rt", encoding="utf-8") as f:
+            yield f
+    else:
+        with open(input_file, "r", encoding="utf-8") as f:
+            yield f
+
+
+def iter_words(input_file: Path) -> Iterator[str]:
+    """Yield the non-empty stripped lines of a plain or compressed word list."""
+    with open_words(input_file) as f:
         for line in f:
             word = line.strip()
             if word:
-                length = len(word)
-                if length not in words_by_length:
-                    words_by_length[length] = []
-                words_by_length[length].append(word)
+                yield word
+
+
+def find_source_file(dict_dir: Path, dict_name: str) -> Path:
+    """Return the source list of a dictionary, plain or compressed.
+
+    Tries {dict_name}.txt, .txt.gz, .txt.xz, .txt.bz2 and .zip, then dated
+    downloads such as sjp-20240101.zip (the last name in sort order wins).
+    Returns the plain .txt path if nothing exists, for the caller to report.
+    """
+    for suffix in SOURCE_SUFFIXES:
+        source_file = dict_dir / f"{dict_name}{suffix}"
+        if source_file.exists():
+            return source_file
+    dated = sorted(path for suffix in SOURCE_SUFFIXES for path in dict_dir.glob(f"{dict_name}-*{suffix}"))
+    return dated[-1] if dated else dict_dir / f"{dict_name}.txt"
+
+
+def split_words_by_length(input_file: Path, output_dir: Path, memory_budget: Optional[int] = None):
+    """Split words from input file into separate files by length, maintaining Polish order.
+
+    The input may be a plain list or a .zip, .gz, .xz or .bz2 archive of one.
+    With a memory budget (in bytes) the input is sorted externally in bounded
+    memory; the output is identical to the in-memory path.
+    """
+    if memory_budget is not None:
+        split_words_by_length_external(input_file, output_dir, memory_budget)
+        return
+
+    # Read all words and group by length
+    words_by_length = {}
+    with METRICS.phase("read") as counts:
+        for word in iter_words(input_file):
+            length = len(word)
+            if length not in words_by_length:
+                words_by_length[length] = []
+            words_by_length[length].append(word)
+        counts["words"] = sum(len(words) for words in words_by_length.values())
     
     # Sort each group by Polish alphabet order and write to files
     output_dir.mkdir(parents=True, exist_ok=True)
     
     for length, words in words_by_length.items():
         output_file = output_dir / f"{length}_letter_words.txt"
-        words.sort(key=polish_sort_key)
+        with METRICS.phase("sort", length=length, words=len(words)):
+            words = sort_polish(words)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with METRICS.phase("write", length=length, lines=len(words)), open(output_file, 'w', encoding='utf-8') as f:
             for word in words:
                 f.write(f"{word}\n")
         
         print(f"Created {output_file} with {len(words)} words")
 
 
-def main():
+def _write_run(words: List[str], run_file: Path):
+    """Sort a chunk of same-length words and write it as a sorted run."""
+    with open(run_file, 'w', encoding='utf-8') as f:
+        for word in sort_polish(words):
+            f.write(f"{word}\n")
+
+
+def _read_run(run_file: Path) -> Iterator[str]:
+    with open(run_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+def split_words_by_length_external(input_file: Path, output_dir: Path, memory_budget: int):
+    """Split words by length using sorted runs on disk and a k-way merge.
+
+    Words are buffered until the budget is reached, each length group of the
+    buffer is written as a sorted run, and the runs of every length are merged
+    into its N_letter_words.txt. Sorting and merging are both stable, so the
+    result matches the in-memory sort exactly.
+
+    The budget covers the buffered words at their real size (str object and
+    list slot) plus the temporary arrays of sorting the largest length group.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmp:
+        run_dir = Path(tmp)
+        runs: Dict[int, List[Path]] = {}
+        buffer: Dict[int, List[str]] = {}
+        buffered_bytes = 0
+        sort_bytes = 0
+
+        def flush():
+            for length, words in buffer.items():
+                run_file = run_dir / f"{length}_{len(runs.setdefault(length, []))}.txt"
+                _write_run(words, run_file)
+                runs[length].append(run_file)
+            buffer.clear()
+
+        with METRICS.phase("runs") as counts:
+            words_read = 0
+            for word in iter_words(input_file):
+                group = buffer.setdefault(len(word), [])
+                group.append(word)
+                words_read += 1
+                buffered_bytes += sys.getsizeof(word) + WORD_OVERHEAD_BYTES
+                sort_bytes = max(sort_bytes, len(group) * len(word) * SORT_BYTES_PER_LETTER)
+                if buffered_bytes + sort_bytes >= memory_budget:
+                    flush()
+                    buffered_bytes = sort_bytes = 0
+            flush()
+            counts["words"] = words_read
+
+        for length, run_files in runs.items():
+            output_file = output_dir / f"{length}_letter_words.txt"
+            count = 0
+            with METRICS.phase("merge", length=length) as counts, open(output_file, 'w', encoding='utf-8') as f:
+                for word in heapq.merge(*(_read_run(run_file) for run_file in run_files), key=polish_sort_key):
+                    f.write(f"{word}\n")
+                    count += 1
+                counts["lines"] = count
+
+            print(f"Created {output_file} with {count} words ({len(run_files)} sorted runs)")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Split dictionaries into per-length word files.")
+    parser.add_argument("--memory-budget", type=int, default=None, metavar="MB",
+                        help="sort externally, keeping buffered words and their sort within about MB megabytes "
+                             "(peak RSS runs 1.2-1.4x MB above the interpreter's own, from allocator slack)")
+    parser.add_argument("--metrics", type=Path, default=None, metavar="FILE",
+                        help="write per-phase timings, counts and peak RSS to FILE (.json or .csv)")
+    parser.add_argument("--profile", type=Path, default=None, metavar="FILE",
+                        help="profile split_words_by_length with cProfile and dump the stats to FILE")
+    parser.add_argument("--sjp", type=Path, default=None, metavar="PATH",
+                        help="SJP source list, plain or .zip/.gz/.xz/.bz2 (default: found in slowniki/sjp)")
+    parser.add_argument("--osps", type=Path, default=None, metavar="PATH",
+                        help="OSPS source list, plain or .zip/.gz/.xz/.bz2 (default: found in slowniki/osps)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    memory_budget = args.memory_budget * 1024 * 1024 if args.memory_budget else None
+
     # Process both dictionaries
-    for dict_name, file_name in [("sjp", "sjp.txt"), ("osps", "osps.txt")]:
-        print(f"\nProcessing {dict_name.upper()} dictionary...")
-        input_file = Path(f"slowniki/{dict_name}/{file_name}")
-        output_dir = Path(f"slowniki/{dict_name}")
-        split_words_by_length(input_file, output_dir)
+    with profiling(args.profile) as profiler:
+        split = profile_calls(split_words_by_length, profiler)
+        for dict_name, source_file in [("sjp", args.sjp), ("osps", args.osps)]:
+            print(f"\nProcessing {dict_name.upper()} dictionary...")
+            output_dir = Path(f"slowniki/{dict_name}")
+            input_file = source_file or find_source_file(output_dir, dict_name)
+            with METRICS.labels(dict_name=dict_name), METRICS.phase("split"):
+                split(input_file, output_dir, memory_budget)
+
+    if args.metrics:
+        METRICS.write_report(args.metrics)
 
 
 if __name__ == "__main__":
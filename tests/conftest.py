@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from src import fonts
+from src.generate_extensions import generate_all_extensions
+from src.hook_index import encode_word, hooks_mask
+from src.word_splitter import split_words_by_length
+
+
+def _section(entries):
+    """Build a sorted (packed words, left masks, right masks) index section from (word, left, right)."""
+    entries = sorted(entries, key=lambda entry: encode_word(entry[0]))
+    length = len(entries[0][0])
+    return (
+        np.array([encode_word(word) for word, _, _ in entries], dtype=f"S{length}"),
+        np.array([hooks_mask(left) for _, left, _ in entries], dtype="<u4"),
+        np.array([hooks_mask(right) for _, _, right in entries], dtype="<u4"),
+    )
+
+
+@pytest.fixture(autouse=True)
+def font_cache(monkeypatch, tmp_path_factory):
+    """Keep subset fonts built by tests out of the user's ~/.cache."""
+    cache_dir = tmp_path_factory.mktemp("fonts")
+    monkeypatch.setenv(fonts.FONT_CACHE_ENV, str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture
+def make_section():
+    return _section
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    """SJP and OSPS dictionaries of a few 3- and 4-letter words, split and with extensions and hook indexes."""
+    for dict_name, words in [("sjp", "kot\nkota\nkoty\nskot\nala\n"), ("osps", "kot\nkota\nskot\nala\nalan\nżal\n")]:
+        dict_dir = tmp_path / dict_name
+        dict_dir.mkdir()
+        (dict_dir / f"{dict_name}.txt").write_text(words, encoding="utf-8")
+        split_words_by_length(dict_dir / f"{dict_name}.txt", dict_dir)
+        generate_all_extensions(dict_dir, workers=1)
+    return tmp_path
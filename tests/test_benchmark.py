@@ -0,0 +1,51 @@
+import json
+from src.benchmark import find_regressions, generate_words, run_benchmark, save_results
+
+
+def test_generate_words_is_deterministic():
+    """Test that the synthetic dictionary depends only on size and seed."""
+    # when
+    words = generate_words(2000, seed=1)
+
+    # then
+    assert words == generate_words(2000, seed=1)
+    assert words != generate_words(2000, seed=2)
+    assert len(set(words)) == len(words)
+    assert 1900 <= len(words) <= 2100
+    assert {len(word) for word in words} == set(range(2, 16))
+
+
+def test_run_benchmark_saves_results(tmp_path):
+    """Test that stages are measured in pipeline order and saved as JSON."""
+    # when
+    results = run_benchmark([1000], stages=["extensions", "split"], work_dir=tmp_path)
+    report = save_results(results, tmp_path / "results.json", seed=0)
+
+    # then
+    assert [(result.size, result.stage) for result in results] == [(1000, "split"), (1000, "extensions")]
+    assert all(result.items > 900 and result.seconds > 0 and result.peak_rss_mb > 0 for result in results)
+    assert (tmp_path / "synthetic_1000" / "extensions" / "hooks.idx").exists()
+    assert json.loads((tmp_path / "results.json").read_text()) == report
+
+
+def test_find_regressions():
+    """Test that throughput drops and memory growth beyond tolerance are reported."""
+    # given
+    baseline = {"results": [
+        {"size": 10, "stage": "split", "items_per_second": 1000.0, "peak_rss_mb": 50.0},
+        {"size": 10, "stage": "extensions", "items_per_second": 1000.0, "peak_rss_mb": 50.0},
+    ]}
+    current = {"results": [
+        {"size": 10, "stage": "split", "items_per_second": 900.0, "peak_rss_mb": 55.0},
+        {"size": 10, "stage": "extensions", "items_per_second": 500.0, "peak_rss_mb": 80.0},
+        {"size": 10, "stage": "pdf", "items_per_second": 1.0, "peak_rss_mb": 500.0},
+    ]}
+
+    # when
+    regressions = find_regressions(baseline, current, tolerance=0.25)
+
+    # then
+    assert regressions == [
+        "extensions @ 10: throughput 1,000/s -> 500/s",
+        "extensions @ 10: peak RSS 50.0 MB -> 80.0 MB",
+    ]
@@ -0,0 +1,56 @@
+import pytest
+from src.collation import POLISH_ALPHABET, make_sort_key, polish_sort_key, sort_polish
+
+
+def test_polish_sort_key_is_compact_bytes():
+    """Test that the sort key is one byte per letter, ranked by the Polish alphabet."""
+    # when
+    key = polish_sort_key("ząb")
+
+    # then
+    assert key == bytes([30, 2, 3])
+
+
+def test_sort_polish_matches_key_sort():
+    """Test that the bulk sorter agrees with sorting by key, including mixed lengths and case."""
+    # given
+    words = ["żab", "Ab", "łab", "lab", "ąbc", "abc", "ąb", "źab", "ab", "a", "żal", "Łaz", "zab"]
+
+    # when
+    sorted_words = sort_polish(words)
+
+    # then
+    assert sorted_words == sorted(words, key=polish_sort_key)
+    assert sorted_words == ["a", "Ab", "ab", "abc", "ąb", "ąbc", "lab", "łab", "Łaz", "zab", "źab", "żab", "żal"]
+
+
+def test_sort_polish_full_alphabet_reversed():
+    """Test sorting every letter of the alphabet."""
+    # when
+    sorted_letters = sort_polish(list(reversed(POLISH_ALPHABET)))
+
+    # then
+    assert "".join(sorted_letters) == POLISH_ALPHABET
+
+
+@pytest.mark.parametrize("unknown, expected", [
+    ("first", ["a-b", "aąb", "ab"]),
+    ("last", ["aąb", "ab", "a-b"]),
+])
+def test_unknown_character_policy(unknown, expected):
+    """Test explicit ordering of characters outside the Polish alphabet."""
+    # given
+    words = ["a-b", "aąb", "ab"]
+
+    # when/then
+    assert sort_polish(words, unknown=unknown) == expected
+    assert sorted(words, key=make_sort_key(unknown)) == expected
+
+
+def test_unknown_character_error():
+    """Test that the error policy rejects characters outside the alphabet."""
+    # when/then
+    with pytest.raises(ValueError, match="'Q'"):
+        sort_polish(["kot", "qua"], unknown="error")
+    with pytest.raises(ValueError, match="'Q'"):
+        make_sort_key("error")("qua")
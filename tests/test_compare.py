@@ -0,0 +1,71 @@
+from src.compare import compare_dictionaries, diff_hook_section
+from src.hook_index import INDEX_NAME, Hooks, hooks_mask, write_hook_index
+
+
+def test_diff_hook_section(make_section):
+    """Test symmetric hook differences and one-sided words in a merged pass."""
+    # given
+    a = make_section([("KOT", "S", "AY"), ("ALA", "", ""), ("ŻAL", "", "E"), ("ŁAD", "", "")])
+    b = make_section([("KOT", "S", "AĘ"), ("ALA", "", "N"), ("ŻAL", "", "E"), ("BAR", "", "")])
+
+    # when
+    diff = diff_hook_section(3, a, b)
+
+    # then
+    assert diff.words == ["ALA", "BAR", "KOT", "ŁAD"]
+    assert diff.in_a.tolist() == [True, False, True, True]
+    assert diff.in_b.tolist() == [True, True, True, False]
+    assert diff.right_a_only.tolist() == [0, 0, hooks_mask("Y"), 0]
+    assert diff.right_b_only.tolist() == [hooks_mask("N"), 0, hooks_mask("Ę"), 0]
+    assert not diff.left_a_only.any() and not diff.left_b_only.any()
+
+
+def test_compare_dictionaries(base_dir):
+    """Test the diff file and PDF written for two small dictionaries."""
+    # when
+    created = compare_dictionaries(base_dir, ("sjp", "osps"), pdfs=True)
+
+    # then
+    diff_file = base_dir / "compare" / "sjp_osps_3_letter_hook_diff.tsv"
+    assert created == [diff_file, base_dir / "compare" / "SJP_OSPS3_HOOK_DIFF.pdf"]
+    assert diff_file.read_text(encoding="utf-8") == (
+        "\t\tALA\t\tN\t\n"
+        "\t\tKOT\tY\t\t\n"
+        "\t\tŻAL\t\t\tosps\n"
+    )
+    assert created[1].read_bytes().startswith(b"%PDF")
+
+
+def test_compare_skips_lengths_missing_on_one_side(tmp_path, capsys):
+    """Test that a length without a hook section on one side is reported instead of diffed as absent words."""
+    # given: SJP has no 4-letter section, as when its 5-letter list is missing
+    write_hook_index(tmp_path / "sjp" / "extensions" / INDEX_NAME, {3: (["KOT"], [0], [hooks_mask("A")])})
+    write_hook_index(tmp_path / "osps" / "extensions" / INDEX_NAME, {
+        3: (["KOT"], [0], [hooks_mask("A")]),
+        4: (["KOTA"], [0], [0]),
+    })
+
+    # when
+    created = compare_dictionaries(tmp_path, ("sjp", "osps"))
+
+    # then
+    assert created == [tmp_path / "compare" / "sjp_osps_3_letter_hook_diff.tsv"]
+    assert created[0].read_text(encoding="utf-8") == ""
+    assert "Not compared: 4-letter words, SJP has no hook index section" in capsys.readouterr().out
+
+
+def test_compare_uses_full_hooks_of_foreign_words(tmp_path):
+    """Test that hooks and words with Q, V or X are compared from the foreign table, not the masks."""
+    # given
+    write_hook_index(tmp_path / "sjp" / "extensions" / INDEX_NAME, {5: (["CARDO", "KARTA"], [0, 0], [0, 0])},
+                     {"CARDO": Hooks("", "X"), "VOXEL": Hooks("", "E")})
+    write_hook_index(tmp_path / "osps" / "extensions" / INDEX_NAME, {5: (["CARDO", "KARTA"], [0, 0], [0, 0])})
+
+    # when
+    created = compare_dictionaries(tmp_path, ("sjp", "osps"))
+
+    # then
+    assert created[0].read_text(encoding="utf-8") == (
+        "\t\tCARDO\tX\t\t\n"
+        "\t\tVOXEL\tE\t\tsjp\n"
+    )
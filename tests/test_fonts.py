@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import reportlab
+
+from src import fonts
+
+
+@pytest.fixture
+def font_path():
+    # given
+    try:
+        return fonts.resolve_font_path()
+    except FileNotFoundError:
+        pytest.skip("no font with Polish glyphs on this machine")
+
+
+def test_resolve_font_path_order(monkeypatch, tmp_path, font_path):
+    """Test that an explicit path wins over the environment, which wins over the candidates."""
+    # given
+    monkeypatch.setattr(fonts, "FONT_CANDIDATES", [str(tmp_path / "missing.ttf"), str(font_path)])
+    monkeypatch.delenv(fonts.FONT_ENV, raising=False)
+
+    # then
+    assert fonts.resolve_font_path() == font_path
+    monkeypatch.setenv(fonts.FONT_ENV, str(tmp_path / "configured.ttf"))
+    with pytest.raises(FileNotFoundError):
+        fonts.resolve_font_path()
+    assert fonts.resolve_font_path(font_path) == font_path
+
+
+def test_subset_font_is_cached(font_cache, font_path):
+    """Test that the subset keeps the Polish letters, is much smaller and is built only once."""
+    pytest.importorskip("fontTools")
+    from fontTools.ttLib import TTFont
+
+    # when
+    subset = fonts.subset_font_path(font_path)
+    built_at = subset.stat().st_mtime_ns
+
+    # then
+    assert subset.parent == font_cache
+    assert subset.stat().st_size < font_path.stat().st_size
+    cmap = TTFont(str(subset)).getBestCmap()
+    assert all(ord(letter) in cmap for letter in fonts.REQUIRED_CHARACTERS + "Left Extensions")
+    assert fonts.subset_font_path(font_path) == subset
+    assert subset.stat().st_mtime_ns == built_at
+
+
+def test_subset_font_rejects_font_without_polish_letters(tmp_path):
+    """Test that a font lacking Polish glyphs is refused."""
+    pytest.importorskip("fontTools")
+    # given
+    vera = Path(reportlab.__file__).parent / "fonts" / "Vera.ttf"
+
+    # then
+    with pytest.raises(ValueError, match="no glyphs"):
+        fonts.subset_font_path(vera, cache_dir=tmp_path)
+
+
+def test_register_font_checks_glyphs_without_font_tools(monkeypatch):
+    """Test that a font lacking Polish glyphs is refused even when it cannot be subset."""
+    # given
+    vera = Path(reportlab.__file__).parent / "fonts" / "Vera.ttf"
+    monkeypatch.setattr(fonts, "_registered", None)
+
+    # then
+    with pytest.raises(ValueError, match="no glyphs for Ą"):
+        fonts.register_font(vera, use_subset=False)
+    assert fonts.registered_font() is None
+
+
+def test_bundled_font_is_the_last_resort(monkeypatch):
+    """Test that the bundled font is used when no system font exists, and has every Polish letter."""
+    # given
+    monkeypatch.setattr(fonts, "FONT_CANDIDATES", ["/nonexistent/font.ttf", str(fonts.BUNDLED_FONT)])
+    monkeypatch.delenv(fonts.FONT_ENV, raising=False)
+
+    # then
+    assert fonts.resolve_font_path() == fonts.BUNDLED_FONT
+    assert fonts.missing_glyphs(fonts.TTFont("bundled", str(fonts.BUNDLED_FONT))) == ""
+
+
+def test_importing_generate_pdfs_does_not_load_a_font(tmp_path):
+    """Test that the font is loaded on first render, not at import time."""
+    # given
+    env = dict(os.environ, **{fonts.FONT_ENV: str(tmp_path / "missing.ttf")})
+    code = "import src.generate_pdfs, src.fonts; assert src.fonts.registered_font() is None"
+
+    # when
+    result = subprocess.run([sys.executable, "-c", code], env=env, cwd=Path(__file__).parent.parent)
+
+    # then
+    assert result.returncode == 0
@@ -1,6 +1,10 @@
 import pytest
 from pathlib import Path
-from src.generate_extensions import generate_extensions_file, build_extensions_lookup, process_word_batch
+from src.generate_extensions import (
+    generate_extensions_file, build_extensions_lookup, process_word_batch,
+    build_all_extensions_lookup, generate_all_extensions, map_word_batches, iter_extension_records, load_dictionary,
+)
+from src.metrics import METRICS
 
 
 def test_build_extensions_lookup():
@@ -87,4 +91,102 @@ def test_generate_extensions_file_fifteen_letters(tmp_path):
     
     assert len(lines) == 2
     assert lines[0] == " KONSTANTYNOPOL "
-    assert lines[1] == " PIĘTNASTOLITER " 
\ No newline at end of file
+    assert lines[1] == " PIĘTNASTOLITER "
+
+
+def test_build_all_extensions_lookup_matches_per_length_lookup():
+    """Test that the all-lengths index agrees with the per-length lookups."""
+    # given
+    words_by_length = {
+        3: ["KOT", "SKO"],
+        4: ["KOTA", "KOTY", "SKOT", "KRET"],
+    }
+
+    # when
+    left_lookup, right_lookup = build_all_extensions_lookup(words_by_length)
+
+    # then
+    expected_left, expected_right = build_extensions_lookup(words_by_length[4], 3)
+    for word, hooks in expected_left.items():
+        assert left_lookup[word] == hooks
+    for word, hooks in expected_right.items():
+        assert right_lookup[word] == hooks
+
+
+def test_generate_all_extensions(tmp_path):
+    """Test single-pass generation of every extensions file of a dictionary."""
+    # given
+    (tmp_path / "3_letter_words.txt").write_text("kot\npies\n", encoding="utf-8")
+    (tmp_path / "4_letter_words.txt").write_text("kota\nkoty\nskot\n", encoding="utf-8")
+    (tmp_path / "15_letter_words.txt").write_text("konstantynopola\n", encoding="utf-8")
+
+    # when
+    created = generate_all_extensions(tmp_path)
+
+    # then
+    extensions_dir = tmp_path / "extensions"
+    assert created == [
+        extensions_dir / "3_letter_extensions.txt",
+        extensions_dir / "15_letter_extensions.txt",
+    ]
+    assert (extensions_dir / "3_letter_extensions.txt").read_text(encoding="utf-8") == "S KOT A,Y\n PIES \n"
+    assert (extensions_dir / "15_letter_extensions.txt").read_text(encoding="utf-8") == " KONSTANTYNOPOLA \n"
+    assert not (extensions_dir / "4_letter_extensions.txt").exists()
+
+
+def test_generate_all_extensions_tsv_records(tmp_path):
+    """Test writing TSV records and removing them when only text is requested again."""
+    # given
+    (tmp_path / "3_letter_words.txt").write_text("kot\npies\n", encoding="utf-8")
+    (tmp_path / "4_letter_words.txt").write_text("kota\nkoty\nskot\n", encoding="utf-8")
+    records_file = tmp_path / "extensions" / "3_letter_extensions.tsv"
+
+    # when
+    created = generate_all_extensions(tmp_path, formats=("tsv",))
+
+    # then
+    assert created == [records_file]
+    assert records_file.read_text(encoding="utf-8") == "S\tKOT\tAY\n\tPIES\t\n"
+    assert dict(iter_extension_records(load_dictionary(tmp_path)))[3] == [("S", "KOT", "AY"), ("", "PIES", "")]
+
+    # when
+    generate_all_extensions(tmp_path)
+
+    # then
+    assert not records_file.exists()
+
+
+def test_generate_all_extensions_records_worker_phases(tmp_path):
+    """Test that the write phases run in pool workers reach the parent's metrics."""
+    # given
+    (tmp_path / "3_letter_words.txt").write_text("kot\npies\n", encoding="utf-8")
+    (tmp_path / "4_letter_words.txt").write_text("kota\nkoty\nskot\n", encoding="utf-8")
+    (tmp_path / "15_letter_words.txt").write_text("konstantynopola\n", encoding="utf-8")
+    METRICS.reset()
+
+    # when
+    with METRICS.labels(dict_name="osps"):
+        generate_all_extensions(tmp_path, workers=2)
+
+    # then
+    writes = {record.length: record for record in METRICS.records if record.phase == "pool/write"}
+    assert sorted(writes) == [3, 15]
+    assert writes[3].dict_name == "osps" and writes[3].counts == {"lines": 2} and writes[3].peak_rss_mb > 0
+    METRICS.reset()
+
+
+def test_map_word_batches_parallel_matches_serial():
+    """Test that sharing lookups with workers gives the same lines as a serial run."""
+    # given
+    words = [f"W{i:04d}" for i in range(2500)]
+    left_lookup = {"W0001": ["A"], "W2499": ["B", "C"]}
+    right_lookup = {"W1500": ["Z"]}
+
+    # when
+    serial = map_word_batches(words, left_lookup, right_lookup, workers=1)
+    parallel = map_word_batches(words, left_lookup, right_lookup, workers=2)
+
+    # then
+    assert parallel == serial
+    assert serial[1] == "A W0001 \n"
+    assert serial[1500] == " W1500 Z\n"
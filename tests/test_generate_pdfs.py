@@ -1,6 +1,22 @@
+import itertools
+import re
+import tracemalloc
 import pytest
+import reportlab
 from pathlib import Path
-from src.generate_pdfs import parse_extensions_line
+from pypdf import PdfReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from src import fonts
+from src.generate_pdfs import (
+    parse_extensions_line, create_pdf_canvas, stream_pdf, iter_extension_rows, plan_shards, build_pdfs, ROWS_PER_PAGE,
+    read_extension_rows, render_in_process, compact_pdf, COMPACT_ROWS_PER_BAND, _open_streaming_canvas,
+    parse_args, render_rows, _text_width,
+)
+
+
+def count_pages(pdf_file: Path) -> int:
+    return len(re.findall(rb"/Type /Page\b(?!s)", pdf_file.read_bytes()))
 
 
 @pytest.fixture
@@ -81,4 +97,295 @@ def test_extensions_match_words_order():
     extension_words = [word.lower() for _, word, _ in extensions if word]
     
     # then
-    assert extension_words == words, "Words in extensions file do not match order in words file" 
\ No newline at end of file
+    assert extension_words == words, "Words in extensions file do not match order in words file"
+
+
+def test_rows_per_page_matches_table_layout():
+    # given/when/then - 41 data rows fit under the header, as with the platypus Table
+    assert ROWS_PER_PAGE == 41
+
+
+def test_create_pdf_canvas(tmp_path):
+    # given
+    extensions_file = tmp_path / "3_letter_extensions.txt"
+    with open(extensions_file, "w", encoding="utf-8") as f:
+        for i in range(ROWS_PER_PAGE * 2 + 1):
+            f.write("B,L,Ł ABO M,Ś\n")
+    output_file = tmp_path / "OSPS3.pdf"
+
+    # when
+    create_pdf_canvas(extensions_file, output_file, 3, "osps")
+
+    # then
+    assert output_file.read_bytes().startswith(b"%PDF")
+    assert count_pages(output_file) == 3
+
+
+def test_iter_extension_rows(sample_extensions_file):
+    # when
+    rows = list(iter_extension_rows(sample_extensions_file, word_length=3))
+
+    # then
+    assert rows[0] == ["", "AAA", ""]
+    assert rows[2] == ["BCDLPRTŁŻ", "ABY", "MŚ"]
+    assert len(rows) == 5
+
+
+def test_tsv_records_match_text_rows(tmp_path, sample_extensions_file):
+    """Test that TSV records give the same rows as the text format, without searching for the word."""
+    # given
+    records_file = tmp_path / "3_letter_extensions.tsv"
+    records_file.write_text("\tAAA\t\nBLŁŻ\tABO\t\nBCDLPRTŁŻ\tABY\tMŚ\nBDFGLMPWŁ\tACH\tAY\nBDGHPRZ\tACZ\t\n",
+                            encoding="utf-8")
+
+    # when
+    rows = read_extension_rows(records_file, word_length=3)
+
+    # then
+    assert rows == read_extension_rows(sample_extensions_file, word_length=3)
+    assert list(iter_extension_rows(records_file, word_length=3)) == rows
+    # A hook list the same length as the word is not mistaken for it
+    assert read_extension_rows(records_file, word_length=3)[0] == ["", "AAA", ""]
+    records_file.write_text("AB\tCD\t\n", encoding="utf-8")
+    assert read_extension_rows(records_file, word_length=2) == [["AB", "CD", ""]]
+
+
+def test_render_in_process(tmp_path):
+    """Test rendering PDFs straight from in-memory extension records."""
+    # given
+    (tmp_path / "3_letter_words.txt").write_text("kot\npies\n", encoding="utf-8")
+    (tmp_path / "4_letter_words.txt").write_text("kota\nkoty\nskot\n", encoding="utf-8")
+
+    # when
+    created = render_in_process(tmp_path, "osps")
+
+    # then
+    assert created == [tmp_path / "OSPS3.pdf"]
+    assert count_pages(tmp_path / "OSPS3.pdf") == 1
+    assert not (tmp_path / "extensions").exists()
+
+
+def test_render_in_process_honours_renderer(tmp_path, capsys):
+    """Test that in-process rendering uses the chosen renderer and skips lengths without words."""
+    # given
+    (tmp_path / "2_letter_words.txt").write_text("", encoding="utf-8")
+    (tmp_path / "3_letter_words.txt").write_text("kot\npies\n", encoding="utf-8")
+    (tmp_path / "4_letter_words.txt").write_text("kota\nkoty\nskot\n", encoding="utf-8")
+
+    # when
+    created = render_in_process(tmp_path, "osps", renderer="compact")
+
+    # then
+    assert created == [tmp_path / "OSPS3.pdf"]
+    assert "/XObject" in PdfReader(str(created[0])).pages[0]["/Resources"]
+    output = capsys.readouterr().out
+    assert f"No valid words found for {tmp_path / 'OSPS2.pdf'}" in output
+    assert output.count("Created") == 1
+    with pytest.raises(ValueError):
+        render_in_process(tmp_path, "osps", renderer="table")
+
+
+def test_stream_pdf_reports_stats(tmp_path):
+    # given
+    extensions_file = tmp_path / "3_letter_extensions.txt"
+    with open(extensions_file, "w", encoding="utf-8") as f:
+        for i in range(ROWS_PER_PAGE + 5):
+            f.write("B,L,Ł ABO M,Ś\n")
+    output_file = tmp_path / "OSPS3.pdf"
+
+    # when
+    stats = stream_pdf(extensions_file, output_file, 3, "osps")
+
+    # then
+    assert stats.rows == ROWS_PER_PAGE + 5
+    assert stats.pages == 2
+    assert stats.peak_rss_mb > 0
+    assert count_pages(output_file) == 2
+
+
+def test_streaming_canvas_compresses_pages_as_they_close(tmp_path):
+    """Test that finished pages are compressed early; fails if reportlab's page internals change."""
+    # given
+    pdf = _open_streaming_canvas(tmp_path / "OSPS3.pdf")
+    pdf.drawString(100, 100, "ABO")
+
+    # when
+    pdf.showPage()
+
+    # then
+    page = pdf._doc.Pages.pages[-1]
+    assert page.stream is None
+    assert page.Contents.dictionary["Filter"] == "/FlateDecode"
+    pdf.save()
+    assert count_pages(tmp_path / "OSPS3.pdf") == 1
+
+
+def test_render_rows_memory_does_not_grow_with_pages(tmp_path):
+    """Test that the peak for a long list stays within a constant of the peak for a short one.
+
+    Without chunks reportlab keeps every page until save(): about 5 KB of
+    Python objects per page, over 300 KB for the 60 extra pages here.
+    """
+    # given
+    def peak_for(pages: int) -> int:
+        rows = (["B,L,Ł", f"AB{letter}", "M,Ś"] for letter in itertools.islice(itertools.cycle("AĄBCĆ"),
+                                                                              pages * ROWS_PER_PAGE))
+        tracemalloc.start()
+        try:
+            render_rows(rows, tmp_path / "OSPS3.pdf", chunk_pages=20)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    peak_for(25)   # warm up font registration, pypdf imports and caches
+
+    # when
+    short, long = peak_for(20), peak_for(80)
+
+    # then
+    assert count_pages(tmp_path / "OSPS3.pdf") == 80
+    assert long - short < 128 * 1024
+
+
+def write_extensions(extensions_file: Path, rows: int):
+    with open(extensions_file, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            f.write("B,L,Ł ABO M,Ś\n")
+
+
+def test_plan_shards_is_page_aligned(tmp_path):
+    # given
+    extensions_file = tmp_path / "3_letter_extensions.txt"
+    write_extensions(extensions_file, ROWS_PER_PAGE * 5 + 1)
+    line_bytes = len("B,L,Ł ABO M,Ś\n".encode("utf-8"))
+
+    # when
+    shards = plan_shards(extensions_file, tmp_path / "OSPS3.pdf", 3, shard_pages=2)
+
+    # then
+    assert [(job.offset, job.lines) for job in shards] == [
+        (0, ROWS_PER_PAGE * 2),
+        (ROWS_PER_PAGE * 2 * line_bytes, ROWS_PER_PAGE * 2),
+        (ROWS_PER_PAGE * 4 * line_bytes, None),
+    ]
+
+
+def write_numbered_words(extensions_file: Path, rows: int):
+    """Write distinct 3-letter words, so each page's rows can be told apart."""
+    letters = "ABCDEFGHIJKLMNOPRSTUWYZ"
+    words = [a + b + c for a in letters for b in letters for c in letters][:rows]
+    extensions_file.write_text("".join(f"B {word} \n" for word in words), encoding="utf-8")
+    return words
+
+
+def test_build_pdfs_concatenates_shards(tmp_path):
+    """Test shards read from their own offsets, concatenated in order with one copy of the font."""
+    # given
+    large_file = tmp_path / "3_letter_extensions.txt"
+    small_file = tmp_path / "2_letter_extensions.txt"
+    words = write_numbered_words(large_file, ROWS_PER_PAGE * 3 + 1)
+    small_file.write_text(" AA \n", encoding="utf-8")
+    targets = [(small_file, tmp_path / "OSPS2.pdf", 2), (large_file, tmp_path / "OSPS3.pdf", 3)]
+
+    # when
+    created = build_pdfs(targets, workers=2, shard_pages=1)
+
+    # then
+    assert created == [tmp_path / "OSPS2.pdf", tmp_path / "OSPS3.pdf"]
+    assert count_pages(tmp_path / "OSPS2.pdf") == 1
+    assert count_pages(tmp_path / "OSPS3.pdf") == 4
+    assert not list(tmp_path.glob("*.part*.pdf"))
+    pages = PdfReader(str(tmp_path / "OSPS3.pdf")).pages
+    for number, page in enumerate(pages):
+        text = page.extract_text()
+        assert words[number * ROWS_PER_PAGE] in text and words[number * ROWS_PER_PAGE - 1] not in text
+    assert (tmp_path / "OSPS3.pdf").read_bytes().count(b"/FontFile2") == 1
+
+
+def test_render_rows_joins_chunks_in_order(tmp_path):
+    """Test that a list longer than one chunk is joined page by page with a single font copy."""
+    # given
+    extensions_file = tmp_path / "3_letter_extensions.txt"
+    words = write_numbered_words(extensions_file, ROWS_PER_PAGE * 4 + 1)
+
+    # when
+    rows, pages = render_rows(iter_extension_rows(extensions_file, 3), tmp_path / "OSPS3.pdf", chunk_pages=2)
+
+    # then
+    assert (rows, pages) == (ROWS_PER_PAGE * 4 + 1, 5)
+    texts = [page.extract_text() for page in PdfReader(str(tmp_path / "OSPS3.pdf")).pages]
+    assert [words[number * ROWS_PER_PAGE] in text for number, text in enumerate(texts)] == [True] * 5
+    assert (tmp_path / "OSPS3.pdf").read_bytes().count(b"/FontFile2") == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["3_letter_extensions.txt", "OSPS3.pdf"]
+
+
+def test_build_pdfs_shards_with_compact_renderer(tmp_path):
+    # given
+    extensions_file = tmp_path / "3_letter_extensions.txt"
+    write_extensions(extensions_file, COMPACT_ROWS_PER_BAND * 2 * 3)
+
+    # when
+    created = build_pdfs([(extensions_file, tmp_path / "OSPS3.pdf", 3)], workers=1, shard_pages=1,
+                         renderer="compact")
+
+    # then
+    assert created == [tmp_path / "OSPS3.pdf"]
+    assert count_pages(created[0]) == 3
+    assert created[0].read_bytes().count(b"/FontFile2") == 1
+
+
+def test_text_width_follows_the_registered_font(monkeypatch):
+    """Test that cached widths are not reused after another font is registered under the same name."""
+    # given
+    fonts.register_font()
+    width = _text_width("ŁĄKA")
+    vera = Path(reportlab.__file__).parent / "fonts" / "Vera.ttf"
+
+    # when
+    monkeypatch.setitem(pdfmetrics._fonts, fonts.FONT_NAME, TTFont(fonts.FONT_NAME, str(vera)))
+    monkeypatch.setattr(fonts, "_registered", vera)
+
+    # then
+    assert _text_width("ŁĄKA") == pdfmetrics.stringWidth("ŁĄKA", fonts.FONT_NAME, 1) != width
+
+
+def test_parallel_honours_renderer():
+    # when
+    parallel = parse_args(["--parallel"])
+    compact = parse_args(["--parallel", "--renderer", "compact"])
+    serial = parse_args([])
+
+    # then
+    assert (parallel.renderer, compact.renderer, serial.renderer) == ("stream", "compact", "table")
+    with pytest.raises(SystemExit):
+        parse_args(["--parallel", "--renderer", "table"])
+    assert parse_args(["--in-process"]).renderer == "stream"
+    assert parse_args(["--in-process", "--renderer", "compact"]).renderer == "compact"
+    with pytest.raises(SystemExit):
+        parse_args(["--in-process", "--renderer", "table"])
+    with pytest.raises(SystemExit):
+        parse_args(["--in-process", "--parallel"])
+
+
+def test_compact_pdf_shares_frame_and_reports_previous_file(tmp_path):
+    """Test that compact pages reference one frame form per page shape and report the replaced PDF."""
+    # given
+    extensions_file = tmp_path / "3_letter_extensions.txt"
+    write_extensions(extensions_file, COMPACT_ROWS_PER_BAND * 4 + 1)
+    output_file = tmp_path / "OSPS3.pdf"
+    stream_pdf(extensions_file, output_file, 3, "osps")
+    standard_size = output_file.stat().st_size
+
+    # when
+    stats = compact_pdf(extensions_file, output_file, 3, "osps", columns=2)
+
+    # then
+    assert stats.rows == COMPACT_ROWS_PER_BAND * 4 + 1
+    assert stats.pages == 3
+    assert (stats.previous_pages, stats.previous_size) == (-(-stats.rows // ROWS_PER_PAGE), standard_size)
+    assert stats.size < standard_size
+    pages = PdfReader(str(output_file)).pages
+    frames = [list(page["/Resources"]["/XObject"]) for page in pages]
+    assert frames[0] == frames[1] == [f"/FormXob.frame{COMPACT_ROWS_PER_BAND}_{COMPACT_ROWS_PER_BAND}"]
+    assert frames[2] == ["/FormXob.frame1_0"]
+    assert all(page["/Contents"].get_object()["/Filter"] == "/FlateDecode" for page in pages)
@@ -0,0 +1,94 @@
+import pytest
+from pathlib import Path
+from src.generate_extensions import generate_all_extensions
+from src.hook_index import (
+    HookIndex, Hooks, build_hook_index_from_extensions, hooks_mask, mask_letters, INDEX_NAME,
+)
+
+
+@pytest.fixture
+def extensions_dir(tmp_path):
+    # given
+    extensions_dir = tmp_path / "extensions"
+    extensions_dir.mkdir()
+    (extensions_dir / "3_letter_extensions.txt").write_text(
+        " AAA \nB,L,Ł,Ż ABO \nB,C,D,L,P,R,T,Ł,Ż ABY M,Ś\n", encoding="utf-8")
+    (extensions_dir / "4_letter_extensions.txt").write_text(" ŻABA \nS KOTA \n", encoding="utf-8")
+    return extensions_dir
+
+
+def test_hooks_mask_round_trip():
+    """Test packing hook letters into a 32-bit mask and back in Polish order."""
+    # when
+    mask = hooks_mask(["Ż", "A", "Ł", "L"])
+
+    # then
+    assert mask == (1 << 0) | (1 << 14) | (1 << 15) | (1 << 31)
+    assert mask_letters(mask) == "ALŁŻ"
+
+
+def test_hook_index_lookups(extensions_dir):
+    """Test single lookups against an index built from extensions files."""
+    # given
+    index_file = build_hook_index_from_extensions(extensions_dir)
+
+    # when
+    with HookIndex(index_file) as index:
+        # then
+        assert index_file == extensions_dir / INDEX_NAME
+        assert len(index) == 5
+        assert index.hooks("aby") == Hooks("BCDLŁPRTŻ", "MŚ")
+        assert index.hooks("ABO") == Hooks("BLŁŻ", "")
+        assert index.hooks("AAA") == Hooks("", "")
+        assert index.hooks("ŻABA") == Hooks("", "")
+        assert index.hooks("KOT") is None
+        assert index.hooks("QUA") is None
+        assert "kota" in index
+
+
+def test_hook_index_keeps_hooks_outside_the_alphabet(extensions_dir):
+    """Test that words and hooks with Q, V or X are answered in full from the foreign table."""
+    # given
+    (extensions_dir / "5_letter_extensions.txt").write_text(" CARDO X\n KARTA \n", encoding="utf-8")
+    (extensions_dir / "3_letter_extensions.txt").write_text(" AAA \n VAT O\n", encoding="utf-8")
+
+    # when
+    with HookIndex(build_hook_index_from_extensions(extensions_dir)) as index:
+        single = [index.hooks(word) for word in ["cardo", "VAT", "KARTA"]]
+        batch = index.batch_hooks(["cardo", "VAT", "KARTA"])
+        length, contained = len(index), "vat" in index
+
+    # then
+    assert single == batch == [Hooks("", "X"), Hooks("", "O"), Hooks("", "")]
+    assert contained and length == 6
+
+
+def test_hook_index_batch_hooks(extensions_dir):
+    """Test that batch lookups agree with single lookups, including misses."""
+    # given
+    words = ["ABY", "kota", "xyz", "", "ABO", "ŻABA", "ŻABY", "AAA"]
+
+    # when
+    with HookIndex(build_hook_index_from_extensions(extensions_dir)) as index:
+        batch = index.batch_hooks(words)
+        single = [index.hooks(word) for word in words]
+
+    # then
+    assert batch == single
+    assert batch[1] == Hooks("S", "")
+    assert batch[2] is None
+
+
+def test_generate_all_extensions_writes_index(tmp_path):
+    """Test that the extensions stage writes the hook index next to the text files."""
+    # given
+    (tmp_path / "3_letter_words.txt").write_text("kot\npies\n", encoding="utf-8")
+    (tmp_path / "4_letter_words.txt").write_text("kota\nkoty\nskot\n", encoding="utf-8")
+
+    # when
+    generate_all_extensions(tmp_path, workers=1)
+
+    # then
+    with HookIndex(tmp_path / "extensions" / INDEX_NAME) as index:
+        assert index.hooks("KOT") == Hooks("S", "AY")
+        assert index.hooks("KOTA") is None
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import pytest
+from src.hook_client import HookClient
+from src.hook_index import INDEX_NAME
+from src.hook_server import HookServer, load_indexes
+
+
+@pytest.fixture
+def server_port(tmp_path):
+    # given - extensions files for both dictionaries and a server on a free port
+    for dict_name, lines in [("osps", "B,L,Ł,Ż ABO \nB,C ABY M,Ś\n"), ("sjp", " ABO \n")]:
+        extensions_dir = tmp_path / dict_name / "extensions"
+        extensions_dir.mkdir(parents=True)
+        (extensions_dir / "3_letter_extensions.txt").write_text(lines, encoding="utf-8")
+    (tmp_path / "sjp" / "extensions" / "5_letter_extensions.txt").write_text(" CARDO X\n VOXEL \n", encoding="utf-8")
+    hook_server = HookServer(load_indexes(tmp_path))
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(hook_server.start("127.0.0.1", 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server.sockets[0].getsockname()[1]
+
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+
+
+def test_single_lookup(server_port):
+    # when
+    with HookClient("127.0.0.1", server_port) as client:
+        osps = client.hooks("aby", "osps")
+        sjp = client.hooks("ABO", "sjp")
+        missing = client.hooks("KOT", "osps")
+
+    # then
+    assert osps == {"dict": "osps", "word": "ABY", "found": True, "left": "BC", "right": "MŚ"}
+    assert sjp["found"] and sjp["left"] == ""
+    assert not missing["found"]
+
+
+def test_batch_lookup_and_stats(server_port):
+    # when
+    with HookClient("127.0.0.1", server_port) as client:
+        results = client.batch_hooks(["ABO", "ABY", "XYZ"], "osps")
+        stats = client.stats()
+
+    # then
+    assert [(result["word"], result["found"], result["left"]) for result in results] == [
+        ("ABO", True, "BLŁŻ"), ("ABY", True, "BC"), ("XYZ", False, ""),
+    ]
+    assert stats["counters"]["route:batch"] == 1
+    assert stats["counters"]["words"] == 3
+    assert stats["latency_ms"]["p99"] >= stats["latency_ms"]["p50"] >= 0
+
+
+def test_unknown_dictionary_is_rejected(server_port):
+    # when/then
+    with HookClient("127.0.0.1", server_port) as client:
+        with pytest.raises(ValueError, match="400"):
+            client.hooks("ABO", "wikipedia")
+
+
+def test_batch_with_non_string_words_is_rejected(server_port):
+    # when/then - the server answers 400 and keeps the connection usable
+    with HookClient("127.0.0.1", server_port) as client:
+        with pytest.raises(ValueError, match="400.*list of strings"):
+            client.batch_hooks(["ABO", 5], "osps")
+        assert client.hooks("ABO", "osps")["found"]
+
+
+def test_words_and_hooks_with_foreign_letters(server_port):
+    """Test that SJP words and hooks with Q, V or X are answered in full."""
+    # when
+    with HookClient("127.0.0.1", server_port) as client:
+        cardo = client.hooks("cardo", "sjp")
+        results = client.batch_hooks(["CARDO", "VOXEL"], "sjp")
+
+    # then
+    assert cardo == {"dict": "sjp", "word": "CARDO", "found": True, "left": "", "right": "X"}
+    assert [(result["found"], result["right"]) for result in results] == [(True, "X"), (True, "")]
+
+
+def test_outdated_index_is_rebuilt(tmp_path):
+    # given - an index in the format without the foreign table
+    extensions_dir = tmp_path / "sjp" / "extensions"
+    extensions_dir.mkdir(parents=True)
+    (extensions_dir / "5_letter_extensions.txt").write_text(" CARDO X\n", encoding="utf-8")
+    (extensions_dir / INDEX_NAME).write_bytes(b"PRZHOOK1" + bytes(4))
+
+    # when
+    indexes = load_indexes(tmp_path)
+
+    # then
+    assert indexes["sjp"].hooks("CARDO").right == "X"
+    indexes["sjp"].close()
@@ -0,0 +1,61 @@
+from src.hook_index import INDEX_NAME, hooks_mask, write_hook_index
+from src.hook_statistics import length_statistics, study_order, write_statistics
+
+
+def test_length_statistics(make_section):
+    """Test hook counts, rarity ranking, letter tables and hooks missing from the other dictionary."""
+    # given
+    own = make_section([("ALA", "", "N"), ("KOT", "S", "AY"), ("ŁAD", "", "A"), ("ŻAL", "", "")])
+    other = make_section([("KOT", "S", "A"), ("ŁAD", "", "")])
+
+    # when
+    stats = length_statistics(3, own, other)
+
+    # then
+    assert stats.hooks.tolist() == [1, 3, 1, 0]
+    # N is rarer than A as a right hook, so ALA ranks above ŁAD; ŻAL has no hooks
+    assert study_order(stats).tolist() == [1, 0, 2]
+    assert stats.right_only.tolist() == [hooks_mask("N"), hooks_mask("Y"), hooks_mask("A"), 0]
+    assert stats.left_letters[0] == 0 and stats.right_letters[0] == 2   # A
+    assert stats.word_letters[0] == 4                                    # A in ALA (twice), ŁAD, ŻAL
+
+
+def test_write_statistics(base_dir):
+    """Test the study list, letter table and summary written for each dictionary."""
+    # when
+    created = write_statistics(base_dir)
+
+    # then
+    output_dir = base_dir / "osps" / "statistics"
+    assert output_dir / "summary.tsv" in created and base_dir / "sjp" / "statistics" / "summary.tsv" in created
+    assert (output_dir / "3_letter_study.tsv").read_text(encoding="utf-8") == (
+        "rank\tword\thooks\tscore\tleft\tright\tleft_only\tright_only\n"
+        "1\tKOT\t2\t2.0\tS\tA\t\t\n"
+        "2\tALA\t1\t1.0\t\tN\t\tN\n"
+    )
+    letters = (output_dir / "3_letter_letters.tsv").read_text(encoding="utf-8").splitlines()
+    assert "S\t0\t1\t0" in letters and "K\t1\t0\t0" in letters
+    summary = (output_dir / "summary.tsv").read_text(encoding="utf-8").splitlines()
+    assert summary[1] == "3\t3\t2\t1.0\t2\t1\t2\t1\t1"
+
+
+def test_write_statistics_marks_lengths_not_compared(tmp_path):
+    """Test that own hooks are marked not compared when the other index has no section for the length."""
+    # given: SJP has no 4-letter section, as when its 5-letter list is missing
+    write_hook_index(tmp_path / "sjp" / "extensions" / INDEX_NAME, {3: (["KOT"], [0], [hooks_mask("A")])})
+    write_hook_index(tmp_path / "osps" / "extensions" / INDEX_NAME, {
+        3: (["KOT"], [0], [hooks_mask("AY")]),
+        4: (["KOTA"], [hooks_mask("S")], [0]),
+    })
+
+    # when
+    write_statistics(tmp_path)
+
+    # then
+    output_dir = tmp_path / "osps" / "statistics"
+    study_3 = (output_dir / "3_letter_study.tsv").read_text(encoding="utf-8").splitlines()
+    study_4 = (output_dir / "4_letter_study.tsv").read_text(encoding="utf-8").splitlines()
+    assert study_3[1] == "1\tKOT\t2\t0.0\t\tAY\t\tY"
+    assert study_4[1] == "1\tKOTA\t1\t0.0\tS\t\t-\t-"
+    summary = (output_dir / "summary.tsv").read_text(encoding="utf-8").splitlines()
+    assert summary[1].endswith("\t1\t1") and summary[2].endswith("\t-\t-")
@@ -0,0 +1,113 @@
+import pytest
+from pathlib import Path
+from src.generate_extensions import generate_all_extensions
+from src.hook_index import HookIndex, Hooks
+from src.incremental import update_dictionary, collect_hooks, load_manifest
+
+
+def write_words(dict_dir, length, words):
+    with open(dict_dir / f"{length}_letter_words.txt", "w", encoding="utf-8") as f:
+        f.writelines(f"{word}\n" for word in words)
+
+
+@pytest.fixture
+def built_dictionary(tmp_path):
+    # given - a previous full build
+    dict_dir = tmp_path / "osps"
+    dict_dir.mkdir()
+    write_words(dict_dir, 3, ["kot", "pie", "sok"])
+    write_words(dict_dir, 4, ["kota", "koty", "skot"])
+    generate_all_extensions(dict_dir, workers=1)
+    return dict_dir
+
+
+def test_collect_hooks_only_for_targets():
+    """Test that hooks are collected only for the requested base words."""
+    # when
+    left_hooks, right_hooks = collect_hooks(["KOTA", "KOTY", "SKOT", "SOKI"], {"KOT"})
+
+    # then
+    assert left_hooks == {"KOT": ["S"]}
+    assert right_hooks == {"KOT": ["A", "Y"]}
+
+
+def test_update_dictionary_matches_full_rebuild(built_dictionary, tmp_path):
+    """Test that an incremental update produces the same files as a full rebuild."""
+    # given - a new source list adding SOKI and removing KOTY
+    source_file = built_dictionary / "osps.txt"
+    source_file.write_text("kot\npie\nsok\nkota\nskot\nsoki\n", encoding="utf-8")
+
+    # when
+    report = update_dictionary(built_dictionary, source_file, render_pdfs=False)
+
+    # then
+    assert report["words"] == ["4_letter_words.txt"]
+    assert report["extensions"] == ["3_letter_extensions.txt"]
+    rebuilt_dir = tmp_path / "rebuilt"
+    rebuilt_dir.mkdir()
+    write_words(rebuilt_dir, 3, ["kot", "pie", "sok"])
+    write_words(rebuilt_dir, 4, ["kota", "skot", "soki"])
+    generate_all_extensions(rebuilt_dir, workers=1)
+    for name in ["3_letter_extensions.txt"]:
+        assert (built_dictionary / "extensions" / name).read_text(encoding="utf-8") == \
+            (rebuilt_dir / "extensions" / name).read_text(encoding="utf-8")
+    assert (built_dictionary / "4_letter_words.txt").read_text(encoding="utf-8") == "kota\nskot\nsoki\n"
+
+
+def test_update_dictionary_refreshes_records_and_hook_index(tmp_path):
+    """Test that TSV records and the hook index are updated along with the text extensions."""
+    # given - a previous build with both formats
+    dict_dir = tmp_path / "osps"
+    dict_dir.mkdir()
+    write_words(dict_dir, 3, ["kot", "pie", "sok"])
+    write_words(dict_dir, 4, ["kota", "skot"])
+    generate_all_extensions(dict_dir, workers=1, formats=("text", "tsv"))
+    source_file = dict_dir / "osps.txt"
+    source_file.write_text("kot\npie\nsok\nkota\nkoty\nskot\npies\n", encoding="utf-8")
+
+    # when
+    update_dictionary(dict_dir, source_file, render_pdfs=False)
+
+    # then
+    assert (dict_dir / "extensions" / "3_letter_extensions.tsv").read_text(encoding="utf-8") == \
+        "S\tKOT\tAY\n\tPIE\tS\n\tSOK\t\n"
+    with HookIndex(dict_dir / "extensions" / "hooks.idx") as index:
+        assert index.hooks("PIE") == Hooks("", "S")
+        assert index.hooks("KOT") == Hooks("S", "AY")
+
+
+def test_update_dictionary_renders_only_pdfs_whose_extensions_changed(tmp_path):
+    """Test that a 2-letter change renders OSPS2.pdf and leaves the absent OSPS3.pdf alone."""
+    # given - a previous build without PDFs or manifest
+    dict_dir = tmp_path / "osps"
+    dict_dir.mkdir()
+    write_words(dict_dir, 2, ["as", "to"])
+    write_words(dict_dir, 3, ["kot", "tom"])
+    write_words(dict_dir, 4, ["kota"])
+    generate_all_extensions(dict_dir, workers=1)
+    source_file = dict_dir / "osps.txt"
+    source_file.write_text("as\nko\nto\nkot\ntom\nkota\n", encoding="utf-8")
+
+    # when
+    report = update_dictionary(dict_dir, source_file, renderer="canvas")
+
+    # then
+    assert report["extensions"] == ["2_letter_extensions.txt"]
+    assert report["pdfs"] == ["OSPS2.pdf"]
+    assert (dict_dir / "OSPS2.pdf").read_bytes().startswith(b"%PDF")
+    assert not (dict_dir / "OSPS3.pdf").exists()
+
+
+def test_update_dictionary_skips_unchanged_source(built_dictionary):
+    """Test that a second run with the same source does nothing."""
+    # given
+    source_file = built_dictionary / "osps.txt"
+    source_file.write_text("kot\npie\nsok\nkota\nkoty\nskot\n", encoding="utf-8")
+    update_dictionary(built_dictionary, source_file, render_pdfs=False)
+
+    # when
+    report = update_dictionary(built_dictionary, source_file, render_pdfs=False)
+
+    # then
+    assert report == {"words": [], "extensions": [], "pdfs": []}
+    assert load_manifest(built_dictionary)["source"] is not None
@@ -0,0 +1,114 @@
+import csv
+import json
+import pytest
+from src.metrics import METRICS, MetricsRecorder, PhaseRecord, peak_rss_mb, profile_calls, profiling, reset_peak_rss
+from src.word_splitter import split_words_by_length
+
+
+def test_phases_nest_and_carry_labels():
+    """Test that nested phases are recorded with their path, labels and counts."""
+    # given
+    recorder = MetricsRecorder()
+
+    # when
+    with recorder.labels(dict_name="osps"), recorder.phase("extensions"):
+        with recorder.phase("write", length=3, lines=2) as counts:
+            counts["pages"] = 1
+
+    # then
+    inner, outer = recorder.records
+    assert (inner.phase, inner.dict_name, inner.length, inner.counts) == \
+        ("extensions/write", "osps", 3, {"lines": 2, "pages": 1})
+    assert (outer.phase, outer.dict_name, outer.length) == ("extensions", "osps", None)
+    assert outer.seconds >= inner.seconds and inner.peak_rss_mb > 0
+
+
+@pytest.mark.skipif(reset_peak_rss() is None, reason="needs a resettable RSS high-water mark (Linux)")
+def test_phases_record_their_own_peak():
+    """Test that a phase after a memory-hungry one does not inherit its peak."""
+    # given
+    recorder = MetricsRecorder()
+
+    # when
+    with recorder.phase("outer"):
+        with recorder.phase("big"):
+            buffer = bytearray(64 * 1024 * 1024)
+            buffer[::4096] = b"x" * len(buffer[::4096])
+            del buffer
+        with recorder.phase("small"):
+            pass
+
+    # then
+    big, small, outer = recorder.records
+    assert big.peak_rss_mb - small.peak_rss_mb > 48
+    assert outer.peak_rss_mb >= big.peak_rss_mb
+    assert peak_rss_mb() >= big.peak_rss_mb
+
+
+def test_adopt_nests_worker_records_under_open_phase():
+    """Test that phases sent back by a worker are recorded under the phase that ran the pool."""
+    # given
+    recorder = MetricsRecorder()
+    worker = PhaseRecord("write", None, 3, 0.5, 20.0, {"lines": 2})
+
+    # when
+    with recorder.labels(dict_name="osps"), recorder.phase("extensions"), recorder.phase("pool"):
+        recorder.adopt([worker])
+
+    # then
+    assert [(record.phase, record.dict_name, record.length) for record in recorder.records] == [
+        ("extensions/pool/write", "osps", 3), ("extensions/pool", "osps", None), ("extensions", "osps", None)]
+
+
+def test_write_report_json_and_csv(tmp_path):
+    """Test writing the recorded phases as JSON and CSV."""
+    # given
+    recorder = MetricsRecorder()
+    with recorder.phase("read", words=5):
+        pass
+
+    # when
+    recorder.write_report(tmp_path / "metrics.json")
+    recorder.write_report(tmp_path / "metrics.csv")
+
+    # then
+    phases = json.loads((tmp_path / "metrics.json").read_text())["phases"]
+    assert [(row["phase"], row["words"]) for row in phases] == [("read", 5)]
+    with open(tmp_path / "metrics.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [(row["phase"], row["words"], row["lines"]) for row in rows] == [("read", "5", "")]
+
+
+def test_split_words_by_length_records_phases(tmp_path):
+    """Test that the splitter reports its read, sort and write phases per length."""
+    # given
+    input_file = tmp_path / "words.txt"
+    input_file.write_text("kot\npies\nmysz\nas\n", encoding="utf-8")
+    METRICS.reset()
+
+    # when
+    split_words_by_length(input_file, tmp_path)
+
+    # then
+    recorded = {(record.phase, record.length): record.counts for record in METRICS.records}
+    assert recorded[("read", None)] == {"words": 4}
+    assert recorded[("sort", 4)] == {"words": 2}
+    assert recorded[("write", 2)] == {"lines": 1}
+    METRICS.reset()
+
+
+def test_profiling_dumps_only_wrapped_calls(tmp_path):
+    """Test that --profile output covers the wrapped function."""
+    # given
+    def hot_function():
+        return sum(range(1000))
+
+    # when
+    with profiling(tmp_path / "stage.prof") as profiler:
+        assert profile_calls(hot_function, profiler)() == 499500
+
+    # then
+    assert (tmp_path / "stage.prof").exists()
+    assert "hot_function" in (tmp_path / "stage.txt").read_text()
+    with profiling(None) as profiler:
+        assert profile_calls(hot_function, profiler) is hot_function
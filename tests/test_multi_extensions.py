@@ -0,0 +1,51 @@
+import pytest
+from pathlib import Path
+from src.multi_extensions import Dawg, WordIndex, generate_multi_extensions, MULTI_DIR_NAME
+
+
+WORDS = ["KOT", "KOTA", "KOTY", "SKOT", "SKOTA", "KOTKA", "KROT", "KOOT", "OKOTY", "ŁKOT", "ZAKOT"]
+
+
+def test_dawg_membership_and_minimization():
+    """Test that the DAWG accepts exactly the input words and shares suffixes."""
+    # when
+    dawg = Dawg.build(["KOTA", "LOTA", "ROTA", "KOT"])
+
+    # then
+    assert all(word in dawg for word in ["KOTA", "LOTA", "ROTA", "KOT"])
+    assert "LOT" not in dawg and "KOTY" not in dawg and "" not in dawg
+    # "OTA" is shared by all three four-letter words: root + K/L/R branches + O,T,A chain
+    assert dawg.node_count < 1 + 3 * 4
+
+
+def test_multi_letter_extensions():
+    """Test k-letter front/back, wrap and interior-insertion extensions."""
+    # given
+    index = WordIndex(WORDS)
+
+    # when/then
+    assert index.back_extensions("KOT", 1) == ["A", "Y"]
+    assert index.back_extensions("KOT", 2) == ["KA"]
+    assert index.front_extensions("KOT", 1) == ["Ł", "S"]
+    assert index.front_extensions("KOT", 2) == ["ZA"]
+    assert index.wrap_extensions("KOT", 2) == ["OKOTY", "SKOTA"]
+    assert index.insertions("KOT") == ["KOOT", "KROT"]
+
+
+def test_generate_multi_extensions(tmp_path):
+    """Test that multi-letter extension files are written next to the dictionary."""
+    # given
+    for length in {len(word) for word in WORDS}:
+        words = [word for word in WORDS if len(word) == length]
+        (tmp_path / f"{length}_letter_words.txt").write_text("\n".join(words) + "\n", encoding="utf-8")
+
+    # when
+    stats = generate_multi_extensions(tmp_path, ks=[2])
+
+    # then
+    output_dir = tmp_path / MULTI_DIR_NAME
+    assert (output_dir / "3_letter_k2_extensions.txt").read_text(encoding="utf-8") == "ZA KOT KA\n"
+    assert (output_dir / "3_letter_k2_wraps.txt").read_text(encoding="utf-8") == "KOT OKOTY,SKOTA\n"
+    assert (output_dir / "3_letter_insertions.txt").read_text(encoding="utf-8") == "KOT KOOT,KROT\n"
+    assert stats["words"] == len(WORDS)
+    assert stats["forward_nodes"] > 0 and stats["build_seconds"] >= 0
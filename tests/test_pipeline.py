@@ -0,0 +1,85 @@
+import pytest
+from src.hook_index import HookIndex, Hooks
+from src.pipeline import STATE_NAME, plan_dictionary, run_pipeline
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    # given
+    dict_dir = tmp_path / "osps"
+    dict_dir.mkdir()
+    (dict_dir / "osps.txt").write_text("kot\nkota\nskot\npies\nżal\nżale\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_pipeline_builds_and_skips_unchanged(base_dir):
+    """Test a full build followed by a no-change rebuild that runs nothing."""
+    # given
+    nodes = plan_dictionary(base_dir, "osps", pdfs=False)
+
+    # when
+    first = run_pipeline(nodes, base_dir / STATE_NAME, workers=2)
+    second = run_pipeline(nodes, base_dir / STATE_NAME, workers=2)
+
+    # then
+    assert len(first["run"]) == len(nodes) and first["skipped"] == []
+    assert second["run"] == [] and len(second["skipped"]) == len(nodes)
+    assert (base_dir / "osps" / "extensions" / "3_letter_extensions.txt").read_text(encoding="utf-8") == \
+        "S KOT A\n ŻAL E\n"
+    assert (base_dir / "osps" / "extensions" / "hooks.idx").exists()
+
+
+def test_pipeline_reruns_only_affected_nodes(base_dir):
+    """Test that a new 5-letter word re-renders only the PDF whose extensions file changed."""
+    # given
+    nodes = plan_dictionary(base_dir, "osps", renderer="canvas")
+    run_pipeline(nodes, base_dir / STATE_NAME, workers=1)
+    with open(base_dir / "osps" / "osps.txt", "a", encoding="utf-8") as f:
+        f.write("skoty\n")
+
+    # when
+    report = run_pipeline(nodes, base_dir / STATE_NAME, workers=1)
+
+    # then
+    assert sorted(report["run"]) == ["extensions:osps", "pdf:osps:4", "split:osps"]
+    assert (base_dir / "osps" / "extensions" / "4_letter_extensions.txt").read_text(encoding="utf-8") == \
+        " KOTA \n PIES \n SKOT Y\n ŻALE \n"
+
+
+def test_pipeline_rebuilds_touched_output_and_force(base_dir):
+    """Test that a modified output is rebuilt and --force reruns everything."""
+    # given
+    nodes = plan_dictionary(base_dir, "osps", pdfs=False)
+    run_pipeline(nodes, base_dir / STATE_NAME, workers=1)
+    (base_dir / "osps" / "extensions" / "3_letter_extensions.txt").write_text("edited\n", encoding="utf-8")
+
+    # when
+    report = run_pipeline(nodes, base_dir / STATE_NAME, workers=1)
+    forced = run_pipeline(nodes, base_dir / STATE_NAME, workers=1, force=True)
+
+    # then
+    assert report["run"] == ["extensions:osps"]
+    assert len(forced["run"]) == len(nodes)
+
+
+def test_pipeline_keeps_records_and_hook_index_current(base_dir):
+    """Test that TSV records and hooks.idx are rewritten with the text files, and a stale TSV is removed."""
+    # given
+    run_pipeline(plan_dictionary(base_dir, "osps", pdfs=False, formats=("text", "tsv")), base_dir / STATE_NAME)
+    with open(base_dir / "osps" / "osps.txt", "a", encoding="utf-8") as f:
+        f.write("koty\n")
+
+    # when
+    run_pipeline(plan_dictionary(base_dir, "osps", pdfs=False, formats=("text", "tsv")), base_dir / STATE_NAME)
+
+    # then
+    records_file = base_dir / "osps" / "extensions" / "3_letter_extensions.tsv"
+    assert records_file.read_text(encoding="utf-8") == "S\tKOT\tAY\n\tŻAL\tE\n"
+    with HookIndex(base_dir / "osps" / "extensions" / "hooks.idx") as index:
+        assert index.hooks("KOT") == Hooks("S", "AY")
+
+    # when - back to text only
+    run_pipeline(plan_dictionary(base_dir, "osps", pdfs=False), base_dir / STATE_NAME)
+
+    # then
+    assert not records_file.exists()
@@ -0,0 +1,67 @@
+import pytest
+from src.generate_extensions import generate_all_extensions
+from src.vectorized_extensions import compute_hook_masks, format_mask_lines
+from src.hook_index import HookIndex, Hooks
+
+
+def test_compute_hook_masks():
+    """Test hook masks found by joining encoded N+1 words against the base words."""
+    # given
+    words = ["KOT", "ŻAL"]
+    extended_words = ["KOTA", "KOTY", "SKOT", "ŻALE"]
+
+    # when
+    left_masks, right_masks, foreign_hooks = compute_hook_masks(words, extended_words)
+
+    # then
+    assert format_mask_lines(words, left_masks, right_masks) == ["S KOT A,Y\n", " ŻAL E\n"]
+    assert format_mask_lines(words, left_masks, right_masks, extensions_format="tsv") == ["S\tKOT\tAY\n", "\tŻAL\tE\n"]
+    assert foreign_hooks == {}
+
+
+def test_compute_hook_masks_foreign_letters():
+    """Test that words touching letters outside the alphabet get dict-engine lines."""
+    # given
+    words = ["IDEO", "KOTA", "VIDE"]
+    extended_words = ["KOTAX", "SKOTA", "VIDEO"]
+
+    # when
+    left_masks, right_masks, foreign_hooks = compute_hook_masks(words, extended_words)
+
+    # then
+    assert foreign_hooks == {0: (["V"], []), 1: (["S"], ["X"]), 2: ([], ["O"])}
+    assert list(left_masks) == [0, 1 << 23, 0]
+    assert format_mask_lines(words, left_masks, right_masks, foreign_hooks) == ["V IDEO \n", "S KOTA X\n", " VIDE O\n"]
+
+
+def test_compute_hook_masks_unsorted_input():
+    """Test that unsorted or duplicated words are left to the dict engine."""
+    # then
+    assert compute_hook_masks(["KOT", "ASY"], []) is None
+    assert compute_hook_masks(["KOT", "KOT"], ["KOTY"]) is None
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_numpy_engine_matches_dict_engine(tmp_path, workers):
+    """Test that both engines write byte-identical extensions files."""
+    # given
+    for name in ["dict", "numpy"]:
+        dict_dir = tmp_path / name
+        dict_dir.mkdir()
+        (dict_dir / "2_letter_words.txt").write_text("as\nto\n", encoding="utf-8")
+        (dict_dir / "3_letter_words.txt").write_text("asy\nkto\nłza\ntom\nvat\n", encoding="utf-8")
+        (dict_dir / "4_letter_words.txt").write_text("łzaw\nstom\ntomy\nvato\n", encoding="utf-8")
+
+    # when
+    generate_all_extensions(tmp_path / "dict", workers=workers, engine="dict", formats=("text", "tsv"))
+    created = generate_all_extensions(tmp_path / "numpy", engine="numpy", formats=("text", "tsv"))
+
+    # then
+    assert {path.suffix for path in created} == {".txt", ".tsv"}
+    for extensions_file in created:
+        expected = tmp_path / "dict" / "extensions" / extensions_file.name
+        assert extensions_file.read_bytes() == expected.read_bytes()
+    assert (tmp_path / "numpy" / "extensions" / "hooks.idx").read_bytes() == \
+        (tmp_path / "dict" / "extensions" / "hooks.idx").read_bytes()
+    with HookIndex(tmp_path / "numpy" / "extensions" / "hooks.idx") as index:
+        assert index.hooks("VAT") == Hooks("", "O")
@@ -0,0 +1,78 @@
+import pytest
+from src.generate_extensions import generate_all_extensions
+from src.verify import main, plan_jobs, verify_all
+from src.word_splitter import split_words_by_length
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    # given
+    dict_dir = tmp_path / "osps"
+    dict_dir.mkdir()
+    (dict_dir / "osps.txt").write_text("kot\nkota\nskot\nkoty\nżal\nżale\nala\nalan\n", encoding="utf-8")
+    split_words_by_length(dict_dir / "osps.txt", dict_dir)
+    generate_all_extensions(dict_dir, workers=1, formats=("text", "tsv"))
+    return tmp_path
+
+
+def test_verify_accepts_fresh_files(base_dir, capsys):
+    """Test that freshly generated text and TSV files pass, checked in parallel."""
+    # when
+    jobs, problems = plan_jobs(base_dir, ["osps"])
+    results = verify_all(jobs, workers=2)
+    main(["--base-dir", str(base_dir), "--dict", "osps", "--workers", "2"])
+
+    # then
+    assert problems == []
+    assert [job.extensions_file.name for job in jobs] == ["3_letter_extensions.txt", "3_letter_extensions.tsv"]
+    assert [(lines, discrepancies) for _, lines, discrepancies in results] == [(3, []), (3, [])]
+    assert "no discrepancies" in capsys.readouterr().out
+
+
+def test_verify_reports_discrepancies_with_line_numbers(base_dir):
+    """Test that dropped words, missing and stale hooks are reported where they occur."""
+    # given
+    extensions_file = base_dir / "osps" / "extensions" / "3_letter_extensions.txt"
+    assert extensions_file.read_text(encoding="utf-8") == " ALA N\nS KOT A,Y\n ŻAL E\n"
+    extensions_file.write_text("S KOT A\n ŻAL E,I\nS KOC \n", encoding="utf-8")
+
+    # when
+    jobs, _ = plan_jobs(base_dir, ["osps"])
+    results = verify_all(jobs, workers=1)
+
+    # then
+    _, lines, discrepancies = results[0]
+    assert lines == 3
+    assert [(d.line, d.kind, d.detail) for d in discrepancies] == [
+        (1, "missing word", "ALA should come before KOT"),
+        (1, "missing hooks", "KOT: right Y"),
+        (2, "stale hooks", "ŻAL: right I"),
+        (3, "unexpected word", "KOC is not in 3_letter_words.txt"),
+    ]
+    assert results[1][2] == []
+    with pytest.raises(SystemExit):
+        main(["--base-dir", str(base_dir), "--dict", "osps", "--workers", "1"])
+
+
+def test_verify_reports_word_order_and_file_problems(base_dir):
+    """Test unsorted word lists, missing extensions files and stale ones."""
+    # given
+    dict_dir = base_dir / "osps"
+    (dict_dir / "3_letter_words.txt").write_text("kot\nala\nżal\n", encoding="utf-8")
+    (dict_dir / "extensions" / "3_letter_extensions.txt").write_text("S KOT A,Y\n ALA N\n ŻAL E\n", encoding="utf-8")
+    (dict_dir / "extensions" / "3_letter_extensions.tsv").unlink()
+    (dict_dir / "2_letter_words.txt").write_text("al\n", encoding="utf-8")
+    (dict_dir / "extensions" / "4_letter_extensions.txt").write_text(" ALAN \n", encoding="utf-8")
+
+    # when
+    jobs, problems = plan_jobs(base_dir, ["osps"])
+    results = verify_all(jobs)
+
+    # then
+    assert [(p.extensions_file.name, p.kind) for p in problems] == [
+        ("2_letter_extensions.txt", "missing file"),
+        ("4_letter_extensions.txt", "stale file"),
+    ]
+    assert [(d.kind, d.detail) for d in results[0][2]] == [
+        ("order", "ALA in 3_letter_words.txt is not after the word before it"),
+    ]
@@ -1,6 +1,11 @@
+import bz2
+import gzip
+import lzma
+import tracemalloc
+import zipfile
 import pytest
 from pathlib import Path
-from src.word_splitter import polish_sort_key, split_words_by_length
+from src.word_splitter import find_source_file, iter_words, polish_sort_key, split_words_by_length
 
 
 def test_polish_sort_key():
@@ -61,4 +66,89 @@ def test_split_words_by_length(tmp_path):
     # Check 4-letter words
     with open(output_dir / "4_letter_words.txt", "r", encoding="utf-8") as f:
         four_letter_words = [line.strip() for line in f]
-    assert four_letter_words == ["abcd"]
\ No newline at end of file
+    assert four_letter_words == ["abcd"]
+
+
+def test_split_words_by_length_external_matches_in_memory(tmp_path):
+    """Test that the bounded-memory external sort writes the same files as the in-memory path."""
+    # given
+    input_file = tmp_path / "test_words.txt"
+    words = ["żab", "ab", "łab", "Lab", "ąbc", "abc", "ąb", "źab", "lab", "abcd", "ab", "żal", "Łaz"] * 5
+    input_file.write_text("\n".join(words) + "\n", encoding="utf-8")
+
+    # when
+    split_words_by_length(input_file, tmp_path / "memory")
+    split_words_by_length(input_file, tmp_path / "external", memory_budget=200)
+
+    # then
+    for length in [2, 3, 4]:
+        name = f"{length}_letter_words.txt"
+        assert (tmp_path / "external" / name).read_text(encoding="utf-8") == \
+            (tmp_path / "memory" / name).read_text(encoding="utf-8")
+    assert sorted(p.name for p in (tmp_path / "external").iterdir()) == \
+        ["2_letter_words.txt", "3_letter_words.txt", "4_letter_words.txt"]
+
+
+def test_split_words_by_length_external_stays_within_budget(tmp_path):
+    """Test that the buffered words and the sort of a run together fit the memory budget."""
+    # given
+    input_file = tmp_path / "test_words.txt"
+    letters = "aąbcćdeęfghijklłmnńoóprsśtuwyzźż"
+    words = ("".join(letters[(i * 7 + j * 13 + i // 5) % len(letters)] for j in range(5 + i % 8))
+             for i in range(40000))
+    input_file.write_text("\n".join(words) + "\n", encoding="utf-8")
+    budget = 1024 * 1024
+
+    # when
+    tracemalloc.start()
+    try:
+        split_words_by_length(input_file, tmp_path / "external", memory_budget=budget)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    # then
+    assert peak < budget * 1.15
+    assert sum(len(path.read_text(encoding="utf-8").splitlines())
+               for path in (tmp_path / "external").iterdir()) == 40000
+
+
+@pytest.mark.parametrize("suffix", [".zip", ".txt.gz", ".txt.xz", ".txt.bz2"])
+def test_split_words_from_archive_matches_plain_file(tmp_path, suffix):
+    """Test that compressed sources are split exactly like the extracted list."""
+    # given
+    content = "żab\nab\n\nłab\nąbc\r\nabc\nźab\nabcd\n"
+    plain_file = tmp_path / "sjp.txt"
+    plain_file.write_text(content, encoding="utf-8")
+    archive = tmp_path / f"archive{suffix}"
+    if suffix == ".zip":
+        with zipfile.ZipFile(archive, "w") as f:
+            f.writestr("README.txt", "SJP.PL\n")
+            f.writestr("slowa.txt", content.encode("utf-8"))
+    else:
+        opener = {".txt.gz": gzip.open, ".txt.xz": lzma.open, ".txt.bz2": bz2.open}[suffix]
+        with opener(archive, "wt", encoding="utf-8") as f:
+            f.write(content)
+
+    # when
+    split_words_by_length(plain_file, tmp_path / "plain")
+    split_words_by_length(archive, tmp_path / "archive", memory_budget=100)
+
+    # then
+    assert list(iter_words(archive)) == ["żab", "ab", "łab", "ąbc", "abc", "źab", "abcd"]
+    for name in ["2_letter_words.txt", "3_letter_words.txt", "4_letter_words.txt"]:
+        assert (tmp_path / "archive" / name).read_text(encoding="utf-8") == \
+            (tmp_path / "plain" / name).read_text(encoding="utf-8")
+
+
+def test_find_source_file(tmp_path):
+    """Test that the plain list wins, then compressed copies, then the newest dated download."""
+    # given/when/then
+    assert find_source_file(tmp_path, "sjp") == tmp_path / "sjp.txt"
+    (tmp_path / "sjp-20230101.zip").touch()
+    (tmp_path / "sjp-20240101.zip").touch()
+    assert find_source_file(tmp_path, "sjp") == tmp_path / "sjp-20240101.zip"
+    (tmp_path / "sjp.txt.xz").touch()
+    assert find_source_file(tmp_path, "sjp") == tmp_path / "sjp.txt.xz"
+    (tmp_path / "sjp.txt").touch()
+    assert find_source_file(tmp_path, "sjp") == tmp_path / "sjp.txt"